@@ -1,12 +1,16 @@
 from sqlalchemy import select, update, delete, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from sqlalchemy.engine import Row
+
 from typing import List, Optional
 
 from DAO.general_dao import GeneralDAO
 from database import response_schemas
-from database import models
+from database import models, loader_profiles
 from helpers import exception_helper
+from services.auth_cache import auth_user_cache
+from services.response_cache import response_cache, user_tag
 from services.user_services import UserService
 
 
@@ -29,8 +33,72 @@ class AdminDAO:
         :return: Updated User object
         """
 
+        user_id = user.id
         user.is_admin = is_admin
         await db.commit()
-        await db.refresh(user)
+        auth_user_cache.invalidate(user_id)
+        await response_cache.invalidate(user_tag(user_id))
+        await db.refresh(user, attribute_names=loader_profiles.USER_PROFILE_FIELDS)
+        
+        return user
+
+    @classmethod
+    async def bulk_update_admin_status(cls,
+                                       db: AsyncSession,
+                                       user_ids: List[int],
+                                       is_admin: bool,
+                                       admin_id: int) -> List[Row]:
+        """
+        Update admin status of many users with one UPDATE ... WHERE id IN (...) RETURNING.
+        Only active users whose status really changes are updated,
+        admin's own account is never touched. Users are not loaded into session.
         
-        return user
\ No newline at end of file
+        :param db: Database session
+        :param user_ids: IDs of users to update
+        :param is_admin: New admin status
+        :param admin_id: ID of admin who makes the request
+        :return: Rows (id, name) of updated users
+        """
+        query = update(models.User).where(
+            and_(
+                models.User.id.in_(user_ids),
+                models.User.id != admin_id,
+                models.User.is_active == True,
+                models.User.is_admin == (not is_admin)
+            )
+        ).values(is_admin=is_admin).returning(
+            models.User.id,
+            models.User.name
+        ).execution_options(synchronize_session=False)
+
+        result = await db.execute(query)
+        updated_users = result.all()
+
+        await db.commit()
+        auth_user_cache.invalidate(*(user.id for user in updated_users))
+        await response_cache.invalidate(*(user_tag(user.id) for user in updated_users))
+
+        return updated_users
+
+    @classmethod
+    async def get_users_status(cls,
+                               db: AsyncSession,
+                               user_ids: List[int]) -> List[Row]:
+        """
+        Get only status columns of many users in one query.
+        Used to explain why bulk operation skipped some users.
+        
+        :param db: Database session
+        :param user_ids: IDs of users
+        :return: Rows (id, name, is_active, is_admin)
+        """
+        query = select(
+            models.User.id,
+            models.User.name,
+            models.User.is_active,
+            models.User.is_admin
+        ).where(models.User.id.in_(user_ids))
+
+        result = await db.execute(query)
+
+        return result.all()
@@ -0,0 +1,248 @@
+from sqlalchemy import bindparam, select, update, delete, and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import Dict, List, Optional, Tuple
+
+from DAO.timeline_dao import TimelineDAO
+from database import response_schemas
+from database import models
+from helpers import pagination_helper
+from services.response_cache import response_cache, user_tag
+
+
+class FollowDAO:
+    """
+    Data Access Object for Follow model (follow graph).
+    Keeps users.follower_count / following_count and home timelines in sync with follows.
+    """
+    @classmethod
+    async def change_follow_counts(cls,
+                                   db: AsyncSession,
+                                   changes: List[Tuple[int, int, int]]) -> None:
+        """
+        Add deltas to follower/following counters in the caller's transaction
+        (counter = counter + n, one executemany). Doesn't commit.
+
+        Authors whose follower_count drops below FANOUT_MAX_FOLLOWERS switch from
+        fan-out on read to fan-out on write: their recent posts are copied into
+        followers' timelines, otherwise posts written while they were big would disappear.
+
+        :param db: Database session
+        :param changes: List of (user ID, follower delta, following delta)
+        """
+        if not changes:
+            return
+
+        users = models.User.__table__
+        query = update(users).where(
+            users.c.id == bindparam("user_id")
+        ).values(
+            follower_count=users.c.follower_count + bindparam("followers"),
+            following_count=users.c.following_count + bindparam("following")
+        )
+
+        connection = await db.connection()
+        await connection.execute(query, [
+            {"user_id": user_id, "followers": followers, "following": following}
+            for user_id, followers, following in changes
+        ])
+
+        lost_followers = {user_id: -followers for user_id, followers, _ in changes if followers < 0}
+        if not lost_followers:
+            return
+
+        threshold = TimelineDAO.FANOUT_MAX_FOLLOWERS
+        counts = await db.execute(
+            select(models.User.id, models.User.follower_count).where(
+                and_(
+                    models.User.id.in_(lost_followers),
+                    models.User.follower_count < threshold
+                )
+            )
+        )
+        for user_id, follower_count in counts.all():
+            if follower_count + lost_followers[user_id] >= threshold:    # Was big before this change
+                await TimelineDAO.backfill_followers(db=db, author_id=user_id)
+
+    @classmethod
+    async def follow(cls,
+                     db: AsyncSession,
+                     follower_id: int,
+                     followee_id: int) -> bool:
+        """
+        Create follow edge, update counters and backfill follower's timeline, then commit.
+
+        :param db: Database session
+        :param follower_id: Who follows
+        :param followee_id: Whom to follow (must be active user)
+        :return: False if follower already followed this user
+        """
+        existing = await db.get(models.Follow, (follower_id, followee_id))
+        if existing:
+            return False
+
+        try:
+            db.add(models.Follow(follower_id=follower_id, followee_id=followee_id))
+            await db.flush()
+        except IntegrityError:
+            # Concurrent request created the same edge (primary key follower_id, followee_id)
+            await db.rollback()
+            return False
+
+        try:
+            await cls.change_follow_counts(db=db, changes=[(followee_id, 1, 0), (follower_id, 0, 1)])
+
+            # Posts of big authors are merged on read, nothing to copy
+            follower_count = (await db.execute(
+                select(models.User.follower_count).where(models.User.id == followee_id)
+            )).scalar_one()
+            if follower_count < TimelineDAO.FANOUT_MAX_FOLLOWERS:
+                await TimelineDAO.backfill_author(db=db, user_id=follower_id, author_id=followee_id)
+
+            await db.commit()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+        # Profiles show follower / following counters
+        await response_cache.invalidate(user_tag(followee_id), user_tag(follower_id))
+
+        return True
+
+    @classmethod
+    async def unfollow(cls,
+                       db: AsyncSession,
+                       follower_id: int,
+                       followee_id: int) -> bool:
+        """
+        Remove follow edge, its posts from follower's timeline and update counters, then commit.
+
+        :param db: Database session
+        :param follower_id: Who follows
+        :param followee_id: Whom to unfollow
+        :return: False if follower didn't follow this user
+        """
+        query = delete(models.Follow).where(
+            and_(
+                models.Follow.follower_id == follower_id,
+                models.Follow.followee_id == followee_id
+            )
+        ).execution_options(synchronize_session=False)
+
+        try:
+            result = await db.execute(query)
+            if not result.rowcount:
+                await db.rollback()
+                return False
+
+            await cls.change_follow_counts(db=db, changes=[(followee_id, -1, 0), (follower_id, 0, -1)])
+            await TimelineDAO.remove_author(db=db, user_id=follower_id, author_id=followee_id)
+            await db.commit()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+        await response_cache.invalidate(user_tag(followee_id), user_tag(follower_id))
+
+        return True
+
+    @classmethod
+    async def remove_users(cls,
+                           db: AsyncSession,
+                           user_ids: List[int]) -> List[int]:
+        """
+        Remove all follow edges of deleted users and their timelines.
+        Counters of users on the other side of removed edges are decremented. Doesn't commit.
+
+        :param db: Database session
+        :param user_ids: IDs of deleted users
+        :return: IDs of other users whose counters were changed
+        """
+        query = delete(models.Follow).where(
+            or_(
+                models.Follow.follower_id.in_(user_ids),
+                models.Follow.followee_id.in_(user_ids)
+            )
+        ).returning(
+            models.Follow.follower_id,
+            models.Follow.followee_id
+        ).execution_options(synchronize_session=False)
+        edges = (await db.execute(query)).all()
+
+        deleted = set(user_ids)
+        changes: Dict[int, List[int]] = {}
+        for follower_id, followee_id in edges:
+            if followee_id not in deleted:
+                changes.setdefault(followee_id, [0, 0])[0] -= 1
+            if follower_id not in deleted:
+                changes.setdefault(follower_id, [0, 0])[1] -= 1
+
+        await cls.change_follow_counts(db=db, changes=[(user_id, *deltas) for user_id, deltas in changes.items()])
+        await db.execute(
+            update(models.User).where(models.User.id.in_(user_ids)).values(follower_count=0, following_count=0)
+            .execution_options(synchronize_session=False)
+        )
+        await TimelineDAO.remove_users(db=db, user_ids=user_ids)
+
+        return list(changes)
+
+    @classmethod
+    async def get_follow_page(cls,
+                              db: AsyncSession,
+                              user_id: int,
+                              direction: str,
+                              limit: int,
+                              cursor: Optional[str] = None) -> Tuple[List[response_schemas.FollowUserResponse], Optional[str]]:
+        """
+        Get one page of followers or followed users, most recent follows first.
+
+        :param db: Database session
+        :param user_id: User whose follows to list
+        :param direction: "followers" - who follows user, "following" - whom user follows
+        :param limit: Max number of users on the page
+        :param cursor: Cursor from previous page (None for the first page)
+        :return: Tuple of users with follow time and next page cursor
+        """
+        if direction == "followers":
+            owner_column, other_column = models.Follow.followee_id, models.Follow.follower_id
+        else:
+            owner_column, other_column = models.Follow.follower_id, models.Follow.followee_id
+
+        query = select(
+            models.User.id,
+            models.User.name,
+            models.Follow.created_at.label("followed_at")
+        ).join(
+            models.User, models.User.id == other_column
+        ).where(
+            and_(
+                owner_column == user_id,
+                models.User.is_active == True
+            )
+        )
+
+        if cursor:
+            cursor_created_at, cursor_id = pagination_helper.decode_cursor(cursor)
+            query = query.where(
+                and_(
+                    models.Follow.created_at <= cursor_created_at,
+                    or_(
+                        models.Follow.created_at < cursor_created_at,
+                        other_column < cursor_id
+                    )
+                )
+            )
+
+        query = query.order_by(models.Follow.created_at.desc(), other_column.desc()).limit(limit + 1)
+        rows = (await db.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = pagination_helper.encode_cursor(created_at=rows[-1].followed_at, record_id=rows[-1].id)
+
+        users = [response_schemas.FollowUserResponse(**row._mapping) for row in rows]
+        return users, next_cursor
@@ -1,12 +1,14 @@
 from fastapi import HTTPException
-from sqlalchemy import exists, select
+from sqlalchemy import Select, and_, exists, func, insert, inspect, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from starlette import status
 
-from typing import List, Optional, Any, Type
+from typing import Dict, List, Optional, Any, Tuple, Type
 
 from database import models, schema
-from helpers import exception_helper
+from helpers import exception_helper, pagination_helper
 from services.validation_services import ValidationService
 
 class GeneralDAO:
@@ -30,7 +32,8 @@ class GeneralDAO:
     @classmethod
     async def get_all_records(cls, 
                               db: AsyncSession, 
-                              model: Type[Any]) -> List[Any]:
+                              model: Type[Any],
+                              options: Optional[List[Any]] = None) -> List[Any]:
         """
         Retrieve all records of specified model from database.
         Works with ANY SQLAlchemy model (User, Item, etc.)
@@ -38,6 +41,7 @@ class GeneralDAO:
         :param db:  AsyncSession
                     Database session for executing queries
         :param model:Type[Any]: SQLAlchemy model class (e.g., models.User, models.Item)
+        :param options: Loader options, usually a profile from database/loader_profiles.py
         :return: List[Any] List of all found records of the specified model
 
         Usage Example:
@@ -48,16 +52,85 @@ class GeneralDAO:
         **Update any record**
         - users = await GeneralDAO.get_all_records(db, models.User)
         """
-        query = select(model)
+        query = select(model).options(*(options or []))
         result = await db.execute(query)
 
         return result.scalars().all()
 
+    @classmethod
+    async def get_records_page(cls,
+                               db: AsyncSession,
+                               model: Type[Any],
+                               limit: int,
+                               cursor: Optional[str] = None,
+                               filters: Optional[List[Any]] = None,
+                               options: Optional[List[Any]] = None,
+                               query: Optional[Select] = None) -> Tuple[List[Any], Optional[str]]:
+        """
+        Retrieve one page of records using keyset (cursor) pagination.
+        Records are ordered from newest to oldest by (created_at, id),
+        so model must have both columns.
+
+        Unlike OFFSET, the cursor condition is resolved by index range scan,
+        so any page costs O(limit) no matter how deep client went.
+
+        :param db: Database session
+        :param model: SQLAlchemy model class with created_at and id columns
+        :param limit: Max number of records on the page
+        :param cursor: Cursor from previous page (None for the first page)
+        :param filters: Extra WHERE conditions (e.g. [models.User.is_admin == True])
+        :param options: Loader options, usually a profile from database/loader_profiles.py
+        :param query: Column projection to page instead of ORM objects (must select "id" and "created_at"
+                      of model). Plain rows are returned then, options are ignored
+        :return: Tuple of (records, next_cursor). next_cursor is None on the last page
+
+        Usage Example:
+        ---------------
+        - posts, next_cursor = await GeneralDAO.get_records_page(db=db, model=models.Post, limit=20)
+        - rows, next_cursor = await GeneralDAO.get_records_page(db=db, model=models.Post, limit=20,
+                                                                query=select(models.Post.id, models.Post.created_at))
+        """
+        return_rows = query is not None
+        if not return_rows:
+            query = select(model).options(*(options or []))
+
+        for condition in filters or []:
+            query = query.where(condition)
+
+        if cursor:
+            cursor_created_at, cursor_id = pagination_helper.decode_cursor(cursor)
+            # (created_at, id) < (cursor_created_at, cursor_id), written so both SQLite and
+            # PostgreSQL seek (created_at, id) indexes by "created_at <= ..." range
+            query = query.where(
+                and_(
+                    model.created_at <= cursor_created_at,
+                    or_(
+                        model.created_at < cursor_created_at,
+                        model.id < cursor_id
+                    )
+                )
+            )
+
+        # Take one extra record to know if there is a next page
+        query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+        result = await db.execute(query)
+        records = result.all() if return_rows else result.scalars().all()
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last_record = records[-1]
+            next_cursor = pagination_helper.encode_cursor(created_at=last_record.created_at,
+                                                          record_id=last_record.id)
+
+        return records, next_cursor
+
     @classmethod
     async def get_record_by_id(cls, 
                                record_id: int,
                                model: Type[Any], 
-                               db: AsyncSession) -> Optional[Any]:
+                               db: AsyncSession,
+                               options: Optional[List[Any]] = None) -> Optional[Any]:
         """
         Retrieve single record of specified model from database by its ID.
         Works with ANY SQLAlchemy model.
@@ -67,6 +140,7 @@ class GeneralDAO:
         :param model:Type[Any]: SQLAlchemy model class (e.g., models.User, models.Item)
         :param record_id:   int
                             ID of the record to find in database
+        :param options: Loader options, usually a profile from database/loader_profiles.py
         :return:    Optional[Any] 
                     Found record object or None if not found
 
@@ -75,7 +149,7 @@ class GeneralDAO:
         **Get all users** 
         - user = await GeneralDAO.get_record_by_id(db, models.User, 1)
         """
-        query = select(model).where(model.id == int(record_id))
+        query = select(model).options(*(options or [])).where(model.id == int(record_id))
         result = await db.execute(query)
 
         return result.scalars().first()
@@ -85,16 +159,26 @@ class GeneralDAO:
                             model: Any,
                             record: Any,
                             update_data: Any,
-                            db: AsyncSession) -> Any:
+                            db: AsyncSession,
+                            expected_version: Optional[int] = None) -> Any:
         """
         Update ANY database record with provided data.
         Universal method for all models that supports partial updates.
+
+        Runs one UPDATE ... WHERE id = :id AND version = :version RETURNING statement
+        (optimistic concurrency) and fills the record from the returned row,
+        so there is no flush + refresh round trip. Models without "version"
+        column are updated by id only.
         
         :param model: SQLAlchemy model class
         :param record: Database record object to update
         :param update_data: Pydantic schema or dict with update data
         :param db: Database session
+        :param expected_version: Version client based its change on (If-Match).
+                                 Default - version loaded on the record
         :return: Updated record object
+        :raises HTTPException: 409 if unique value already exists or record was changed by another
+                               request after it was read, 412 if expected_version is not current
         """
         # Convert Pydantic model to dictionary, excluding unset fields
         if hasattr(update_data, "dict"):
@@ -102,29 +186,141 @@ class GeneralDAO:
         elif not isinstance(update_data, dict):
             update_data = dict(update_data)
         
-        # Validate update data (ValidationService handles all exceptions internally)
+        # Validate update data (ValidationService handles all exceptions internally).
+        # Globally unique fields are enforced by UNIQUE constraints - no read before write for them
         await ValidationService.validate_update(
             model_class=model,
             record=record,
             update_data=update_data,
-            db=db
+            db=db,
+            check_unique_fields=False
         )
+        record_id = record.id
         
-        # Updating
-        for field, value in update_data.items():
-            setattr(record, field, value)
+        # Return the same columns record's loader profile selected (deferred ones stay deferred)
+        loaded_columns = cls.get_loaded_columns(record=record)
+
+        conditions = [model.id == record_id]
+        if hasattr(model, "version"):
+            conditions.append(model.version == (expected_version if expected_version is not None else record.version))
+
+        query = update(model).where(and_(*conditions)).values(**update_data).returning(
+            *(getattr(model, column) for column in loaded_columns)
+        ).execution_options(synchronize_session=False)
 
         try:
+            updated_row = (await db.execute(query)).first()
+            if updated_row is None:
+                await db.rollback()
+                if expected_version is not None:
+                    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED,
+                                        detail="Record has been changed since you read it, reload it and retry")
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                                    detail="Record has been changed by another request, retry")
+
             await db.commit()
-        except IntegrityError as e:
-            # Handle database integrity constraint violations as a safety net
+        except IntegrityError:
+            # Constraint is the final arbiter, one query tells which fields collide
             await db.rollback()
-            raise HTTPException(
-                status_code=409,
-                detail="This value already exists or violates a database constraint"
-            )
-        
-        await db.refresh(record)
+            conflicts = await ValidationService.find_conflicts(model_class=model,
+                                                               values=update_data,
+                                                               db=db,
+                                                               record_id=record_id)
+            raise ValidationService.conflict_exception(model_class=model, conflicts=conflicts, values=update_data)
+
+        # Record is expired by commit - put returned values back without a SELECT
+        for column, value in updated_row._mapping.items():
+            set_committed_value(record, column, value)
 
         return record
+
+    @classmethod
+    async def bulk_insert(cls,
+                          db: AsyncSession,
+                          model: Type,
+                          rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many rows of ANY model as fast as the database allows.
+        PostgreSQL - binary COPY through asyncpg, other databases - one executemany INSERT.
+        Doesn't commit, so rows are inserted in the caller's transaction.
+        
+        :param db: Database session
+        :param model: SQLAlchemy model class
+        :param rows: Column name -> value dicts, all with the same keys
+        :return: Number of inserted rows
+        """
+        if not rows:
+            return 0
+
+        connection = await db.connection()
+
+        if connection.dialect.name == "postgresql" and connection.dialect.driver == "asyncpg":
+            # SQLAlchemy opens asyncpg transaction on first statement - do it before COPY
+            await connection.execute(select(1))
+
+            columns = list(rows[0].keys())
+            raw_connection = await connection.get_raw_connection()
+            try:
+                await raw_connection.driver_connection.copy_records_to_table(
+                    model.__tablename__,
+                    records=[tuple(row[column] for column in columns) for row in rows],
+                    columns=columns
+                )
+            except Exception as e:
+                # asyncpg errors bypass SQLAlchemy here, report constraint violations (SQLSTATE 23xxx) the usual way
+                if str(getattr(e, "sqlstate", "")).startswith("23"):
+                    raise IntegrityError(f"COPY {model.__tablename__}", None, e)
+                raise
+        else:
+            # Core insert on table skips ORM bulk bookkeeping - plain executemany
+            await connection.execute(insert(model.__table__), rows)
+
+        return len(rows)
+
+    @classmethod
+    async def bulk_insert_with_ids(cls,
+                                   db: AsyncSession,
+                                   model: Type,
+                                   rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Same as bulk_insert(), but returns IDs of inserted rows (e.g. to fan them out in the same transaction).
+        PostgreSQL - IDs are taken from the sequence of "id" first and COPYed with the rows
+        (COPY returns nothing), other databases - executemany INSERT ... RETURNING id.
+        Doesn't commit.
+
+        :param db: Database session
+        :param model: SQLAlchemy model class with integer "id" primary key
+        :param rows: Column name -> value dicts without "id", all with the same keys
+        :return: IDs of inserted rows
+        """
+        if not rows:
+            return []
+
+        connection = await db.connection()
+
+        if connection.dialect.name == "postgresql" and connection.dialect.driver == "asyncpg":
+            ids_query = select(
+                func.nextval(func.pg_get_serial_sequence(model.__tablename__, "id"))
+            ).select_from(func.generate_series(1, len(rows)))
+            ids = list((await connection.execute(ids_query)).scalars().all())
+
+            await cls.bulk_insert(db=db, model=model, rows=[{**row, "id": record_id} for row, record_id in zip(rows, ids)])
+            return ids
+
+        result = await connection.execute(insert(model.__table__).returning(model.__table__.c.id), rows)
+        return list(result.scalars().all())
+
+    @classmethod
+    def get_loaded_columns(cls, record: Any) -> List[str]:
+        """
+        Get names of column attributes which are currently loaded on the record.
+        Used to refresh record with the same columns its loader profile selected
+        (deferred columns like User.bio are skipped by plain db.refresh()).
+
+        :param record: Database record object
+        :return: List of loaded column names
+        """
+        state = inspect(record)
+
+        return [attr.key for attr in state.mapper.column_attrs if attr.key not in state.unloaded]
         
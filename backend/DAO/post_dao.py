@@ -1,12 +1,21 @@
-from sqlalchemy import select, update, delete, and_, func, desc
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import column, literal_column, select, table, update, delete, insert, and_, or_, func, desc
+from sqlalchemy.engine import Row
+from starlette import status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
 
 from DAO.general_dao import GeneralDAO
+from DAO.timeline_dao import TimelineDAO
+from DAO.user_dao import UserDAO
 from database import response_schemas, schema
-from database import models
-from helpers import exception_helper
+from database import models, loader_profiles
+from helpers import exception_helper, pagination_helper
 from services.post_services import PostService
+from services.response_cache import response_cache, post_tag, user_tag, FEED_HEAD_TAG
 
 
 class PostDao:
@@ -18,46 +27,119 @@ class PostDao:
     async def create_post(cls, 
                           db: AsyncSession, 
                           request: schema.PostCreate, 
-                          user_id: int) -> models.Post:
+                          user_id: int) -> Row:
         """
-        Create new post in database.
+        Create new post with one INSERT ... RETURNING and copy it into followers' timelines (same transaction).
         
         :param db: Database session
         :param request: Post data from schema
         :param user_id: ID of user creating the post
-        :return: Created post object
+        :return: Row with id, content, created_at and user_id of created post
         """
 
-        content = request.content or ""
-        new_post = models.Post(
-            content=content,
+        query = insert(models.Post).values(
+            content=request.content or "",
             user_id=user_id
-        )
+        ).returning(*loader_profiles.POST_COLUMNS)
 
-        db.add(new_post)
-        await db.commit()
-        await db.refresh(new_post)
+        try:
+            new_post = (await db.execute(query)).one()
+            await UserDAO.change_post_counts(db=db, changes={user_id: 1})
+            await TimelineDAO.fan_out_posts(db=db, post_ids=[new_post.id])
+            await db.commit()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+        await response_cache.invalidate(FEED_HEAD_TAG, user_tag(user_id))
 
         return new_post
+
+    @classmethod
+    async def create_posts_bulk(cls,
+                                db: AsyncSession,
+                                requests: List[schema.PostCreate],
+                                user_id: int) -> List[Row]:
+        """
+        Create many posts with one multi-row INSERT ... RETURNING.
+        SQLAlchemy sends rows in batched VALUES lists (or executemany where RETURNING
+        is not supported), so there is no add/refresh round trip per post.
+        
+        :param db: Database session
+        :param requests: List of post data from schema
+        :param user_id: ID of user creating the posts
+        :return: Rows with id, content, created_at and user_id of created posts, ordered by id
+        """
+        rows = [
+            {"content": request.content or "", "user_id": user_id}
+            for request in requests
+        ]
+
+        query = insert(models.Post).returning(*loader_profiles.POST_COLUMNS)
+        result = await db.execute(query, rows)
+        # RETURNING order of a multi-row INSERT isn't guaranteed, ids are assigned in row order
+        created_posts = sorted(result.all(), key=lambda post: post.id)
+
+        await UserDAO.change_post_counts(db=db, changes={user_id: len(created_posts)})
+        await TimelineDAO.fan_out_posts(db=db, post_ids=[post.id for post in created_posts])
+        await db.commit()
+        await response_cache.invalidate(FEED_HEAD_TAG, user_tag(user_id))
+
+        return created_posts
     
     @classmethod
     async def update_post(cls,
                           post_id: int,
                           user_id: int,
                           post_data: schema.PostUpdate,
-                          db: AsyncSession) -> models.Post:
+                          db: AsyncSession,
+                          expected_version: Optional[int] = None) -> Row:
+        """
+        Update post with ownership verification in one UPDATE ... RETURNING statement.
+        Author's version is bumped too - profile responses (user with posts) include the post.
         
-        post = await cls.get_post_by_user_id(db=db, 
-                                            post_id=post_id, 
-                                            user_id=user_id)
-        await exception_helper.CheckHTTP404NotFound(founding_item=post, 
-                                              text="Post not found or you don't have permission to update it")
-        update_data = post_data.dict(exclude_unset=True)
-        for k, v in update_data.items():
-            setattr(post, k, v)
+        :param post_id: ID of post to update
+        :param user_id: User ID for ownership verification
+        :param post_data: Fields to update
+        :param db: Database session
+        :param expected_version: Version client based its change on (If-Match), None - overwrite any version
+        :return: Row with id, content, created_at, user_id and version of updated post
+        :raises HTTPException: 404 if post not found or not owned, 412 if expected_version is not current
+        """
+        conditions = [
+            models.Post.id == post_id,
+            models.Post.user_id == user_id
+        ]
+        if expected_version is not None:
+            conditions.append(models.Post.version == expected_version)
 
-        await db.commit()
-        await db.refresh(post)
+        query = update(models.Post).where(and_(*conditions)).values(
+            **post_data.dict(exclude_unset=True)
+        ).returning(
+            *loader_profiles.POST_COLUMNS,
+            models.Post.version
+        ).execution_options(synchronize_session=False)
+
+        try:
+            post = (await db.execute(query)).first()
+            if post is None:
+                await db.rollback()
+                # Failure path only: tell "not found" from "changed by someone else"
+                existing_post = await cls.get_post_by_user_id(db=db, post_id=post_id, user_id=user_id)
+                await exception_helper.CheckHTTP404NotFound(founding_item=existing_post,
+                                                            text="Post not found or you don't have permission to update it")
+                raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED,
+                                    detail="Post has been changed since you read it, reload it and retry")
+
+            await UserDAO.touch_users(db=db, user_ids=[user_id])
+            await db.commit()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+        await response_cache.invalidate(post_tag(post_id), user_tag(user_id))
 
         return post
     
@@ -82,38 +164,66 @@ class PostDao:
             )
         )
 
-        await db.execute(query)
+        # Timeline entries reference the post, remove them first
+        await TimelineDAO.remove_post(db=db, post_id=post_id, author_id=user_id)
+
+        result = await db.execute(query)
 
+        # Post may be already deleted (or not owned) - decrement only for really removed row
+        await UserDAO.change_post_counts(db=db, changes={user_id: -result.rowcount})
         await db.commit()
+        await response_cache.invalidate(post_tag(post_id), user_tag(user_id))
+
+    @classmethod
+    async def get_post_versions(cls,
+                                db: AsyncSession,
+                                post_id: int) -> Optional[Row]:
+        """
+        Get only versions of post and its author (for ETag check), rows are not hydrated.
+        
+        :param db: Database session
+        :param post_id: Post ID
+        :return: Row (post_version, user_version) or None if post not found
+        """
+        query = select(
+            models.Post.version.label("post_version"),
+            models.User.version.label("user_version")
+        ).join(models.Post.user).where(models.Post.id == post_id)
+
+        return (await db.execute(query)).first()
 
     @classmethod
     async def get_posts_by_user_id(cls, 
                                    db: AsyncSession, 
                                    user_id: int) -> List[models.Post]:
         """
-        Get all posts belonging to specific user.
+        Get all posts belonging to specific user, newest first.
         
         :param db: Database session
         :param user_id: User ID to filter posts
         :return: List of user's posts
         """
-        query = select(models.Post).where(models.Post.user_id == user_id)
+        query = select(models.Post).options(*loader_profiles.POST_ONLY).where(
+            models.Post.user_id == user_id
+        ).order_by(models.Post.created_at.desc())   # Served by ix_posts_user_id_created_at
         posts = await db.execute(query)
         return posts.scalars().all()
 
     @classmethod
     async def get_post_by_user_id(cls, db: AsyncSession,
                                   post_id: int,
-                                  user_id: int) -> Optional[models.Post]:
+                                  user_id: int,
+                                  options: Sequence[Any] = loader_profiles.POST_ONLY) -> Optional[models.Post]:
         """
         Get specific post with ownership verification.
         
         :param db: Database session
         :param post_id: Post ID to find
         :param user_id: User ID for ownership check
+        :param options: Loader profile (use loader_profiles.POST_WITH_AUTHOR to get author data)
         :return: Post object or None
         """
-        query = select(models.Post).where(
+        query = select(models.Post).options(*options).where(
             and_(
                 models.Post.user_id == user_id,
                 models.Post.id == post_id
@@ -122,31 +232,128 @@ class PostDao:
         post = await db.execute(query)
         return post.scalars().first()
     
-    @classmethod
-    async def get_posts_by_user_id(cls,
-                                   user_id: int,
-                                   db: AsyncSession) -> List[models.Post]:
-        query = select(models.Post).where(models.Post.user_id == user_id)
-        items = await db.execute(query)
-        
-        return items.scalars().all()
-    
-    
     @classmethod
     async def get_all_posts(cls,
-                            db: AsyncSession) -> response_schemas.PostResponse:
+                            db: AsyncSession,
+                            limit: int,
+                            cursor: Optional[str] = None) -> Tuple[List[response_schemas.PostWithUserResponse], Optional[str]]:
         """
-        Get all posts from database with associated user information.
-        Delegates response formatting to PostService.
+        Get one page of posts from database with associated user information.
+        Posts are ordered from newest to oldest, page is selected by cursor.
+        Runs one SELECT of post columns + author name/email with JOIN,
+        rows are mapped straight into response schemas (no ORM objects).
         
         :param db: Database session
-        :return: List[response_schemas.PostWithUserResponse] - Formatted posts with user data
+        :param limit: Max number of posts on the page
+        :param cursor: Cursor from previous page (None for the first page)
+        :return: Tuple of formatted posts with user data and next page cursor
         """
+        query = select(*loader_profiles.POST_WITH_AUTHOR_COLUMNS).join(models.Post.user)
 
-        # Get all Posts from DB
-        posts = await GeneralDAO.get_all_records(db=db, model=models.Post)
-        await exception_helper.CheckHTTP404NotFound(founding_item=posts, text="Posts not found")
+        # Get one page of rows from DB
+        rows, next_cursor = await GeneralDAO.get_records_page(db=db,
+                                                              model=models.Post,
+                                                              limit=limit,
+                                                              cursor=cursor,
+                                                              query=query)
+        await exception_helper.CheckHTTP404NotFound(founding_item=rows, text="Posts not found")
 
         # Delegate formatting to PostService to separate concerns
-        posts_list = await PostService.get_formated_posts(items=posts)
-        return posts_list
+        posts_list = await PostService.get_formated_posts(rows=rows)
+        return posts_list, next_cursor
+
+    @classmethod
+    async def search_posts(cls,
+                           db: AsyncSession,
+                           search_query: str,
+                           limit: int,
+                           cursor: Optional[str] = None) -> Tuple[List[response_schemas.PostWithUserResponse], Optional[str]]:
+        """
+        Full-text search over post content, most relevant first.
+        SQLite - FTS5 table posts_fts (bm25 rank), PostgreSQL - GIN index on
+        to_tsvector(content) (ts_rank). All words of query must match.
+        Pages are selected by (rank, id) cursor.
+        
+        :param db: Database session
+        :param search_query: Words to search for (user input, special characters are ignored)
+        :param limit: Max number of posts on the page
+        :param cursor: Cursor from previous page (None for the first page)
+        :return: Tuple of posts with author data and next page cursor
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            document = func.to_tsvector(models.SEARCH_CONFIG, models.Post.content)    # Same expression as GIN index
+            ts_query = func.plainto_tsquery(models.SEARCH_CONFIG, search_query)
+            rank = func.ts_rank(document, ts_query)
+            query = select(*loader_profiles.POST_WITH_AUTHOR_COLUMNS, rank.label("rank")).join(
+                models.Post.user
+            ).where(document.op("@@")(ts_query))
+        else:
+            # Quote every word, so FTS5 operators and syntax from user input are not interpreted
+            words = re.findall(r"\w+", search_query)
+            if not words:
+                return [], None
+            match = " ".join(f'"{word}"' for word in words)
+
+            posts_fts = table("posts_fts", column("rowid"))
+            rank = -func.bm25(literal_column("posts_fts"))    # bm25: lower is better, turn to "higher is better"
+            query = select(*loader_profiles.POST_WITH_AUTHOR_COLUMNS, rank.label("rank")).select_from(
+                posts_fts
+            ).join(
+                models.Post, models.Post.id == posts_fts.c.rowid
+            ).join(
+                models.Post.user
+            ).where(literal_column("posts_fts").op("MATCH")(match))
+
+        # Rank is computed per row, so cursor condition is applied on top of ranked subquery
+        ranked = query.subquery()
+        page_query = select(ranked)
+
+        if cursor:
+            cursor_rank, cursor_id = pagination_helper.decode_rank_cursor(cursor)
+            page_query = page_query.where(
+                or_(
+                    ranked.c.rank < cursor_rank,
+                    and_(ranked.c.rank == cursor_rank, ranked.c.id < cursor_id)
+                )
+            )
+
+        # Take one extra row to know if there is a next page
+        page_query = page_query.order_by(ranked.c.rank.desc(), ranked.c.id.desc()).limit(limit + 1)
+        rows = (await db.execute(page_query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = pagination_helper.encode_rank_cursor(rank=rows[-1].rank, record_id=rows[-1].id)
+
+        posts_list = await PostService.get_formated_posts(rows=rows)   # "rank" column is ignored by schema
+        return posts_list, next_cursor
+
+    @classmethod
+    async def stream_posts(cls,
+                           db: AsyncSession,
+                           since: Optional[datetime] = None,
+                           batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream all posts from server-side cursor, oldest first.
+        Only post columns are selected (no ORM objects, no identity map),
+        rows are fetched by batch_size, so memory doesn't depend on table size.
+
+        :param db: Database session (must stay open while iterating)
+        :param since: Return only posts created at or after this time (watermark of previous export)
+        :param batch_size: Rows fetched from database at once
+        :return: Async iterator over batches of rows (id, user_id, content, created_at)
+        """
+        query = select(
+            models.Post.id,
+            models.Post.user_id,
+            models.Post.content,
+            models.Post.created_at
+        ).order_by(models.Post.created_at, models.Post.id)   # Served by ix_posts_created_at_id
+
+        if since:
+            query = query.where(models.Post.created_at >= since)
+
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield batch
@@ -0,0 +1,265 @@
+from datetime import datetime
+from sqlalchemy import select, insert, delete, exists, literal, true, and_, or_, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import Any, List, Optional, Tuple
+
+from config import settings
+from database import response_schemas
+from database import models, loader_profiles
+from helpers import pagination_helper
+from services.post_services import PostService
+
+
+class TimelineDAO:
+    """
+    Data Access Object for home timelines (TimelineEntry model).
+
+    Fan-out on write: new post of an author with less than FANOUT_MAX_FOLLOWERS
+    followers is copied into timeline_entries of every follower in the same transaction.
+    Fan-out on read: posts of bigger authors (and reader's own posts) are not copied,
+    they are merged into the page when timeline is read.
+    """
+    FANOUT_MAX_FOLLOWERS = settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+    BACKFILL_POSTS = settings.TIMELINE_BACKFILL_POSTS
+    MAX_PULL_QUERIES = 50   # Pulled authors read with own LIMIT subquery, the rest share one IN subquery
+
+    @classmethod
+    def _before_cursor(cls, created_at_column: Any, id_column: Any, cursor: Optional[Tuple[datetime, int]]) -> List[Any]:
+        """(created_at, id) < cursor, same form as GeneralDAO.get_records_page (index range seek)"""
+        if cursor is None:
+            return []
+
+        cursor_created_at, cursor_id = cursor
+        return [
+            created_at_column <= cursor_created_at,
+            or_(created_at_column < cursor_created_at, id_column < cursor_id)
+        ]
+
+    @classmethod
+    async def fan_out_posts(cls,
+                            db: AsyncSession,
+                            post_ids: List[int]) -> None:
+        """
+        Copy new posts into timelines of their authors' followers with one INSERT ... SELECT.
+        Authors with FANOUT_MAX_FOLLOWERS followers or more are skipped (read side merges them).
+        Doesn't commit - call in the transaction that creates the posts.
+
+        :param db: Database session
+        :param post_ids: IDs of flushed posts
+        """
+        if not post_ids:
+            return
+
+        followers_of_posts = select(
+            models.Follow.follower_id,
+            models.Post.id,
+            models.Post.user_id,
+            models.Post.created_at
+        ).join(
+            models.Follow, models.Follow.followee_id == models.Post.user_id
+        ).join(
+            models.User, models.User.id == models.Post.user_id
+        ).where(
+            and_(
+                models.Post.id.in_(post_ids),
+                models.User.follower_count < cls.FANOUT_MAX_FOLLOWERS
+            )
+        )
+
+        query = insert(models.TimelineEntry).from_select(
+            ["user_id", "post_id", "author_id", "created_at"],
+            followers_of_posts
+        )
+        await db.execute(query)
+
+    @classmethod
+    async def backfill_author(cls,
+                              db: AsyncSession,
+                              user_id: int,
+                              author_id: int) -> None:
+        """
+        Copy recent posts of just followed author into follower's timeline.
+        Doesn't commit.
+
+        :param db: Database session
+        :param user_id: Follower (timeline owner)
+        :param author_id: Followed author
+        """
+        recent_posts = select(
+            models.Post.id,
+            models.Post.created_at
+        ).where(
+            models.Post.user_id == author_id
+        ).order_by(models.Post.created_at.desc()).limit(cls.BACKFILL_POSTS).subquery()   # ix_posts_user_id_created_at
+
+        query = insert(models.TimelineEntry).from_select(
+            ["user_id", "post_id", "author_id", "created_at"],
+            select(literal(user_id), recent_posts.c.id, literal(author_id), recent_posts.c.created_at)
+        )
+        await db.execute(query)
+
+    @classmethod
+    async def backfill_followers(cls,
+                                 db: AsyncSession,
+                                 author_id: int) -> None:
+        """
+        Copy recent posts of author into timelines of all followers with one INSERT ... SELECT.
+        For author who dropped below FANOUT_MAX_FOLLOWERS: their posts were merged on read,
+        so posts written (and follows made) while they were big have no entries.
+        Entries that already exist are skipped. Doesn't commit.
+
+        :param db: Database session
+        :param author_id: Author whose posts to copy
+        """
+        recent_posts = select(
+            models.Post.id,
+            models.Post.created_at
+        ).where(
+            models.Post.user_id == author_id
+        ).order_by(models.Post.created_at.desc()).limit(cls.BACKFILL_POSTS).subquery()   # ix_posts_user_id_created_at
+
+        already_copied = exists().where(
+            and_(
+                models.TimelineEntry.user_id == models.Follow.follower_id,
+                models.TimelineEntry.post_id == recent_posts.c.id
+            )
+        )
+
+        followers_posts = select(
+            models.Follow.follower_id,
+            recent_posts.c.id,
+            literal(author_id),
+            recent_posts.c.created_at
+        ).select_from(models.Follow).join(
+            recent_posts, true()
+        ).where(
+            and_(
+                models.Follow.followee_id == author_id,
+                ~already_copied
+            )
+        )
+
+        query = insert(models.TimelineEntry).from_select(
+            ["user_id", "post_id", "author_id", "created_at"],
+            followers_posts
+        )
+        await db.execute(query)
+
+    @classmethod
+    async def remove_author(cls,
+                            db: AsyncSession,
+                            user_id: int,
+                            author_id: int) -> None:
+        """Remove posts of unfollowed author from follower's timeline. Doesn't commit"""
+        query = delete(models.TimelineEntry).where(
+            and_(
+                models.TimelineEntry.author_id == author_id,
+                models.TimelineEntry.user_id == user_id
+            )
+        ).execution_options(synchronize_session=False)
+        await db.execute(query)
+
+    @classmethod
+    async def remove_post(cls,
+                          db: AsyncSession,
+                          post_id: int,
+                          author_id: int) -> None:
+        """Remove deleted post from all timelines (author_id - ownership check). Doesn't commit"""
+        query = delete(models.TimelineEntry).where(
+            and_(
+                models.TimelineEntry.post_id == post_id,
+                models.TimelineEntry.author_id == author_id
+            )
+        ).execution_options(synchronize_session=False)
+        await db.execute(query)
+
+    @classmethod
+    async def remove_users(cls,
+                           db: AsyncSession,
+                           user_ids: List[int]) -> None:
+        """
+        Remove timelines of deleted users and their posts from other timelines.
+        Doesn't commit.
+
+        :param db: Database session
+        :param user_ids: IDs of deleted users
+        """
+        for column in (models.TimelineEntry.author_id, models.TimelineEntry.user_id):
+            await db.execute(
+                delete(models.TimelineEntry).where(column.in_(user_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+    @classmethod
+    async def get_home_timeline(cls,
+                                db: AsyncSession,
+                                user_id: int,
+                                limit: int,
+                                cursor: Optional[str] = None) -> Tuple[List[response_schemas.PostWithUserResponse], Optional[str]]:
+        """
+        Get one page of user's home timeline: posts of followed users and own posts, newest first.
+
+        Materialized entries are one range read of ix_timeline_entries_user_created_at.
+        Posts of authors that are not fanned out (big authors, reader himself) are read
+        with one LIMIT subquery per author from ix_posts_user_id_created_at.
+        Everything is merged, deduplicated and joined with authors in one SELECT.
+
+        :param db: Database session
+        :param user_id: Timeline owner
+        :param limit: Max number of posts on the page
+        :param cursor: Cursor from previous page (None for the first page)
+        :return: Tuple of posts with author data and next page cursor
+        """
+        decoded_cursor = pagination_helper.decode_cursor(cursor) if cursor else None
+
+        # Followed authors that are read on demand
+        pulled_query = select(models.Follow.followee_id).join(
+            models.User, models.User.id == models.Follow.followee_id
+        ).where(
+            and_(
+                models.Follow.follower_id == user_id,
+                models.User.follower_count >= cls.FANOUT_MAX_FOLLOWERS
+            )
+        )
+        pulled_authors = [user_id] + list((await db.execute(pulled_query)).scalars().all())
+
+        entries = select(
+            models.TimelineEntry.post_id.label("id"),
+            models.TimelineEntry.created_at
+        ).where(
+            models.TimelineEntry.user_id == user_id,
+            *cls._before_cursor(models.TimelineEntry.created_at, models.TimelineEntry.post_id, decoded_cursor)
+        ).order_by(
+            models.TimelineEntry.created_at.desc(), models.TimelineEntry.post_id.desc()
+        ).limit(limit + 1)
+
+        def author_posts(condition):
+            return select(models.Post.id, models.Post.created_at).where(
+                condition,
+                *cls._before_cursor(models.Post.created_at, models.Post.id, decoded_cursor)
+            ).order_by(models.Post.created_at.desc(), models.Post.id.desc()).limit(limit + 1)
+
+        sources = [entries]
+        sources += [author_posts(models.Post.user_id == author_id) for author_id in pulled_authors[:cls.MAX_PULL_QUERIES]]
+        if len(pulled_authors) > cls.MAX_PULL_QUERIES:
+            sources.append(author_posts(models.Post.user_id.in_(pulled_authors[cls.MAX_PULL_QUERIES:])))
+
+        # Every source has own ORDER BY/LIMIT, so wrap it as subquery (SQLite compound SELECT rule).
+        # UNION removes posts found both in entries and in pulled authors (author crossed the threshold)
+        candidates = union(*(select(source.subquery()) for source in sources)).subquery()
+
+        query = select(*loader_profiles.POST_WITH_AUTHOR_COLUMNS).join(
+            models.Post.user
+        ).join(
+            candidates, candidates.c.id == models.Post.id
+        ).order_by(models.Post.created_at.desc(), models.Post.id.desc()).limit(limit + 1)
+        rows = (await db.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = pagination_helper.encode_cursor(created_at=rows[-1].created_at, record_id=rows[-1].id)
+
+        posts_list = await PostService.get_formated_posts(rows=rows)
+        return posts_list, next_cursor
@@ -1,13 +1,17 @@
 from datetime import datetime
-from sqlalchemy import or_, select, update, delete, and_, func
+from sqlalchemy import bindparam, or_, select, insert, update, delete, and_, func
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from DAO.follow_dao import FollowDAO
 from DAO.general_dao import GeneralDAO
 from database import response_schemas
-from database import models
+from database import models, loader_profiles
 from helpers import exception_helper
+from services.auth_cache import auth_user_cache
+from services.response_cache import response_cache, author_tag, user_tag
 from services.user_services import UserService
 
 
@@ -16,18 +20,22 @@ class UserDAO:
     Data Access Object for User model.
     Contains user-specific database operations.
     """
+    POSTS_DELETE_CHUNK_SIZE = 10000  # Max posts removed by one DELETE statement
+    
     @classmethod
     async def get_user_email(cls, 
                              db: AsyncSession, 
-                             user_email: str) -> Optional[models.User]:
+                             user_email: str,
+                             options: Sequence[Any] = loader_profiles.USER_AUTH) -> Optional[models.User]:
         """
         Find user by email address.
         
         :param db: Database session
         :param user_email: Email to search for
+        :param options: Loader profile (use loader_profiles.USER_LOGIN to get password hash)
         :return: User object or None
         """
-        query = select(models.User).where(models.User.email == str(user_email))
+        query = select(models.User).options(*options).where(models.User.email == str(user_email))
         email = await db.execute(query)
 
         return email.scalars().first()
@@ -35,31 +43,138 @@ class UserDAO:
     @classmethod
     async def get_user_name(cls, 
                             db: AsyncSession, 
-                            user_name: str) -> Optional[models.User]:
+                            user_name: str,
+                            options: Sequence[Any] = loader_profiles.USER_AUTH) -> Optional[models.User]:
         """
         Find user by username.
         
         :param db: Database session
         :param user_name: Username to search for
+        :param options: Loader profile from database/loader_profiles.py
         :return: User object or None
         """
-        query = select(models.User).where(models.User.name == str(user_name))
+        query = select(models.User).options(*options).where(models.User.name == str(user_name))
         name = await db.execute(query)
 
         return name.scalars().first()
 
+    @classmethod
+    async def get_active_user_ids(cls,
+                                  db: AsyncSession,
+                                  user_ids: List[int],
+                                  emails: List[str]) -> Dict[str, Dict[Any, int]]:
+        """
+        Find active users by IDs and emails with one query (for post import).
+
+        :param db: Database session
+        :param user_ids: User IDs to look up
+        :param emails: User emails to look up
+        :return: {"ids": {id: id}, "emails": {email: id}} for found users
+        """
+        found = {"ids": {}, "emails": {}}
+        if not user_ids and not emails:
+            return found
+
+        query = select(models.User.id, models.User.email).where(
+            and_(
+                models.User.is_active == True,
+                or_(models.User.id.in_(user_ids), models.User.email.in_(emails))
+            )
+        )
+        for user in (await db.execute(query)).all():
+            found["ids"][user.id] = user.id
+            found["emails"][user.email] = user.id
+
+        return found
+
+    @classmethod
+    async def get_active_user_names(cls, db: AsyncSession) -> List[Tuple[int, str]]:
+        """
+        Load ID and name of every active user (for in-process username index).
+        Only two columns are selected, rows are not turned into ORM objects.
+
+        :param db: Database session
+        :return: List of (id, name) pairs
+        """
+        query = select(models.User.id, models.User.name).where(models.User.is_active == True)
+        result = await db.execute(query)
+
+        return [tuple(row) for row in result.all()]
+
+    @classmethod
+    async def autocomplete_user_names(cls,
+                                      db: AsyncSession,
+                                      prefix: str,
+                                      limit: int) -> List[Tuple[int, str]]:
+        """
+        Find active users whose name starts with prefix (fallback when username index is cold).
+
+        Range "name >= prefix AND name < next prefix" is served by the unique index on users.name.
+        LIKE 'prefix%' alone can't use it in SQLite (case-insensitive LIKE vs BINARY index),
+        so LIKE only re-checks the rows found in the range.
+
+        :param db: Database session
+        :param prefix: Beginning of username (case-sensitive)
+        :param limit: Max number of results
+        :return: List of (id, name) pairs ordered by name
+        """
+        filters = [models.User.is_active == True,
+                   models.User.name >= prefix,
+                   models.User.name.startswith(prefix, autoescape=True)]
+
+        # Smallest string greater than every string starting with prefix
+        next_code = ord(prefix[-1]) + 1
+        if 0xD800 <= next_code <= 0xDFFF:
+            next_code = 0xE000      # Surrogates can't be encoded
+        if next_code <= 0x10FFFF:
+            filters.append(models.User.name < prefix[:-1] + chr(next_code))
+
+        query = select(models.User.id, models.User.name).where(*filters).order_by(models.User.name).limit(limit)
+        result = await db.execute(query)
+
+        return [tuple(row) for row in result.all()]
+
+    @classmethod
+    async def create_user(cls,
+                          db: AsyncSession,
+                          user_data: Dict[str, Any]) -> Row:
+        """
+        Insert new user with one INSERT ... RETURNING and commit.
+        Server-generated columns (id, created_at, counters) come back in the same round trip,
+        so there is no refresh query and no ORM object in the session.
+
+        :param db: Database session
+        :param user_data: Column values (password already hashed), None - column default
+        :return: Row with profile columns (loader_profiles.USER_PROFILE_COLUMNS)
+        """
+        # None is left out like in ORM add(), so server defaults (bio, location) apply
+        values = {key: value for key, value in user_data.items() if value is not None}
+        query = insert(models.User).values(**values).returning(*loader_profiles.USER_PROFILE_COLUMNS)
+
+        try:
+            new_user = (await db.execute(query)).one()
+            await db.commit()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+        return new_user
+
     @classmethod
     async def get_user_by_id(cls, 
                              db: AsyncSession, 
-                             user_id: int) -> Optional[models.User]:
+                             user_id: int,
+                             options: Sequence[Any] = loader_profiles.USER_PROFILE) -> Optional[models.User]:
         """
         Find user by ID.
         
         :param db: Database session
         :param user_id: User ID to find
+        :param options: Loader profile from database/loader_profiles.py
         :return: User object or None
         """
-        query = select(models.User).where(models.User.id == user_id)
+        query = select(models.User).options(*options).where(models.User.id == user_id)
         result = await db.execute(query)
 
         user = result.scalars().first()
@@ -67,6 +182,85 @@ class UserDAO:
         return user
 
     
+    @classmethod
+    async def get_auth_user(cls,
+                            db: AsyncSession,
+                            user_id: int) -> Optional[Row]:
+        """
+        Get only columns protected routes need (id, name, is_active, is_admin), the row is not hydrated.
+
+        :param db: Database session
+        :param user_id: ID from access token
+        :return: Row or None
+        """
+        query = select(
+            models.User.id,
+            models.User.name,
+            models.User.is_active,
+            models.User.is_admin
+        ).where(models.User.id == user_id)
+        result = await db.execute(query)
+
+        return result.first()
+
+    @classmethod
+    async def get_user_version(cls,
+                               db: AsyncSession,
+                               user_id: int) -> Optional[int]:
+        """
+        Get only version of user's representation (for ETag check), the row is not hydrated.
+        
+        :param db: Database session
+        :param user_id: User ID
+        :return: users.version or None if user not found
+        """
+        query = select(models.User.version).where(models.User.id == user_id)
+        return (await db.execute(query)).scalar_one_or_none()
+
+    @classmethod
+    async def touch_users(cls,
+                          db: AsyncSession,
+                          user_ids: List[int]) -> None:
+        """
+        Bump version of users whose profile response changed without change of users row
+        (e.g. content of their post was edited). Doesn't commit.
+        
+        :param db: Database session
+        :param user_ids: IDs of users to touch
+        """
+        query = update(models.User).where(
+            models.User.id.in_(user_ids)
+        ).values(version=models.User.version + 1).execution_options(synchronize_session=False)
+        await db.execute(query)
+
+    @classmethod
+    async def replace_password_hash(cls,
+                                    db: AsyncSession,
+                                    user_id: int,
+                                    old_hash: str,
+                                    new_hash: str) -> bool:
+        """
+        Store password rehashed with new parameters and commit.
+        Only if the row still has the verified hash - a password changed meanwhile is not overwritten.
+        Version is kept: the profile representation (and its ETag) doesn't change.
+
+        :param db: Database session
+        :param user_id: User ID
+        :param old_hash: Hash the password was verified against
+        :param new_hash: Hash of the same password with current parameters
+        :return: True if the hash was replaced
+        """
+        query = update(models.User).where(
+            and_(
+                models.User.id == user_id,
+                models.User.password == old_hash
+            )
+        ).values(password=new_hash, version=models.User.version).execution_options(synchronize_session=False)
+        result = await db.execute(query)
+        await db.commit()
+
+        return result.rowcount > 0
+
     @classmethod
     async def get_user_with_posts(cls, 
                                   user_id: int,
@@ -78,7 +272,9 @@ class UserDAO:
             :param user_id: User ID to find
             :return: User data
         """
-        user = await cls.get_user_by_id(user_id=user_id, db=db)
+        user = await cls.get_user_by_id(user_id=user_id,
+                                        db=db,
+                                        options=loader_profiles.USER_WITH_POSTS)
         await exception_helper.CheckHTTP404NotFound(founding_item=user, text="User not found")
         
         user_with_posts = await UserService.create_user_with_posts_response(user=user)
@@ -87,81 +283,284 @@ class UserDAO:
     
     @classmethod
     async def get_all_users(cls,
-                            db: AsyncSession) -> response_schemas.UserResponse:
+                            db: AsyncSession,
+                            limit: int,
+                            cursor: Optional[str] = None,
+                            name_prefix: Optional[str] = None,
+                            created_from: Optional[datetime] = None,
+                            created_to: Optional[datetime] = None,
+                            is_admin: Optional[bool] = None) -> Tuple[List[response_schemas.UserResponse], Optional[str]]:
         """
-        Get all users from database and return formatted response.
+        Get one page of active users from database and return formatted response.
+        All filters are applied in SQL, so the page costs the same for any table size.
         Delegates formatting to UserService.
         
         :param db: Database session
-        :return: List[response_schemas.UserResponse] - List of formatted user responses
+        :param limit: Max number of users on the page
+        :param cursor: Cursor from previous page (None for the first page)
+        :param name_prefix: Return only users whose name starts with this text
+        :param created_from: Return only users created at or after this time
+        :param created_to: Return only users created before this time
+        :param is_admin: Return only admins (True) or only regular users (False)
+        :return: Tuple of formatted user responses and next page cursor
         """
 
-        # Get all users from DB
-        # users = await GeneralDAO.get_all_records(db=db, model=models.User)
-        query = select(models.User).where(
-            or_(
-                models.User.is_active == True,
-                models.User.is_active == 1,
-                models.User.is_active == "true" # SQLite use this, so I add it here and also I add default "True" value
-            )                                   # If u use Postgre mb it's should work too, cause I add "True" but "должно, но не обязано"
-        )  
+        # Plain "is_active = true" predicate, so partial index ix_users_active_created_at is used.
+        # Old SQLite 'true'/'false' text values are normalized by migration a1f3c9d2e4b5
+        filters = [models.User.is_active == True]
 
-        result = await db.execute(query)
+        if name_prefix:
+            filters.append(models.User.name.startswith(name_prefix, autoescape=True))
+
+        if created_from:
+            filters.append(models.User.created_at >= created_from)
+
+        if created_to:
+            filters.append(models.User.created_at < created_to)
 
-        users = result.scalars().all()
+        if is_admin is not None:
+            filters.append(models.User.is_admin == is_admin)
+
+        # Posts are not part of UserResponse, so don't load them
+        users, next_cursor = await GeneralDAO.get_records_page(db=db,
+                                                               model=models.User,
+                                                               limit=limit,
+                                                               cursor=cursor,
+                                                               filters=filters,
+                                                               options=loader_profiles.USER_PROFILE)
         await exception_helper.CheckHTTP404NotFound(founding_item=users, text="Users not found")
         
         # Delegate formatting to UserService to separate concerns
         users_list = await UserService.get_formated_users(users=users)
 
-        return users_list
+        return users_list, next_cursor
     
     @classmethod
     async def soft_delete_acc(cls,
                               user_id: int,
                               db: AsyncSession,
                               deleted_by_admin: bool = False,
-                              deletion_reason: Optional[str] = '') -> models.User:
+                              deletion_reason: Optional[str] = '') -> None:
+        """
+        Mark user as deleted with one UPDATE statement.
+        Doesn't commit - use delete_account() to delete user together with posts
+        (it also drops the user from auth_user_cache after commit).
         
-        query = select(models.User).where(models.User.id == user_id)
+        :param user_id: ID of user to delete
+        :param db: Database session
+        :param deleted_by_admin: Was account deleted by admin
+        :param deletion_reason: Reason of deletion
+        :raises HTTPException: 404 if user not found or already deleted
+        """
+        query = update(models.User).where(
+            and_(
+                models.User.id == user_id,
+                models.User.is_active == True
+            )
+        ).values(
+            is_active=False,
+            deleted_by_admin=deleted_by_admin,
+            deletion_reason=deletion_reason,
+            deleted_at=datetime.utcnow()
+        ).execution_options(synchronize_session=False)
 
         result = await db.execute(query)
-
-        user = result.scalars().first()
-        await exception_helper.CheckHTTP404NotFound(founding_item=user, text="User not found or already deleted")
-
-        user.is_active = False
-        user.deleted_by_admin = deleted_by_admin
-        user.deletion_reason = deletion_reason
-        user.deleted_at = datetime.utcnow()
-
-        await db.commit()
-        await db.refresh(user)
+        await exception_helper.CheckHTTP404NotFound(founding_item=result.rowcount, text="User not found or already deleted")
 
     @classmethod
     async def soft_delete_user_posts(cls,
                                      db: AsyncSession,
                                      user_id: int) -> int:
         """
-        Soft delete all posts of a user.
-        Actually deletes them (hard delete) as requested.
+        Delete all posts of a user (hard delete) without loading them.
+        Runs DELETE ... WHERE user_id = :id in chunks of POSTS_DELETE_CHUNK_SIZE rows,
+        so accounts with huge number of posts don't produce one giant statement.
+        Doesn't commit - use delete_account() to delete user together with posts.
         
         :param db: Database session
         :param user_id: ID of user whose posts to delete
-        :return: Number of deleted posts
+        :return: Number of deleted posts (row count reported by database)
         """
-        from DAO.post_dao import PostDao
-        
-        posts = await PostDao.get_posts_by_user_id(db=db, user_id=user_id)
+        return await cls.delete_posts_of_users(db=db, user_ids=[user_id])
+
+    @classmethod
+    async def delete_posts_of_users(cls,
+                                    db: AsyncSession,
+                                    user_ids: List[int]) -> int:
+        """
+        Delete all posts of given users (hard delete) without loading them.
+        Runs DELETE ... WHERE user_id IN (...) in chunks of POSTS_DELETE_CHUNK_SIZE rows.
+        Doesn't commit.
         
+        :param db: Database session
+        :param user_ids: IDs of users whose posts to delete
+        :return: Number of deleted posts (row count reported by database)
+        """
+        chunk = select(models.Post.id).where(models.Post.user_id.in_(user_ids)).limit(cls.POSTS_DELETE_CHUNK_SIZE)
+        query = delete(models.Post).where(
+            models.Post.id.in_(chunk)
+        ).execution_options(synchronize_session=False)
+
         delete_count = 0
-        for post in posts:
-            await db.delete(post)
-            delete_count += 1
-        
-        await db.commit()
+        while True:
+            result = await db.execute(query)
+            delete_count += result.rowcount
+
+            if result.rowcount < cls.POSTS_DELETE_CHUNK_SIZE:
+                break
+
+        await db.execute(
+            update(models.User).where(models.User.id.in_(user_ids)).values(post_count=0)
+            .execution_options(synchronize_session=False)
+        )
         
         return delete_count
+
+    @classmethod
+    async def change_post_counts(cls,
+                                 db: AsyncSession,
+                                 changes: Dict[int, int]) -> None:
+        """
+        Add deltas to users.post_count in the caller's transaction.
+        Increment is done by database (post_count = post_count + n), so concurrent
+        requests don't overwrite each other. Doesn't commit.
+        
+        :param db: Database session
+        :param changes: Dictionary {user ID: number of added (or removed, negative) posts}
+        """
+        changes = {user_id: delta for user_id, delta in changes.items() if delta}
+        if not changes:
+            return
+
+        query = update(models.User.__table__).where(
+            models.User.__table__.c.id == bindparam("user_id")
+        ).values(post_count=models.User.__table__.c.post_count + bindparam("delta"))
+
+        # One executemany for all users
+        connection = await db.connection()
+        await connection.execute(query, [{"user_id": user_id, "delta": delta} for user_id, delta in changes.items()])
+
+    @classmethod
+    async def reconcile_post_counts(cls, db: AsyncSession) -> int:
+        """
+        Repair drift of users.post_count with one set-based UPDATE:
+        only rows where counter differs from real number of posts are written.
+        
+        :param db: Database session
+        :return: Number of repaired users
+        """
+        real_count = select(func.count(models.Post.id)).where(
+            models.Post.user_id == models.User.id
+        ).scalar_subquery()
+
+        query = update(models.User).where(
+            models.User.post_count != real_count
+        ).values(post_count=real_count).execution_options(synchronize_session=False)
+
+        try:
+            result = await db.execute(query)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        return result.rowcount
+
+    @classmethod
+    async def delete_account(cls,
+                             user_id: int,
+                             db: AsyncSession,
+                             deleted_by_admin: bool = False,
+                             deletion_reason: Optional[str] = None) -> int:
+        """
+        Delete user account in one transaction:
+        soft delete user, remove follows and timelines, hard delete all user's posts, then commit once.
+        If anything fails, nothing is changed.
+        
+        :param user_id: ID of user to delete
+        :param db: Database session
+        :param deleted_by_admin: Was account deleted by admin
+        :param deletion_reason: Reason of deletion
+        :return: Number of deleted posts
+        :raises HTTPException: 404 if user not found or already deleted
+        """
+        try:
+            await cls.soft_delete_acc(user_id=user_id,
+                                      db=db,
+                                      deleted_by_admin=deleted_by_admin,
+                                      deletion_reason=deletion_reason)
+            
+            # Timeline entries reference posts, remove them first
+            followers = await FollowDAO.remove_users(db=db, user_ids=[user_id])
+            deleted_posts_count = await cls.soft_delete_user_posts(db=db, user_id=user_id)
+
+            await db.commit()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+        auth_user_cache.invalidate(user_id)
+        # Other side of removed follows shows changed counters
+        await response_cache.invalidate(user_tag(user_id), author_tag(user_id), *map(user_tag, followers))
+
+        return deleted_posts_count
+
+    @classmethod
+    async def delete_accounts(cls,
+                              user_ids: List[int],
+                              db: AsyncSession,
+                              deletion_reason: str,
+                              exclude_user_id: Optional[int] = None) -> Dict[int, int]:
+        """
+        Delete many user accounts (by admin) in one transaction.
+        One UPDATE ... WHERE id IN (...) RETURNING marks active users as deleted and
+        reads their post_count (kept by PostDao, so posts are not counted again),
+        then their follows and timelines are removed and posts of all deleted users
+        are removed with chunked set-based DELETE.
+        
+        :param user_ids: IDs of users to delete
+        :param db: Database session
+        :param deletion_reason: Reason of deletion
+        :param exclude_user_id: User who must not be deleted (admin himself)
+        :return: Dictionary {deleted user ID: number of deleted posts}
+        """
+        conditions = [
+            models.User.id.in_(user_ids),
+            models.User.is_active == True
+        ]
+        if exclude_user_id is not None:
+            conditions.append(models.User.id != exclude_user_id)
+
+        query = update(models.User).where(and_(*conditions)).values(
+            is_active=False,
+            deleted_by_admin=True,
+            deletion_reason=deletion_reason,
+            deleted_at=datetime.utcnow()
+        ).returning(models.User.id, models.User.post_count).execution_options(synchronize_session=False)
+
+        try:
+            result = await db.execute(query)
+            posts_count = dict(result.all())
+            deleted_user_ids = list(posts_count)
+
+            followers = []
+            if deleted_user_ids:
+                followers = await FollowDAO.remove_users(db=db, user_ids=deleted_user_ids)
+                await cls.delete_posts_of_users(db=db, user_ids=deleted_user_ids)
+
+            await db.commit()
+
+        except Exception:
+            await db.rollback()
+            raise
+
+        auth_user_cache.invalidate(*deleted_user_ids)
+        await response_cache.invalidate(*(tag for user_id in deleted_user_ids
+                                          for tag in (user_tag(user_id), author_tag(user_id))),
+                                        *map(user_tag, followers))
+
+        return posts_count
     
     @classmethod
     async def get_deleted_users(cls,
@@ -172,10 +571,10 @@ class UserDAO:
         :param db: Database session
         :return: List of deleted users
         """
-        query = select(models.User).where(or_(
-            models.User.is_active == False,
-            models.User.is_active == "false"
-        )).order_by(models.User.deleted_at.desc())
+        # Matches partial index ix_users_deleted_deleted_at
+        query = select(models.User).options(*loader_profiles.USER_PROFILE).where(
+            models.User.is_active == False
+        ).order_by(models.User.deleted_at.desc())
         
         result = await db.execute(query)
         return result.scalars().all()
\ No newline at end of file
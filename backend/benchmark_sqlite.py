@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database.database import Base, create_engine, create_sessionmaker
+from database import models
+
+"""
+SQLite throughput benchmark: driver defaults vs DB_PROFILE=production.
+
+Defaults - rollback journal, synchronous=FULL, small page cache.
+Production - WAL, synchronous=NORMAL, mmap, big page cache, busy_timeout,
+sized pool (see database.install_sqlite_pragmas).
+
+Both engines run the same workload on their own temporary database file:
+concurrent single-row writes (one commit each), concurrent feed reads
+and both together. SQL echo is off for both, so only the database work
+is measured.
+
+Run: python benchmark_sqlite.py
+"""
+
+CONCURRENCY = 16     # Parallel tasks, like parallel requests
+WRITES = 2000        # Posts to create, one transaction per post
+READS = 4000         # Feed pages to read
+PAGE_SIZE = 20
+
+
+async def prepare(engine: AsyncEngine) -> int:
+    """Create tables and one author, return author ID"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with create_sessionmaker(engine)() as db:
+        user = models.User(name="bench", email="bench@example.com", password="x", is_active=True)
+        db.add(user)
+        await db.flush()
+        user_id = user.id
+        await db.commit()
+
+    return user_id
+
+
+async def run_tasks(count: int, worker) -> float:
+    """
+    Run "count" operations with CONCURRENCY parallel workers.
+
+    :param count: Total number of operations
+    :param worker: Async function doing one operation
+    :return: Operations per second
+    """
+    queue = iter(range(count))
+
+    async def loop():
+        for number in queue:
+            await worker(number)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(CONCURRENCY)))
+
+    return count / (time.perf_counter() - started)
+
+
+async def benchmark(engine: AsyncEngine) -> dict:
+    """
+    Measure write, read and mixed throughput of engine.
+
+    :param engine: Engine to test
+    :return: Operations per second for each workload
+    """
+    user_id = await prepare(engine)
+    session_factory = create_sessionmaker(engine)
+
+    async def write(number: int):
+        async with session_factory() as db:
+            db.add(models.Post(content=f"Benchmark post {number}", user_id=user_id))
+            await db.commit()
+
+    async def read(number: int):
+        async with session_factory() as db:
+            query = select(models.Post).order_by(models.Post.created_at.desc(), models.Post.id.desc()).limit(PAGE_SIZE)
+            (await db.execute(query)).scalars().all()
+
+    async def mixed(number: int):
+        # Typical API traffic: 1 write per 4 reads
+        await (write(number) if number % 5 == 0 else read(number))
+
+    results = {
+        "writes/s": await run_tasks(WRITES, write),
+        "reads/s": await run_tasks(READS, read),
+        "mixed ops/s": await run_tasks(READS, mixed),
+    }
+
+    await engine.dispose()
+    return results
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        default_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'default.db')}"
+        production_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'production.db')}"
+
+        print("Running with driver defaults...")
+        default = await benchmark(create_async_engine(default_url))
+
+        print("Running with production profile...")
+        production = await benchmark(create_engine(production_url, profile="production"))
+
+    print(f"\n{'Workload':<14}{'Defaults':>12}{'Production':>14}{'Speedup':>10}")
+    for workload in default:
+        speedup = production[workload] / default[workload]
+        print(f"{workload:<14}{default[workload]:>12.0f}{production[workload]:>14.0f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    print(f"SQLite benchmark: {WRITES} writes, {READS} reads, concurrency {CONCURRENCY}")
+    asyncio.run(main())
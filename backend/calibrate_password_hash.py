@@ -0,0 +1,75 @@
+import argparse
+import statistics
+import time
+
+import bcrypt
+
+from config import settings
+
+"""
+Pick bcrypt cost (PASSWORD_HASH_ROUNDS) for this host.
+
+Every +1 of cost doubles hashing time. The command hashes a sample password
+with growing cost on this machine and reports the highest cost whose median
+time still fits the target latency of one sign up / login. Run it on the
+hardware the app is deployed on: the answer for a laptop is not the answer
+for a small VM.
+
+Changing PASSWORD_HASH_ROUNDS needs no password reset: old hashes keep their
+cost in the hash, verify as before and are rehashed with the new cost on the
+user's next successful login.
+
+Keep PASSWORD_HASH_WORKERS in mind: under load every thread hashes in
+parallel, so a worker process spends up to workers x target of CPU per second.
+
+Run: python calibrate_password_hash.py [--target-ms 250] [--samples 5]
+"""
+
+MIN_ROUNDS = 10    # Lower costs are too cheap to brute-force, never suggested
+MAX_ROUNDS = 16
+SAMPLE_PASSWORD = b"calibration-password"
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Median time of one hash with given cost, in milliseconds"""
+    salt = bcrypt.gensalt(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.hashpw(SAMPLE_PASSWORD, salt)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, samples: int) -> int:
+    """
+    Measure costs from MIN_ROUNDS up until hashing gets slower than the target.
+
+    :param target_ms: Acceptable time of one hash
+    :param samples: Hashes per cost
+    :return: Highest cost within the target (MIN_ROUNDS if even it is slower)
+    """
+    chosen = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        elapsed = measure(rounds=rounds, samples=samples)
+        fits = elapsed <= target_ms
+        print(f"   cost {rounds:>2}: {elapsed:9.1f} ms {'ok' if fits else 'over target'}")
+        if not fits:
+            break
+        chosen = rounds
+
+    return chosen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick bcrypt cost for target hashing latency on this host")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target time of one hash (default 250)")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes per cost (default 5)")
+    args = parser.parse_args()
+
+    print(f"Measuring bcrypt on this host, target {args.target_ms:.0f} ms per hash...")
+    rounds = calibrate(target_ms=args.target_ms, samples=max(args.samples, 1))
+
+    print(f"Current PASSWORD_HASH_ROUNDS={settings.PASSWORD_HASH_ROUNDS}")
+    print(f"Suggested: PASSWORD_HASH_ROUNDS={rounds}")
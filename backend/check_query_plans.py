@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import settings
+from database.database import Base
+from database import models
+
+"""
+Query plan checker for the index pack (migration a1f3c9d2e4b5).
+
+Runs EXPLAIN for the hot query shapes of the DAO layer and checks that
+the planner uses the expected index. SQLite is checked on a temporary
+database file, PostgreSQL - on DATABASE_URL_POSTGRE if it is set.
+Exit status is 1 if some query doesn't use its index, so CI fails on plan regressions.
+
+Run: python check_query_plans.py
+"""
+
+CURSOR_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+# (description, query, expected index)
+QUERY_SHAPES = [
+    ("Feed page after cursor (PostDao.get_all_posts)",
+     select(models.Post.id, models.Post.content, models.Post.created_at, models.Post.user_id,
+            models.User.name, models.User.email).join(models.Post.user).where(
+         and_(models.Post.created_at <= CURSOR_TIME,
+              or_(models.Post.created_at < CURSOR_TIME, models.Post.id < 100))
+     ).order_by(models.Post.created_at.desc(), models.Post.id.desc()).limit(21),
+     "ix_posts_created_at_id"),
+
+    ("Posts of one user (PostDao.get_posts_by_user_id)",
+     select(models.Post).where(models.Post.user_id == 1).order_by(models.Post.created_at.desc()),
+     "ix_posts_user_id_created_at"),
+
+    ("Active users directory (UserDAO.get_all_users)",
+     select(models.User).where(models.User.is_active == True).order_by(
+         models.User.created_at.desc(), models.User.id.desc()
+     ).limit(21),
+     "ix_users_active_created_at"),
+
+    ("Deleted users (UserDAO.get_deleted_users)",
+     select(models.User).where(models.User.is_active == False).order_by(models.User.deleted_at.desc()),
+     "ix_users_deleted_deleted_at"),
+]
+
+
+async def check_plans(database_url: str, explain_prefix: str, setup_sql: list[str]) -> bool:
+    """
+    Explain every query shape and compare plan with expected index.
+
+    :param database_url: Async database URL
+    :param explain_prefix: Dialect EXPLAIN keyword
+    :param setup_sql: Statements to run before EXPLAIN (planner settings)
+    :return: True if all queries use their indexes
+    """
+    engine = create_async_engine(database_url)
+    all_passed = True
+
+    async with engine.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)    # Creates indexes for new tables only
+        await conn.commit()
+
+        for statement in setup_sql:
+            await conn.exec_driver_sql(statement)
+
+        for description, query, index_name in QUERY_SHAPES:
+            compiled = query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            result = await conn.exec_driver_sql(f"{explain_prefix} {compiled}")
+            plan = "\n".join(str(row[-1]) for row in result.fetchall())
+
+            passed = index_name in plan
+            all_passed = all_passed and passed
+            print(f"[{'OK' if passed else 'FAIL'}] {description}: expected {index_name}")
+            if not passed:
+                print(f"       Plan: {plan}")
+
+    await engine.dispose()
+    return all_passed
+
+
+async def main() -> bool:
+    print("SQLite:")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'plans.db')}"
+        result = await check_plans(sqlite_url, "EXPLAIN QUERY PLAN", [])
+
+    if settings.DATABASE_URL_POSTGRE:
+        print("PostgreSQL:")
+        # Tables on test databases are tiny, so forbid seq scans to see which index planner picks
+        result = await check_plans(settings.DATABASE_URL_POSTGRE,
+                                   "EXPLAIN",
+                                   ["SET LOCAL enable_seqscan = off"]) and result
+    else:
+        print("PostgreSQL: skipped (DATABASE_URL_POSTGRE is not set)")
+
+    return result
+
+
+if __name__ == "__main__":
+    print("Checking query plans...")
+    if asyncio.run(main()):
+        print("All hot queries use their indexes")
+    else:
+        print("Some queries don't use indexes. Did you run 'alembic upgrade head'?")
+        sys.exit(1)    # Fails CI on plan regression
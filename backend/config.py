@@ -21,6 +21,20 @@ class Settings:
     DATABASE_URL: str = os.getenv('DB_LITE')     # Async URL for SQLite
     DATABASE_URL_FOR_ALEMBIC: str = os.getenv('DB_LITE_FOR_ALEMBIC')    # Sync URL for migrations
 
+    # Database backend #
+    DB_BACKEND: str = os.getenv('DB_BACKEND', 'sqlite')   # "sqlite" (DB_LITE) or "postgresql" (DATABASE_URL_POSTGRE)
+
+    # Engine profile #
+    # "development" - SQL echo, driver defaults; "production" - tuned pragmas/pool, no SQL echo
+    DB_PROFILE: str = os.getenv('DB_PROFILE', 'development')
+
+    # SQLite production profile #
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))    # Page cache per connection (64 MB)
+    SQLITE_MMAP_SIZE: int = int(os.getenv('SQLITE_MMAP_SIZE', '268435456'))    # Memory-mapped I/O in bytes (256 MB)
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))    # Wait for write lock instead of "database is locked"
+    SQLITE_POOL_SIZE: int = int(os.getenv('SQLITE_POOL_SIZE', '8'))    # Kept-open connections (one aiosqlite thread each)
+    SQLITE_MAX_OVERFLOW: int = int(os.getenv('SQLITE_MAX_OVERFLOW', '4'))    # Extra connections under bursts
+
     # PostgreSQL #
     DB_HOST: str = os.getenv('DB_HOST')
     DB_PORT: str = os.getenv('DB_PORT')
@@ -29,6 +43,45 @@ class Settings:
     DB_PASSWORD: str = os.getenv('DB_PASSWORD')
     DATABASE_URL_POSTGRE: str = os.getenv('DATABASE_URL_POSTGRE')   # Async URL for PostgreSQL
     DATABASE_URL_FOR_ALEMBIC_POSTGRE: str = os.getenv('DATABASE_URL_ALEMBIC_POSTGRE')   # Sync URL for migrations
+    PG_POOL_SIZE: int = int(os.getenv('PG_POOL_SIZE', '10'))    # Kept-open connections per worker process
+    PG_MAX_OVERFLOW: int = int(os.getenv('PG_MAX_OVERFLOW', '10'))    # Extra connections under bursts
+    PG_POOL_TIMEOUT: float = float(os.getenv('PG_POOL_TIMEOUT', '30'))    # Seconds to wait for free connection
+    PG_POOL_RECYCLE: int = int(os.getenv('PG_POOL_RECYCLE', '1800'))    # Reconnect after N seconds (-1 - never)
+    PG_STATEMENT_CACHE_SIZE: int = int(os.getenv('PG_STATEMENT_CACHE_SIZE', '100'))    # asyncpg prepared statements per connection (0 for PgBouncer transaction mode)
+    PG_STATEMENT_TIMEOUT_MS: int = int(os.getenv('PG_STATEMENT_TIMEOUT_MS', '30000'))    # Server cancels longer queries (0 - no limit)
+    PG_APPLICATION_NAME: str = os.getenv('PG_APPLICATION_NAME', 'fastapi_preset')    # Shown in pg_stat_activity
+
+    # Read replicas (optional) #
+    # Comma-separated async URLs. Empty - all queries go to the primary database
+    DATABASE_REPLICA_URLS: list[str] = [url.strip() for url in os.getenv('DB_REPLICA_URLS', '').split(',') if url.strip()]
+    REPLICA_HEALTH_CHECK_INTERVAL: float = float(os.getenv('DB_REPLICA_HEALTH_CHECK_INTERVAL', '10'))   # Seconds between replica checks
+    REPLICA_HEALTH_CHECK_TIMEOUT: float = float(os.getenv('DB_REPLICA_HEALTH_CHECK_TIMEOUT', '2'))   # Seconds to wait for "SELECT 1"
+    READ_YOUR_WRITES_WINDOW: float = float(os.getenv('DB_READ_YOUR_WRITES_WINDOW', '5'))   # Seconds to read from primary after a write (replica lag)
+
+    # Username autocomplete #
+    USERNAME_INDEX_REFRESH_INTERVAL: float = float(os.getenv('USERNAME_INDEX_REFRESH_INTERVAL', '300'))   # Seconds between index reloads from DB (0 - never), picks up changes made by other workers
+
+    # Home timelines #
+    TIMELINE_FANOUT_MAX_FOLLOWERS: int = int(os.getenv('TIMELINE_FANOUT_MAX_FOLLOWERS', '10000'))   # Authors with more followers are merged into timelines on read, not copied on write
+    TIMELINE_BACKFILL_POSTS: int = int(os.getenv('TIMELINE_BACKFILL_POSTS', '100'))   # Recent posts of followed author copied to follower's timeline on follow
+
+    # Authenticated user cache #
+    AUTH_USER_CACHE_TTL: float = float(os.getenv('AUTH_USER_CACHE_TTL', '30'))   # Seconds get_current_user() trusts cached user (0 - disabled); other workers see role changes/deletion after this time
+    AUTH_USER_CACHE_MAX_SIZE: int = int(os.getenv('AUTH_USER_CACHE_MAX_SIZE', '10000'))   # Users kept per worker, least recently used are evicted
+
+    # Response cache (public GET endpoints) #
+    RESPONSE_CACHE_BACKEND: str = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')   # "memory" (per worker), "redis" (shared) or "none"
+    RESPONSE_CACHE_TTL: float = float(os.getenv('RESPONSE_CACHE_TTL', '30'))   # Seconds entry is served; writes invalidate earlier (memory backend - only in the writing worker)
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '10000'))   # Memory backend: responses kept per worker, least recently used are evicted
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0')   # redis://[:password@]host:port/db
+    RESPONSE_CACHE_PREFIX: str = os.getenv('RESPONSE_CACHE_PREFIX', 'fastapi_preset:rc:')   # Namespace of keys in shared Redis
+    RESPONSE_CACHE_REDIS_POOL_SIZE: int = int(os.getenv('RESPONSE_CACHE_REDIS_POOL_SIZE', '10'))   # Connections per worker
+    RESPONSE_CACHE_REDIS_TIMEOUT: float = float(os.getenv('RESPONSE_CACHE_REDIS_TIMEOUT', '0.5'))   # Seconds per call; slow or down Redis is a miss, not an error
+
+    # Password hashing #
+    PASSWORD_HASH_WORKERS: int = int(os.getenv('PASSWORD_HASH_WORKERS', '0'))   # bcrypt threads per worker process (0 - min(CPU count, 4))
+    PASSWORD_HASH_ROUNDS: int = int(os.getenv('PASSWORD_HASH_ROUNDS', '12'))   # bcrypt cost (log2 rounds, 4-31), pick with calibrate_password_hash.py; older hashes are upgraded on login
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '32'))   # Hashes allowed to wait for a thread; more - sign up/login get 503 at once
 
     # JWT authentication settings
 
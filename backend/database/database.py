@@ -1,48 +1,347 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event, make_url, text
+from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
 from config import settings
+from database.pool_metrics import InstrumentedQueuePool
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 """
 Database management module.
 Supports both SQLite (for development) and PostgreSQL (for production).
+settings.DB_PROFILE="production" turns SQL echo off and tunes the engine
+(for SQLite - WAL and other pragmas on every connection, sized pool).
+
+Optional read replicas (settings.DATABASE_REPLICA_URLS) serve public GET
+routes through get_read_db(). Writes and authenticated routes always use
+the primary through get_db().
 """
 
-# SQLITE (uncomment to use SQLite)
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+# SQLite (development, small nodes) or PostgreSQL (recommended for production)
+if settings.DB_BACKEND == "postgresql":
+    SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL_POSTGRE
+else:
+    SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+
+def install_sqlite_pragmas(engine: AsyncEngine) -> None:
+    """
+    Tune every new SQLite connection for concurrent web traffic.
+
+    - WAL: readers don't block the writer and the writer doesn't block readers
+    - synchronous=NORMAL: no fsync on every commit (safe with WAL, may lose last commits on power loss)
+    - cache_size / mmap_size: keep hot pages in memory
+    - busy_timeout: wait for the write lock instead of failing with "database is locked"
+
+    :param engine: Async engine with SQLite URL
+    """
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")   # Negative value - size in KB
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+def create_engine(database_url: str, profile: Optional[str] = None) -> AsyncEngine:
+    """
+    Create async engine with common settings.
+    Used for the primary database and for every replica.
+
+    PostgreSQL always gets pool and per-connection settings (PG_* in Settings),
+    profile only switches SQL echo.
+
+    :param database_url: Async database URL
+    :param profile: "development" or "production" (default - settings.DB_PROFILE)
+    :return: Async engine
+    """
+    profile = profile or settings.DB_PROFILE
+    backend = make_url(database_url).get_backend_name()
+
+    if backend == "postgresql":
+        return create_async_engine(
+            database_url,
+            echo=profile != "production",  # SQL query logging (development only)
+            poolclass=InstrumentedQueuePool,    # Checkout wait metrics, see pool_metrics.py
+            pool_size=settings.PG_POOL_SIZE,
+            max_overflow=settings.PG_MAX_OVERFLOW,
+            pool_timeout=settings.PG_POOL_TIMEOUT,
+            pool_recycle=settings.PG_POOL_RECYCLE,
+            pool_pre_ping=True,  # Check connection before use
+            connect_args={
+                "prepared_statement_cache_size": settings.PG_STATEMENT_CACHE_SIZE,
+                # Applied by server to every new connection
+                "server_settings": {
+                    "statement_timeout": str(settings.PG_STATEMENT_TIMEOUT_MS),
+                    "application_name": f"{settings.PG_APPLICATION_NAME}:{os.getpid()}",   # PID - to find worker in pg_stat_activity
+                },
+            },
+        )
+
+    if profile == "production" and backend == "sqlite":
+        engine = create_async_engine(
+            database_url,
+            echo=False,  # No SQL logging in production
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.SQLITE_POOL_SIZE,
+            max_overflow=settings.SQLITE_MAX_OVERFLOW,
+            pool_pre_ping=False,     # Local file can't drop connection, skip extra query per checkout
+        )
+        install_sqlite_pragmas(engine)
+        return engine
+
+    return create_async_engine(
+        database_url,
+        echo=profile != "production",  # SQL query logging (development only)
+        future=True,     # Use new SQLAlchemy 2.0 features
+        pool_pre_ping=True,  # Check connection before use
+        pool_recycle=300,    # Reconnect every 300 seconds
+    )
+
+
+def create_sessionmaker(bind: AsyncEngine) -> async_sessionmaker:
+    """Create async session factory bound to engine"""
+    return async_sessionmaker(autocommit=False,  # Autocommit disabled for explicit transaction management
+                              autoflush=False,  # Autoflush disabled
+                              bind=bind)  # Bind to created engine
 
-# PostgreSQL (recommended for production)
-# SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL_POSTGRE
 
 # Create async database engine
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL,
-    echo=True,  # SQL query logging (disable in production)
-    future=True,     # Use new SQLAlchemy 2.0 features
-    pool_pre_ping=True,  # Check connection before use  
-    pool_recycle=300,    # Reconnect every 300 seconds
-)
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 # Create async session factory
-SessionLocal = async_sessionmaker(autocommit=False,  # Autocommit disabled for explicit transaction management
-                                  autoflush=False,  # Autoflush disabled
-                                  bind=engine)  # Bind to created engine
+SessionLocal = create_sessionmaker(engine)
 
 # Base class for all SQLAlchemy models
 Base = declarative_base()
 
-async def get_db():
+
+class Replica:
+    """
+    One read replica: engine, session factory and cached health state.
+    Health is checked with "SELECT 1" not more often than once per interval.
+    """
+
+    def __init__(self, database_url: str):
+        self.engine = create_engine(database_url)
+        self.session_factory = create_sessionmaker(self.engine)
+        self.healthy = True
+        self.checked_at = 0.0   # time.monotonic() of last check, 0 - never checked
+
+    async def is_healthy(self) -> bool:
+        """
+        Return cached health state or check replica again if it is outdated.
+
+        :return: True if replica answers queries
+        """
+        if time.monotonic() - self.checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+            return self.healthy
+
+        try:
+            async with self.engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")),
+                                       timeout=settings.REPLICA_HEALTH_CHECK_TIMEOUT)
+            if not self.healthy:
+                logger.info("Replica %s is back online", self.engine.url.render_as_string())
+            self.healthy = True
+
+        except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+            if self.healthy:
+                logger.warning("Replica %s is unavailable: %s", self.engine.url.render_as_string(), e)
+            self.healthy = False
+
+        self.checked_at = time.monotonic()
+        return self.healthy
+
+    def mark_unhealthy(self) -> None:
+        """Query failed on replica - check it again before next use"""
+        self.healthy = False
+        self.checked_at = 0.0
+
+
+class ReplicaRouter:
+    """
+    Round-robin over healthy replicas.
+    Returns None when there are no replicas or all of them are down,
+    so caller falls back to the primary.
+    """
+
+    def __init__(self, database_urls: List[str]):
+        self.replicas = [Replica(url) for url in database_urls]
+        self._position = 0
+
+    async def choose(self) -> Optional[Replica]:
+        """
+        Pick next healthy replica.
+
+        :return: Replica or None (use primary)
+        """
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._position % len(self.replicas)]
+            self._position += 1
+
+            if await replica.is_healthy():
+                return replica
+
+        return None
+
+    async def dispose(self) -> None:
+        """Close connection pools of all replicas"""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+# READ-YOUR-WRITES #
+# Replicas lag behind the primary, so caller who just wrote something
+# reads from the primary for READ_YOUR_WRITES_WINDOW seconds.
+# Browser clients are tracked with the signed session cookie (works across workers),
+# API clients - by their Authorization header (in this process).
+
+LAST_WRITE_SESSION_KEY = "last_write_at"
+READ_FROM_REPLICA_KEY = "read_from_replica"     # AsyncSession.info flags set by read_session() / get_read_db()
+RECENT_WRITE_KEY = "recent_write"
+_last_writes: Dict[str, float] = {}     # Authorization header -> time.time() of last commit
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_commit(session: Session) -> None:
+    """Mark session as written, get_db() uses this flag after the request"""
+    session.info["has_writes"] = True
+
+
+def mark_write(request: Request) -> None:
+    """
+    Remember that caller has just committed changes.
+
+    :param request: Current request
+    """
+    now = time.time()
+
+    if "session" in request.scope:
+        request.session[LAST_WRITE_SESSION_KEY] = now
+
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        _last_writes[authorization] = now
+
+        # Drop expired marks, so dict doesn't grow forever
+        if len(_last_writes) > 10000:
+            expired = now - settings.READ_YOUR_WRITES_WINDOW
+            for key in [key for key, written_at in _last_writes.items() if written_at < expired]:
+                del _last_writes[key]
+
+
+def has_recent_write(request: Request) -> bool:
+    """
+    Check if caller wrote something during READ_YOUR_WRITES_WINDOW.
+
+    :param request: Current request
+    :return: True if read must go to the primary
+    """
+    written_at = 0.0
+
+    if "session" in request.scope:
+        written_at = request.session.get(LAST_WRITE_SESSION_KEY, 0.0)
+
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        written_at = max(written_at, _last_writes.get(authorization, 0.0))
+
+    return time.time() - written_at < settings.READ_YOUR_WRITES_WINDOW
+
+
+async def get_db(request: Request):
     """
     Dependency for getting database session.
     Used in Depends() to inject session into routes.
-    
+
     Ensures proper session closure after request completion.
+    If something was committed, caller reads from the primary for a while (read-your-writes).
     """
     async with SessionLocal() as db:
         try:
             yield db    # Provide session for use
         finally:
+            if db.info.get("has_writes"):
+                mark_write(request)
             await db.close()    # Always close session
+
+
+@asynccontextmanager
+async def read_session(prefer_primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Open read-only session on a healthy replica (round-robin),
+    or on the primary if there are no replicas or all of them are down.
+
+    Don't commit with this session - replicas are read-only.
+
+    :param prefer_primary: Skip replicas (caller needs to see own writes)
+    :return: Async session
+    """
+    replica = None
+    if replica_router.replicas and not prefer_primary:
+        replica = await replica_router.choose()
+
+    if replica is None:
+        async with SessionLocal() as db:
+            try:
+                yield db
+            finally:
+                await db.close()
+        return
+
+    async with replica.session_factory() as db:
+        db.info[READ_FROM_REPLICA_KEY] = True
+        try:
+            yield db
+        except OperationalError:
+            replica.mark_unhealthy()    # Next requests go to other replicas or primary
+            raise
+        finally:
+            await db.close()
+
+
+async def get_read_db(request: Request):
+    """
+    Dependency for read-only routes (public GET endpoints).
+    Gives session from read_session(), but uses the primary if
+    caller has just written something (read-your-writes).
+    """
+    recent_write = has_recent_write(request)
+    async with read_session(prefer_primary=recent_write) as db:
+        db.info[RECENT_WRITE_KEY] = recent_write
+        yield db
+
+
+def session_reads_replica(db: AsyncSession) -> bool:
+    """Session is opened on a replica - its rows may lag behind the primary"""
+    return db.info.get(READ_FROM_REPLICA_KEY, False)
+
+
+def session_after_write(db: AsyncSession) -> bool:
+    """Session belongs to caller who has just written (read-your-writes): shared caches must be skipped"""
+    return db.info.get(RECENT_WRITE_KEY, False)
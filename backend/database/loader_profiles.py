@@ -0,0 +1,83 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, noload, selectinload, undefer
+
+from database import models
+
+"""
+Relationship and column loading profiles for DAO queries.
+
+Relationships in models.py don't load anything by themselves (lazy="raise_on_sql")
+and heavy columns (password, bio) are deferred. Each DAO method passes one of
+these profiles to say exactly what its endpoint needs, so a query never pulls
+more rows or columns than the response uses.
+
+Usage Example:
+---------------
+- query = select(models.User).options(*loader_profiles.USER_PROFILE)
+- user = await GeneralDAO.get_record_by_id(record_id=1, model=models.User, db=db,
+                                           options=loader_profiles.USER_AUTH)
+"""
+
+# USERS #
+USER_AUTH = (
+    noload(models.User.posts),
+)
+"""Identity and flags only (id, name, email, is_admin, is_active...). For existence and permission checks"""
+
+USER_LOGIN = (
+    undefer(models.User.password),
+    undefer(models.User.bio),
+    noload(models.User.posts),
+)
+"""Everything for sign in: password hash to verify and profile fields for the response"""
+
+USER_PROFILE = (
+    undefer(models.User.bio),
+    noload(models.User.posts),
+)
+"""Fields of UserResponse, without posts"""
+
+USER_WITH_POSTS = (
+    undefer(models.User.bio),
+    selectinload(models.User.posts).noload(models.Post.user),
+)
+"""UserWithPostsResponse: profile fields and posts (one extra IN query, author is not loaded again)"""
+
+USER_PROFILE_FIELDS = [attr.key for attr in inspect(models.User).column_attrs if attr.key != "password"]
+"""Column names for db.refresh(user, USER_PROFILE_FIELDS). Plain refresh() doesn't load deferred columns"""
+
+USER_PROFILE_COLUMNS = tuple(getattr(models.User, key) for key in USER_PROFILE_FIELDS)
+"""Columns for INSERT/UPDATE ... RETURNING that builds UserResponse from the returned row"""
+
+
+# POSTS #
+POST_ONLY = (
+    noload(models.Post.user),
+)
+"""Post columns only. For ownership checks, updates and deletes"""
+
+POST_COLUMNS = (
+    models.Post.id,
+    models.Post.content,
+    models.Post.created_at,
+    models.Post.user_id,
+)
+"""Columns of PostResponse. For INSERT/UPDATE ... RETURNING"""
+
+POST_WITH_AUTHOR = (
+    joinedload(models.Post.user).noload(models.User.posts),
+)
+"""PostWithUserResponse: post and its author in one JOIN, author's posts are not loaded"""
+
+POST_WITH_AUTHOR_COLUMNS = (
+    models.Post.id,
+    models.Post.content,
+    models.Post.created_at,
+    models.Post.user_id,
+    models.User.name.label("user_name"),
+    models.User.email.label("user_email"),
+)
+"""
+Column projection for PostWithUserResponse (feed): select(*POST_WITH_AUTHOR_COLUMNS).join(models.Post.user).
+Returns plain rows - no ORM objects, identity map entries or secondary loads
+"""
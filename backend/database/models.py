@@ -1,12 +1,20 @@
 from typing import List
 from datetime import datetime
-from sqlalchemy import String, ForeignKey, Column, Integer, Boolean, DateTime
+from sqlalchemy import DDL, String, ForeignKey, Column, Integer, Boolean, DateTime, Index, PrimaryKeyConstraint, event
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, expression, text
 
 from database.database import Base
 
 
+# SQLite keeps datetimes as text. Bind them in the same format as CURRENT_TIMESTAMP
+# (server default) so comparisons in cursor pagination match stored values
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
 class User(Base):
     """
     System user model.
@@ -16,42 +24,61 @@ class User(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String, nullable=False, unique=True)  # Unique username
     email: Mapped[str] = mapped_column(String, unique=True, nullable=False) # Unique email
-    password: Mapped[str] = mapped_column(String)    # Hashed password
+    password: Mapped[str] = mapped_column(String,    # Hashed password
+                                          deferred=True)  # Loaded only for sign in (see loader_profiles.USER_LOGIN)
     
     bio: Mapped[str] = mapped_column(String,        # User's biography 
                                      nullable=False,
-                                     server_default="User didn't add his bio")
+                                     server_default="User didn't add his bio",
+                                     deferred=True)  # Loaded only when response needs it (see loader_profiles)
     
     location: Mapped[str] = mapped_column(String,   # User's location. Like Miami/Hamburg
                                           nullable=True,
                                           server_default="")
     
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),   # Creation timestamp
+    created_at: Mapped[datetime] = mapped_column(Timestamp,   # Creation timestamp
                                                  nullable=False,
                                                  server_default=func.now())
     
     is_admin: Mapped[bool] = mapped_column(Boolean, # Is User admin? True/False
                                            nullable=False,
-                                           server_default="false")
+                                           server_default=expression.false())  # 0 on SQLite, false on PostgreSQL
     
     is_active: Mapped[bool] = mapped_column(Boolean,    # Active/Deleted flag
                                             nullable=False,
-                                            server_default="true")
+                                            server_default=expression.true())  # 1 on SQLite, true on PostgreSQL
     deleted_by_admin: Mapped[bool] = mapped_column(Boolean,    # Who deleted account? 
                                                    nullable=False,
-                                                   server_default="false")
+                                                   server_default=expression.false())
     deletion_reason: Mapped[str] = mapped_column(String,    # Who deleted account? 
                                                  nullable=True,
                                                  server_default=None)
     deleted_at: Mapped[str] = mapped_column(DateTime(timezone=True),    # When deleted
                                             nullable=True,
                                             default=None)
+    post_count: Mapped[int] = mapped_column(Integer,    # Number of user's posts (denormalized counter)
+                                            nullable=False,
+                                            server_default="0")  # Kept by PostDao/UserDAO, repaired by reconcile_post_counts.py
+    follower_count: Mapped[int] = mapped_column(Integer,    # Number of followers (denormalized counter)
+                                                nullable=False,
+                                                server_default="0")  # Kept by FollowDAO, also picks fan-out strategy of timelines
+    following_count: Mapped[int] = mapped_column(Integer,   # Number of followed users (denormalized counter)
+                                                 nullable=False,
+                                                 server_default="0")  # Kept by FollowDAO
+    version: Mapped[int] = mapped_column(Integer,   # Representation version for ETags
+                                         nullable=False,
+                                         server_default="1",
+                                         onupdate=text("version + 1"))  # Every UPDATE of the row bumps it (ORM and Core)
+    updated_at: Mapped[datetime] = mapped_column(Timestamp,   # Last change of the row
+                                                 nullable=True,
+                                                 onupdate=func.now())
     
     # One-to-many relationship with Post model
+    # Not loaded by default, DAO methods choose what to load via database/loader_profiles.py
     posts: Mapped[List["Post"]] = relationship(
         "Post",
         back_populates="user",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
 
 
@@ -64,13 +91,121 @@ class Post(Base):
     content: Mapped[str] = mapped_column(String,
                                          nullable=False,
                                          server_default="")
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+    created_at: Mapped[datetime] = mapped_column(Timestamp,
                                                  nullable=False,
                                                  server_default=func.now())
     user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    version: Mapped[int] = mapped_column(Integer,   # Representation version for ETags
+                                         nullable=False,
+                                         server_default="1",
+                                         onupdate=text("version + 1"))
+    updated_at: Mapped[datetime] = mapped_column(Timestamp,
+                                                 nullable=True,
+                                                 onupdate=func.now())
 
+    # Not loaded by default, DAO methods choose what to load via database/loader_profiles.py
     user: Mapped["User"] = relationship(
         "User",
         back_populates="posts",
-        lazy="selectin"
-    )
\ No newline at end of file
+        lazy="raise_on_sql"
+    )
+
+
+class Follow(Base):
+    """
+    Follow graph edge: follower_id follows followee_id.
+    """
+    __tablename__ = 'follows'
+    follower_id: Mapped[int] = mapped_column(ForeignKey('users.id'), primary_key=True)
+    followee_id: Mapped[int] = mapped_column(ForeignKey('users.id'), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(Timestamp,
+                                                 nullable=False,
+                                                 server_default=func.now())
+
+
+class TimelineEntry(Base):
+    """
+    Materialized home timeline: one row per (reader, post).
+    Written by fan-out when a followed author posts (see TimelineDAO),
+    created_at is a copy of post's created_at, so a page is one index range read.
+    """
+    __tablename__ = 'timeline_entries'
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))    # Owner of the timeline
+    post_id: Mapped[int] = mapped_column(ForeignKey('posts.id'))
+    author_id: Mapped[int] = mapped_column(ForeignKey('users.id'))  # Post author, for unfollow and account deletion
+    created_at: Mapped[datetime] = mapped_column(Timestamp, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "post_id"),
+    )
+
+
+# Indexes for hot query shapes
+# Keep in sync with migrations/versions/a1f3c9d2e4b5_hot_query_indexes.py (existing databases get them from there)
+# and e2c6a9f4b7d3_follows_and_timelines.py (follows / timeline_entries)
+
+# Posts of one user, newest first (PostDao.get_posts_by_user_id, profile pages)
+Index("ix_posts_user_id_created_at", Post.user_id, Post.created_at.desc())
+
+# Global feed keyset pagination by (created_at, id)
+Index("ix_posts_created_at_id", Post.created_at.desc(), Post.id.desc())
+
+# Followers of a user, newest first; also fan-out of a new post to followers (TimelineDAO.fan_out_posts)
+Index("ix_follows_followee_created_at", Follow.followee_id, Follow.created_at.desc(), Follow.follower_id)
+
+# Home timeline page: range of one reader's entries by (created_at, post_id)
+Index("ix_timeline_entries_user_created_at",
+      TimelineEntry.user_id, TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc())
+
+# Entries of one author: unfollow (author_id, user_id) and account deletion (author_id)
+Index("ix_timeline_entries_author_user", TimelineEntry.author_id, TimelineEntry.user_id)
+
+# Entries of one post, removed together with the post
+Index("ix_timeline_entries_post_id", TimelineEntry.post_id)
+
+# Directory of active users, keyset pagination by (created_at, id)
+Index("ix_users_active_created_at",
+      User.created_at.desc(), User.id.desc(),
+      sqlite_where=User.is_active == True,
+      postgresql_where=User.is_active == True)
+
+# Deleted users list for admins, ordered by deletion time
+Index("ix_users_deleted_deleted_at",
+      User.deleted_at.desc(),
+      sqlite_where=User.is_active == False,
+      postgresql_where=User.is_active == False)
+
+
+# Full-text search over post content (PostDao.search_posts)
+# Keep in sync with migrations/versions/d8b3f5a1c2e9_posts_full_text_search.py
+# The search index is maintained by the database itself (triggers / expression index),
+# so every write path - create, update, delete, bulk insert, import COPY, account deletion - keeps it in sync.
+
+SEARCH_CONFIG = "simple"    # PostgreSQL text search configuration (no stemming, any language)
+
+SQLITE_SEARCH_DDL = [
+    # External content FTS5 table: stores only the index, text is read from posts
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "content, content='posts', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, content) VALUES (new.id, new.content); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF content ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO posts_fts(rowid, content) VALUES (new.id, new.content); END",
+]
+
+POSTGRESQL_SEARCH_DDL = [
+    # Expression GIN index, PostDao.search_posts uses exactly the same expression
+    f"CREATE INDEX IF NOT EXISTS ix_posts_content_fts ON posts USING gin (to_tsvector('{SEARCH_CONFIG}', content))",
+]
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+for statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+"""
+Connection pool telemetry.
+
+InstrumentedQueuePool measures how long every checkout waits for a free
+connection. Together with pool utilisation (checked out / capacity) it shows
+if workers are starved by the pool (long waits, utilisation near 100%) or
+the pool is oversized (no waits, low peak utilisation).
+
+Usage Example:
+---------------
+- create_async_engine(url, poolclass=InstrumentedQueuePool, pool_size=10)
+- stats = pool_stats(engine.pool)
+"""
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time and peak usage"""
+
+    METRIC_FIELDS = ("checkouts", "checkout_timeouts", "checkout_errors", "wait_total", "wait_max", "peak_checked_out")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0    # No free connection within pool_timeout
+        self.checkout_errors = 0      # New connection failed (database down, auth error)
+        self.wait_total = 0.0   # Seconds
+        self.wait_max = 0.0     # Seconds
+        self.peak_checked_out = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self.checkout_timeouts += 1
+            raise
+        except Exception:
+            with self._metrics_lock:
+                self.checkout_errors += 1
+            raise
+
+        waited = time.perf_counter() - started
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+
+        return connection
+
+    def recreate(self):
+        # Pool is recreated after invalidation - keep counters of the same engine
+        new_pool = super().recreate()
+        for field in self.METRIC_FIELDS:
+            setattr(new_pool, field, getattr(self, field))
+        return new_pool
+
+
+def pool_stats(pool) -> dict:
+    """
+    Snapshot of pool state and checkout metrics.
+
+    :param pool: engine.pool (sync pool of AsyncEngine)
+    :return: Dictionary for PoolStatsResponse
+    """
+    size = pool.size() if hasattr(pool, "size") else 0
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    capacity = size + max(max_overflow, 0)
+    checkouts = getattr(pool, "checkouts", 0)
+
+    return {
+        "pool_class": type(pool).__name__,
+        "pool_size": size,
+        "max_overflow": max_overflow,
+        "checked_out": checked_out,
+        "peak_checked_out": getattr(pool, "peak_checked_out", checked_out),
+        "utilisation": round(checked_out / capacity, 3) if capacity > 0 else 0.0,
+        "checkouts": checkouts,
+        "checkout_timeouts": getattr(pool, "checkout_timeouts", 0),
+        "checkout_errors": getattr(pool, "checkout_errors", 0),
+        "wait_avg_ms": round(getattr(pool, "wait_total", 0.0) / checkouts * 1000, 3) if checkouts else 0.0,
+        "wait_max_ms": round(getattr(pool, "wait_max", 0.0) * 1000, 3),
+    }
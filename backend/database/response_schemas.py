@@ -85,10 +85,15 @@ class ListResponse(BaseResponse, Generic[T]):
                 "user_name": "John Doe",
                 "user_email": "john@example.com"
             }
-        ]
+        ],
+        "next_cursor": "WyIyMDI1LTAxLTAxVDEyOjAwOjAwIiwgMV0="
     }
+
+    next_cursor is filled only by cursor paginated endpoints.
+    Pass it back as "cursor" query param to get the next page.
     """
     data: List[T] = []
+    next_cursor: Optional[str] = None
 
 
 # Basic enity schemas (without relationships)
@@ -101,6 +106,8 @@ class UserResponse(BaseModel):
     - id: Unique user identifier
     - name: User's display name
     - email: User's email address
+    - post_count: Number of user's posts (stored counter, posts are not loaded)
+    - follower_count / following_count: Stored follow counters
     
     Use when you need user data without nested item information.
     """
@@ -115,9 +122,42 @@ class UserResponse(BaseModel):
     deleted_by_admin: Optional[bool] = None 
     deletion_reason: Optional[str] = None
     deleted_at: Optional[datetime] = None
+    post_count: int = 0
+    follower_count: int = 0
+    following_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+class AuthUserResponse(BaseModel):
+    """
+    Authenticated user as seen by protected routes (get_current_user dependency).
+    Only identity and permission fields, so it can be cached between requests.
+    Immutable - the same instance is shared by concurrent requests.
+    """
+    id: int
+    name: str
+    is_active: bool
+    is_admin: bool
 
     class Config:
         from_attributes = True
+        frozen = True
+
+class UserSuggestionResponse(BaseModel):
+    """
+    Username suggestion for autocomplete (only what a mention picker needs).
+    """
+    id: int
+    name: str
+
+class FollowUserResponse(BaseModel):
+    """
+    User in followers / following list with time of the follow.
+    """
+    id: int
+    name: str
+    followed_at: datetime
 
 class CurrentUserResponse(UserResponse):
     """
@@ -136,6 +176,118 @@ class UserDeleteResponse(BaseResponse):
     user_id: Optional[int] = None
     deletion_reason: Optional[str] = None
 
+class BulkUserResult(BaseModel):
+    """
+    Result of bulk admin operation for one user.
+
+    Fields:
+    - user_id: ID of user from request
+    - success: Was operation applied to this user
+    - detail: What happened (or why user was skipped)
+    - deleted_posts: Number of removed posts (only for bulk deletion)
+    """
+    user_id: int
+    success: bool
+    detail: str
+    deleted_posts: Optional[int] = None
+
+class ImportLineError(BaseModel):
+    """Rejected line of NDJSON import"""
+    line: int
+    detail: str
+
+class ImportReport(BaseModel):
+    """
+    Result of NDJSON import.
+
+    Fields:
+    - total_lines: Non-empty lines read
+    - imported / failed: Number of inserted and rejected lines
+    - errors: Rejected lines with reason (first MAX_IMPORT_ERRORS)
+    - errors_truncated: True if some errors are not listed
+    """
+    total_lines: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportLineError] = []
+    errors_truncated: bool = False
+
+class PoolStatsResponse(BaseModel):
+    """
+    Connection pool state of one database engine.
+
+    Fields:
+    - database: "primary" or replica URL (without password)
+    - checked_out / peak_checked_out: Connections in use now / at most
+    - utilisation: checked_out / (pool_size + max_overflow)
+    - checkouts, checkout_timeouts: Counters since start of worker
+    - checkout_errors: Checkouts failed by connect errors (database down, wrong credentials), not by pool size
+    - wait_avg_ms / wait_max_ms: Time requests waited for a free connection
+    """
+    database: str
+    pool_class: str
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    peak_checked_out: int
+    utilisation: float
+    checkouts: int
+    checkout_timeouts: int
+    checkout_errors: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+class PasswordHashStatsResponse(BaseModel):
+    """
+    State of the password hashing pool of the worker that handled the request.
+
+    Fields:
+    - workers / max_queue: Hashing threads / hashes allowed to wait for them
+    - in_flight / queued: Hashes running / waiting now
+    - waiting: Background calls (import) waiting for a free queue slot
+    - peak_pending: Max of in_flight + queued since start of worker
+    - utilisation: (in_flight + queued) / (workers + max_queue), at 1.0 new calls get 503
+    - submitted, completed, rejected: Counters since start of worker (rejected - answered 503)
+    - wait_avg_ms / wait_max_ms: Time hashes waited in queue
+    - hash_avg_ms: Time one bcrypt call takes
+    """
+    workers: int
+    max_queue: int
+    in_flight: int
+    queued: int
+    waiting: int
+    peak_pending: int
+    utilisation: float
+    submitted: int
+    completed: int
+    rejected: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    hash_avg_ms: float
+
+class CacheStatsResponse(BaseModel):
+    """
+    State of one in-process cache of the worker that handled the request.
+
+    Fields:
+    - size / max_size: Entries now / LRU limit (null if backend doesn't know, e.g. Redis)
+    - ttl: Seconds entry stays valid
+    - hits, misses, hit_ratio: Lookups since start of worker
+    - evictions: Entries dropped by LRU limit
+    - invalidations: Entries dropped by writes
+    - errors: Failed backend calls (treated as misses)
+    """
+    cache: str
+    size: Optional[int] = None
+    max_size: Optional[int] = None
+    ttl: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+    errors: int = 0
+
 class PostResponse(BaseModel):
     """
     Basic post schema without relationships.
@@ -183,6 +335,12 @@ class UserWithPostsResponse(UserResponse):
 UserListResponse = ListResponse[UserResponse]  
 """Response type for get all users endpoints"""
 
+UserAutocompleteResponse = ListResponse[UserSuggestionResponse]
+"""Response type for username autocomplete endpoint"""
+
+FollowListResponse = ListResponse[FollowUserResponse]
+"""Response type for followers / following lists"""
+
 UserCreateResponse = DataResponse[UserResponse]
 """Response type for user creation endpoints"""
 
@@ -195,10 +353,28 @@ UserLoginResponse = DataResponse[CurrentUserResponse]
 UserWithPostsDataResponse = DataResponse[UserWithPostsResponse]
 """Response type for user retrieval with posts"""
 
+BulkUserOperationResponse = ListResponse[BulkUserResult]
+"""Response type for bulk admin operations (per-user results)"""
+
+ImportResponse = DataResponse[ImportReport]
+"""Response type for bulk NDJSON import endpoints"""
+
+PoolStatsListResponse = ListResponse[PoolStatsResponse]
+"""Response type for database pool telemetry"""
+
+CacheStatsListResponse = ListResponse[CacheStatsResponse]
+"""Response type for in-process cache telemetry"""
+
+PasswordHashStatsDataResponse = DataResponse[PasswordHashStatsResponse]
+"""Response type for password hashing pool telemetry"""
+
 # Posts
 PostCreateResponse = DataResponse[PostResponse]
 """Response type for post creation endpoints"""
 
+PostBulkCreateResponse = ListResponse[PostResponse]
+"""Response type for bulk post creation endpoints"""
+
 PostUpdateResponse = DataResponse[PostResponse]
 """Response type for post update endpoints"""
 
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
-from typing import Union, Optional
+from datetime import datetime
+from typing import Union, Optional, List
 
 """
 Pydantic schemas for data validation and serialization.
@@ -48,6 +49,51 @@ class UserAdminDelete(BaseModel):
         title="Причина удаления"
     )
 
+MAX_BULK_USERS = 500  # Max users in one bulk admin request
+
+class AdminBulkUserIds(BaseModel):
+    """Schema for bulk admin operations on many users"""
+    user_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_USERS, title="IDs of users")
+
+class AdminBulkUserDelete(AdminBulkUserIds):
+    """Schema for bulk admin user deletion with reason"""
+    reason: str = Field(..., min_length=5, max_length=500, title="Причина удаления")
+
+
+# IMPORT SCHEMAS (one NDJSON line each) #
+IMPORT_BATCH_SIZE = 5000  # Lines validated and inserted together
+BCRYPT_HASH_PATTERN = r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$"
+
+class UserImport(BaseModel):
+    """Schema for one imported user. Give plain "password" or bcrypt "password_hash" (legacy systems)"""
+    name: str = Field(..., min_length=3, title="User name")
+    email: str = Field(..., title="User's email")
+    password: Optional[str] = Field(default=None, min_length=4, title="Plain password (hashed on import)")
+    password_hash: Optional[str] = Field(default=None, pattern=BCRYPT_HASH_PATTERN, title="bcrypt hash")
+    bio: Optional[str] = Field(default=None, min_length=10, title="User's biography")
+    location: Optional[str] = Field(default=None, title="User location")
+    is_admin: bool = Field(default=False, title="Is user admin?")
+    created_at: Optional[datetime] = Field(default=None, title="Original creation time")
+
+    @model_validator(mode="after")
+    def check_password(self):
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Give exactly one of 'password' or 'password_hash'")
+        return self
+
+class PostImport(BaseModel):
+    """Schema for one imported post. Author is found by "user_id" or "user_email" """
+    content: str = Field(..., min_length=1, title="Post content")
+    user_id: Optional[int] = Field(default=None, title="Author ID")
+    user_email: Optional[str] = Field(default=None, title="Author email")
+    created_at: Optional[datetime] = Field(default=None, title="Original creation time")
+
+    @model_validator(mode="after")
+    def check_author(self):
+        if self.user_id is None and self.user_email is None:
+            raise ValueError("Give 'user_id' or 'user_email' of the author")
+        return self
+
 
 # Post schemas
 class PostCreate(BaseModel):
@@ -55,6 +101,13 @@ class PostCreate(BaseModel):
     content: Optional[str] = Field(default=None, min_length=1, title="Post content")
 
 
+MAX_BULK_POSTS = 1000  # Max posts in one bulk create request
+
+class PostBulkCreate(BaseModel):
+    """Schema for bulk post creation (import and migration clients)"""
+    posts: List[PostCreate] = Field(..., min_length=1, max_length=MAX_BULK_POSTS, title="Posts to create")
+
+
 class PostUpdate(BaseModel):
     """Schema for post update"""
     content: Optional[str] = None
\ No newline at end of file
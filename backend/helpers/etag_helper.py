@@ -0,0 +1,97 @@
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from starlette import status
+from starlette.responses import Response
+
+
+"""
+ETag and conditional GET utilities.
+
+ETag is built from the version columns of rows the response is made of
+(User.version / Post.version are bumped by every UPDATE). So if client sends
+If-None-Match with the current ETag, endpoint can answer 304 after a
+version-only query, without loading and serializing the full payload.
+
+Usage Example:
+---------------
+- etag = make_etag("post", post.id, post.version, post.user.version)
+- if etag_matches(if_none_match, etag): return not_modified(etag)
+- set_etag(response, etag)
+- expected_version = version_from_if_match(if_match, "post", post_id)   # For PATCH
+"""
+
+CACHE_CONTROL = "no-cache"  # Client may store the response, but must revalidate it with If-None-Match
+
+
+def make_etag(kind: str, record_id: int, *versions: Any) -> str:
+    """
+    Build strong ETag (quoted string) for a record.
+
+    :param kind: Resource type ("post", "user")
+    :param record_id: ID of the record
+    :param versions: Version numbers of all rows the response depends on
+    :return: ETag header value, e.g. "post-5-v3.1"
+    """
+    return f'"{kind}-{record_id}-v{".".join(str(version) for version in versions)}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check If-None-Match request header against current ETag.
+    Uses weak comparison, like RFC 9110 requires for If-None-Match.
+
+    :param if_none_match: Header value (may list several ETags or "*")
+    :param etag: Current ETag of the resource
+    :return: True if client already has the current representation
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Add ETag and Cache-Control headers to the response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response with the same validators as 200 would have"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def version_from_if_match(if_match: Optional[str], kind: str, record_id: int) -> Optional[int]:
+    """
+    Get version of the record from If-Match request header (ETag from make_etag()).
+    First version in ETag is version of the record itself.
+
+    :param if_match: Header value, None or "*" - client doesn't require a version
+    :param kind: Resource type ("post", "user")
+    :param record_id: ID of updated record
+    :return: Expected version or None
+    :raises HTTPException: 412 if ETag doesn't belong to this record
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+
+    prefix = f'"{kind}-{record_id}-v'
+    etag = if_match.strip()
+    if etag.startswith(prefix) and etag.endswith('"'):
+        version = etag[len(prefix):-1].split(".")[0]
+        if version.isdigit():
+            return int(version)
+
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="If-Match doesn't match this record")
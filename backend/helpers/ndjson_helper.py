@@ -0,0 +1,71 @@
+import zlib
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import HTTPException
+from starlette import status
+
+
+"""
+NDJSON (newline delimited JSON) stream utilities.
+Request body is read chunk by chunk, so memory depends on batch size,
+not on the size of uploaded file.
+"""
+
+MAX_LINE_BYTES = 1024 * 1024  # One line bigger than 1 MB is a broken upload, not a record
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes],
+                            compressed: bool = False) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split stream of body chunks into NDJSON lines.
+
+    :param chunks: Request body chunks (request.stream())
+    :param compressed: Body is gzip compressed
+    :return: Async iterator over (line number, line) pairs, empty lines are skipped
+    :raises HTTPException: 400 if gzip data is broken or line is too long
+    """
+    decompressor = zlib.decompressobj(wbits=31) if compressed else None     # wbits=31 - gzip container
+    buffer = b""
+    line_number = 0
+
+    async for chunk in chunks:
+        if decompressor:
+            try:
+                chunk = decompressor.decompress(chunk)
+            except zlib.error:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid gzip data")
+
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        if len(buffer) > MAX_LINE_BYTES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Line {line_number + len(lines) + 1} is longer than {MAX_LINE_BYTES} bytes")
+
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def iter_batches(lines: AsyncIterator[Tuple[int, bytes]],
+                       batch_size: int) -> AsyncIterator[List[Tuple[int, bytes]]]:
+    """
+    Group lines into lists of batch_size (last one may be smaller).
+
+    :param lines: Async iterator from iter_ndjson_lines()
+    :param batch_size: Max lines in one batch
+    :return: Async iterator over batches
+    """
+    batch = []
+    async for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
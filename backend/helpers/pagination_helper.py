@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException
+from starlette import status
+
+
+"""
+Cursor (keyset) pagination utilities.
+Cursor is an opaque string for clients. Inside it keeps (created_at, id)
+of the last record on the page, so the next page starts right after it.
+Search results are ordered by relevance, their cursor keeps (rank, id).
+"""
+
+DEFAULT_PAGE_LIMIT = 20  # Page size if client didn't send "limit"
+MAX_PAGE_LIMIT = 100     # Upper bound for one page
+
+
+def encode_cursor(created_at: datetime, record_id: int) -> str:
+    """
+    Create opaque cursor from the last record of the page.
+
+    :param created_at: Creation timestamp of the last record
+    :param record_id: ID of the last record
+    :return: URL-safe cursor string
+    """
+    payload = json.dumps([created_at.isoformat(), record_id])
+
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('utf-8')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode cursor back to (created_at, id) pair.
+
+    :param cursor: Cursor string from client
+    :return: Tuple with created_at and record ID
+    :raises HTTPException: 400 if cursor is broken
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode('utf-8'))
+        created_at, record_id = json.loads(payload)
+
+        return datetime.fromisoformat(created_at), int(record_id)
+
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, record_id: int) -> str:
+    """
+    Create opaque cursor for relevance ordered results (search).
+
+    :param rank: Relevance of the last record on the page
+    :param record_id: ID of the last record
+    :return: URL-safe cursor string
+    """
+    payload = json.dumps([rank, record_id])
+
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('utf-8')
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode search cursor back to (rank, id) pair.
+
+    :param cursor: Cursor string from client
+    :return: Tuple with rank and record ID
+    :raises HTTPException: 400 if cursor is broken
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode('utf-8'))
+        rank, record_id = json.loads(payload)
+
+        return float(rank), int(record_id)
+
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
@@ -1,19 +1,37 @@
+import re
+from typing import Optional
+
 import bcrypt
 
+from config import settings
+from services.hash_pool import password_hash_pool
+
 """
 Password hashing and verification utilities.
 Uses bcrypt for secure password handling.
+
+hash_password() / verify_password() block the calling thread for the whole
+bcrypt run. Async code (routes, repositories) must use the *_async variants:
+they run bcrypt in the dedicated PasswordHashPool and raise 503 when it is saturated.
+
+Cost (bcrypt log2 rounds) is PASSWORD_HASH_ROUNDS, picked per host by
+calibrate_password_hash.py. Every hash keeps its own cost in the modular
+crypt prefix ("$2b$12$..."), so hashes made with different costs verify
+side by side and needs_rehash() tells which ones to upgrade on login.
 """
 
-def hash_password(plain_password: str) -> str:
+BCRYPT_HASH_PATTERN = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+def hash_password(plain_password: str, rounds: Optional[int] = None) -> str:
     """
     Hash plain text password using bcrypt.
     
     :param plain_password: Original password text
+    :param rounds: bcrypt cost, PASSWORD_HASH_ROUNDS by default
     :return: Hashed password string
     """
     # Using bcrypt
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.PASSWORD_HASH_ROUNDS)
     hashed_bytes = bcrypt.hashpw(plain_password.encode('utf-8'), salt)
     hashed = hashed_bytes.decode('utf-8')
 
@@ -39,4 +57,51 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     
     except Exception as e:
         print(f"VERIFICATION ERROR: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Get bcrypt cost stored in the hash.
+
+    :param hashed_password: Stored hashed password
+    :return: log2 rounds or None if it is not a bcrypt hash
+    """
+    match = BCRYPT_HASH_PATTERN.match(hashed_password or "")
+    return int(match.group(1)) if match else None
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Check if stored hash was made with other parameters than the current ones.
+    Call it only after successful verification - the plain password is needed to rehash.
+
+    :param hashed_password: Stored hashed password
+    :return: True if cost differs from PASSWORD_HASH_ROUNDS
+    """
+    return hash_rounds(hashed_password) != settings.PASSWORD_HASH_ROUNDS
+
+
+async def hash_password_async(plain_password: str, rounds: Optional[int] = None, wait: bool = False) -> str:
+    """
+    Hash password in the password hashing pool without blocking event loop.
+
+    :param plain_password: Original password text
+    :param rounds: bcrypt cost, PASSWORD_HASH_ROUNDS by default
+    :param wait: Wait for a free slot instead of 503 (background work, e.g. import)
+    :return: Hashed password string
+    :raises HTTPException: 503 if hashing queue is full (only if wait is False)
+    """
+    return await password_hash_pool.run(hash_password, plain_password, rounds, wait=wait)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify password in the password hashing pool without blocking event loop.
+
+    :param plain_password: Password to verify
+    :param hashed_password: Stored hashed password
+    :return: Boolean indicating password match
+    :raises HTTPException: 503 if hashing queue is full
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
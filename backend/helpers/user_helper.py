@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import HTTPException
 from starlette.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -5,7 +7,7 @@ from typing import Dict, Any
 from starlette import status
 
 from DAO.user_dao import UserDAO
-from database import response_schemas, schema
+from database import response_schemas, schema, loader_profiles
 from helpers import password_helper
 from helpers.exception_helper import CheckHTTP403FORBIDDEN_BOOL, CheckHTTP404NotFound
 from helpers.jwt_helper import create_access_token
@@ -16,6 +18,8 @@ User authentication helper functions.
 Handles login process and token generation.
 """
 
+logger = logging.getLogger(__name__)
+
 
 async def take_access_token_for_user(db: AsyncSession, 
                                      response: Response, 
@@ -30,7 +34,9 @@ async def take_access_token_for_user(db: AsyncSession,
     """
 
     # Get user by email
-    user = await UserDAO.get_user_email(db=db, user_email=str(request.email))
+    user = await UserDAO.get_user_email(db=db,
+                                        user_email=str(request.email),
+                                        options=loader_profiles.USER_LOGIN)
     if not user or not user.is_active:    
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,7 +47,7 @@ async def take_access_token_for_user(db: AsyncSession,
     # Check if user exists
     await CheckHTTP404NotFound(user, "User not found")
 
-    is_password_valid = password_helper.verify_password(request.password, user.password)
+    is_password_valid = await password_helper.verify_password_async(request.password, user.password)
 
     # Verify password
     print(f"   Verifying password...")
@@ -64,7 +70,7 @@ async def take_access_token_for_user(db: AsyncSession,
                         domain=None
                         ) 
                             
-    return response_schemas.CurrentUserResponse(
+    current_user = response_schemas.CurrentUserResponse(
         id=user.id,
         name=user.name,
         email=user.email,
@@ -73,5 +79,25 @@ async def take_access_token_for_user(db: AsyncSession,
         location=user.location,
         is_admin=user.is_admin,
         is_active=user.is_active,
+        post_count=user.post_count,
+        follower_count=user.follower_count,
+        following_count=user.following_count,
         user_access_token=access_token
     )
+
+    # Hash made with other cost than PASSWORD_HASH_ROUNDS - upgrade it while the plain password is known.
+    # After the response is built: commit expires the loaded user
+    if password_helper.needs_rehash(user.password):
+        await _rehash_password(db=db, user_id=user.id, old_hash=user.password, plain_password=request.password)
+
+    return current_user
+
+
+async def _rehash_password(db: AsyncSession, user_id: int, old_hash: str, plain_password: str) -> None:
+    """Store password hashed with current parameters, login succeeds even if it fails (next login retries)"""
+    try:
+        new_hash = await password_helper.hash_password_async(plain_password)
+        await UserDAO.replace_password_hash(db=db, user_id=user_id, old_hash=old_hash, new_hash=new_hash)
+    except Exception as e:
+        await db.rollback()
+        logger.warning("Password rehash of user %s skipped: %r", user_id, e)
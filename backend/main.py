@@ -1,14 +1,20 @@
+import asyncio
+import logging
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.database import engine, Base, get_db
+from database.database import engine, Base, SessionLocal, get_db, replica_router
 
 from routes.user_router import user_router
 from routes.admin_router import admin_router
 from routes.post_router import post_router
+from services.hash_pool import password_hash_pool
+from services.response_cache import response_cache
+from services.username_index import username_index
 from config import settings
 
 app = FastAPI(
@@ -52,9 +58,35 @@ async def create_tables():
 async def startup_event():
     """
     Creating tables in DB if they NOT already exist
+    Loading username autocomplete index
     """
     await create_tables()
 
+    try:
+        await username_index.rebuild(SessionLocal)
+    except Exception:
+        # Autocomplete falls back to database until the next reload
+        logging.getLogger(__name__).exception("Username index load failed")
+
+    if settings.USERNAME_INDEX_REFRESH_INTERVAL > 0:
+        app.state.username_index_refresh = asyncio.create_task(
+            username_index.refresh_periodically(SessionLocal, settings.USERNAME_INDEX_REFRESH_INTERVAL))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Stopping username index reloads, closing connection pools of read replicas and response cache,
+    stopping password hashing threads
+    """
+    refresh_task = getattr(app.state, "username_index_refresh", None)
+    if refresh_task:
+        refresh_task.cancel()
+
+    await replica_router.dispose()
+    await response_cache.close()
+    password_hash_pool.shutdown()
+
 
 # Here you include your routes from /routes
 app.include_router(user_router, prefix="/api/v1") # Route for working with "users"
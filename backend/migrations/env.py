@@ -32,7 +32,7 @@ if config.config_file_name is not None:
 # Choose between SQLite or PostgreSQL URLs from settings
 db_url_sqlite = str(settings.DATABASE_URL_FOR_ALEMBIC)
 db_url_pg = str(settings.DATABASE_URL_FOR_ALEMBIC_POSTGRE)
-config.set_main_option("sqlalchemy.url", str(db_url_sqlite))    # Now using PostgreSQL
+config.set_main_option("sqlalchemy.url", db_url_pg if settings.DB_BACKEND == "postgresql" else db_url_sqlite)   # DB_BACKEND in .env
 
 # Set target metadata for 'autogenerate' support
 # Alembic will compare this with database to generate migrations
@@ -44,6 +44,18 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Skip search index objects managed by raw DDL (see models.SQLITE_SEARCH_DDL),
+    so autogenerate doesn't try to drop them.
+    """
+    if type_ == "table" and name.startswith("posts_fts"):
+        return False
+    if type_ == "index" and name == "ix_posts_content_fts":
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -60,6 +72,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -83,7 +96,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,76 @@
+"""Index pack for hot query shapes
+
+Revision ID: a1f3c9d2e4b5
+Revises: 
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f3c9d2e4b5'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial index condition)
+INDEXES = [
+    # Posts of one user, newest first
+    ("ix_posts_user_id_created_at", "posts", ["user_id", sa.text("created_at DESC")], None),
+    # Global feed keyset pagination
+    ("ix_posts_created_at_id", "posts", [sa.text("created_at DESC"), sa.text("id DESC")], None),
+    # Active users directory (partial)
+    ("ix_users_active_created_at", "users", [sa.text("created_at DESC"), sa.text("id DESC")], True),
+    # Deleted users list (partial)
+    ("ix_users_deleted_deleted_at", "users", [sa.text("deleted_at DESC")], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+
+    if bind.dialect.name == "sqlite":
+        # Old server defaults stored booleans as 'true'/'false' text on SQLite.
+        # Normalize them to 1/0, so "is_active = 1" (queries and partial indexes) matches every row
+        for column in ("is_admin", "is_active", "deleted_by_admin"):
+            op.execute(f"UPDATE users SET {column} = 1 WHERE {column} = 'true'")
+            op.execute(f"UPDATE users SET {column} = 0 WHERE {column} = 'false'")
+
+    for name, table, columns, is_active in INDEXES:
+        where = None
+        if is_active is not None:
+            value = str(is_active).lower() if is_postgres else int(is_active)  # true/false vs 1/0
+            where = sa.text(f"is_active = {value}")
+
+        if is_postgres:
+            # CREATE INDEX CONCURRENTLY doesn't block writes, but can't run inside transaction
+            with op.get_context().autocommit_block():
+                op.create_index(name, table, columns,
+                                postgresql_where=where,
+                                postgresql_concurrently=True,
+                                if_not_exists=True)
+        else:
+            op.create_index(name, table, columns,
+                            sqlite_where=where,
+                            if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+
+    for name, table, _, _ in reversed(INDEXES):
+        if is_postgres:
+            with op.get_context().autocommit_block():
+                op.drop_index(name, table_name=table,
+                              postgresql_concurrently=True,
+                              if_exists=True)
+        else:
+            op.drop_index(name, table_name=table, if_exists=True)
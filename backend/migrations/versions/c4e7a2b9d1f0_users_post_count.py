@@ -0,0 +1,35 @@
+"""Denormalized post counter on users
+
+Revision ID: c4e7a2b9d1f0
+Revises: a1f3c9d2e4b5
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a2b9d1f0'
+down_revision: Union[str, None] = 'a1f3c9d2e4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("post_count", sa.Integer(), nullable=False, server_default="0"))
+
+    # Fill counters for existing users (same query as UserDAO.reconcile_post_counts)
+    op.execute(
+        "UPDATE users SET post_count = "
+        "(SELECT count(posts.id) FROM posts WHERE posts.user_id = users.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("post_count")
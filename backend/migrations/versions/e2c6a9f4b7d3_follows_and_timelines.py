@@ -0,0 +1,57 @@
+"""Follow graph and materialized home timelines
+
+Revision ID: e2c6a9f4b7d3
+Revises: d8b3f5a1c2e9
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c6a9f4b7d3'
+down_revision: Union[str, None] = 'd8b3f5a1c2e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("follower_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("users", sa.Column("following_count", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        "follows",
+        sa.Column("follower_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("followee_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("follower_id", "followee_id"),
+    )
+    op.create_index("ix_follows_followee_created_at", "follows",
+                    ["followee_id", sa.text("created_at DESC"), "follower_id"])
+
+    op.create_table(
+        "timeline_entries",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id"), nullable=False),
+        sa.Column("author_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "post_id"),
+    )
+    op.create_index("ix_timeline_entries_user_created_at", "timeline_entries",
+                    ["user_id", sa.text("created_at DESC"), sa.text("post_id DESC")])
+    op.create_index("ix_timeline_entries_author_user", "timeline_entries", ["author_id", "user_id"])
+    op.create_index("ix_timeline_entries_post_id", "timeline_entries", ["post_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("timeline_entries")
+    op.drop_table("follows")
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("following_count")
+        batch_op.drop_column("follower_count")
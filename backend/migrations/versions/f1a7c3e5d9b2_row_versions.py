@@ -0,0 +1,33 @@
+"""Row version and updated_at on users and posts (ETags)
+
+Revision ID: f1a7c3e5d9b2
+Revises: e2c6a9f4b7d3
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e5d9b2'
+down_revision: Union[str, None] = 'e2c6a9f4b7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("users", "posts"):
+        op.add_column(table, sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("posts", "users"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("updated_at")
+            batch_op.drop_column("version")
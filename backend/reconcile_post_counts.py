@@ -0,0 +1,26 @@
+import asyncio
+
+from database.database import SessionLocal
+from DAO.user_dao import UserDAO
+
+"""
+Repair users.post_count.
+
+The counter is kept by PostDao (create/delete) and UserDAO (account deletion)
+in the same transaction as the posts change. Rows changed outside the app
+(manual SQL, restored backups) can make it drift - this command recounts
+posts and fixes only users whose counter is wrong.
+
+Run: python reconcile_post_counts.py
+"""
+
+
+async def main() -> int:
+    async with SessionLocal() as db:
+        return await UserDAO.reconcile_post_counts(db=db)
+
+
+if __name__ == "__main__":
+    print("Reconciling users.post_count...")
+    repaired = asyncio.run(main())
+    print(f"Done, {repaired} users repaired")
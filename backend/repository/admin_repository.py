@@ -1,14 +1,31 @@
-from typing import Optional
+import asyncio
+import zlib
+from datetime import datetime, timezone
+from collections import Counter
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 from fastapi import Depends, HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from starlette import status
 from DAO.admin_dao import AdminDAO
+from DAO.post_dao import PostDao
+from DAO.timeline_dao import TimelineDAO
 from DAO.user_dao import UserDAO
+from services.post_services import PostService
 from services.user_services import UserService
-from database import models, response_schemas
+from database import models, response_schemas, schema, loader_profiles
+from database.database import SessionLocal, engine, read_session, replica_router
+from database.pool_metrics import pool_stats
 from helpers.exception_helper import CheckHTTP404NotFound, CheckHTTP409Conflict, CheckHTTP403FORBIDDEN_BOOL
 from helpers.token_helper import get_token, verify_token
+from helpers import ndjson_helper, password_helper
+from services.validation_services import ValidationService
+from services.auth_cache import auth_user_cache
+from services.hash_pool import password_hash_pool
+from services.response_cache import response_cache, user_tag, FEED_TAG
+from services.username_index import username_index
 
 from DAO.general_dao import GeneralDAO
 
@@ -36,7 +53,8 @@ async def update_admin_status(user_id: int,
         
     user_to_promote = await GeneralDAO.get_record_by_id(record_id=user_id,
                                                         model=models.User,
-                                                        db=db)
+                                                        db=db,
+                                                        options=loader_profiles.USER_PROFILE)
     await CheckHTTP404NotFound(founding_item=user_to_promote, text="User not found")
 
     # This all checks can be in excpetion_helper.py or in something like that
@@ -103,7 +121,9 @@ async def delete_user_admin(admin_user: models.User,
         )
     
     # Get target user
-    target_user = await UserDAO.get_user_by_id(db=db, user_id=user_id)
+    target_user = await UserDAO.get_user_by_id(db=db,
+                                               user_id=user_id,
+                                               options=loader_profiles.USER_AUTH)
     
     await CheckHTTP404NotFound(founding_item=target_user,
                                text="User not found")
@@ -124,14 +144,12 @@ async def delete_user_admin(admin_user: models.User,
             detail="Deletion reason is required (min 5 characters)"
         )
     
-    # Soft delete user
-    await UserDAO.soft_delete_acc(db=db,user_id=user_id,
-                                  deleted_by_admin=True,
-                                  deletion_reason=deletion_reason)
-    
-    # Delete user's posts (hard delete)
-    deleted_posts_count = await UserDAO.soft_delete_user_posts(db=db,
-                                                               user_id=user_id)
+    # Soft delete user and delete user's posts (hard delete) in one transaction
+    deleted_posts_count = await UserDAO.delete_account(db=db,
+                                                       user_id=user_id,
+                                                       deleted_by_admin=True,
+                                                       deletion_reason=deletion_reason)
+    username_index.remove(user_id)
     
     return response_schemas.UserDeleteResponse(
         message=f"User {deleted_user_name} has been deleted by admin. {deleted_posts_count} posts removed.",
@@ -139,6 +157,133 @@ async def delete_user_admin(admin_user: models.User,
         deletion_reason=deletion_reason)
 
 
+def _unique_ids(user_ids: List[int]) -> List[int]:
+    """Remove repeated IDs from bulk request, keeping their order"""
+    return list(dict.fromkeys(user_ids))
+
+
+async def bulk_update_admin_status(user_ids: List[int],
+                                   is_admin: bool,
+                                   admin_user: models.User,
+                                   db: AsyncSession) -> response_schemas.BulkUserOperationResponse:
+    """
+    Update admin status of many users with one UPDATE statement.
+    Same rules as update_admin_status(), but users that break them
+    are reported in results instead of failing the whole request.
+
+    :param user_ids: IDs of users to update
+    :param is_admin: New admin status (True or False)
+    :param admin_user: Authenticated admin user
+    :param db: Database session
+
+    :return: Per-user results
+    """
+    user_ids = _unique_ids(user_ids)
+
+    updated_users = await AdminDAO.bulk_update_admin_status(db=db,
+                                                            user_ids=user_ids,
+                                                            is_admin=is_admin,
+                                                            admin_id=admin_user.id)
+    updated_names = {user.id: user.name for user in updated_users}
+    action = 'promoted to admin' if is_admin else 'demoted from admin'
+
+    # Read status columns only for skipped users to explain the reason
+    skipped_ids = [user_id for user_id in user_ids if user_id not in updated_names]
+    skipped_users = {}
+    if skipped_ids:
+        skipped_users = {user.id: user for user in await AdminDAO.get_users_status(db=db, user_ids=skipped_ids)}
+
+    results = []
+    for user_id in user_ids:
+        if user_id in updated_names:
+            results.append(response_schemas.BulkUserResult(user_id=user_id,
+                                                           success=True,
+                                                           detail=f"User {updated_names[user_id]} has been {action}"))
+            continue
+
+        user = skipped_users.get(user_id)
+        if not user:
+            detail = "User not found"
+        elif user.id == admin_user.id:
+            detail = "Admins cannot change their own admin status"
+        elif not user.is_active:
+            detail = f"User {user.name} is not active"
+        elif is_admin:
+            detail = f"User {user.name} is already an admin"
+        else:
+            detail = f"User {user.name} is not an admin"
+
+        results.append(response_schemas.BulkUserResult(user_id=user_id, success=False, detail=detail))
+
+    return response_schemas.BulkUserOperationResponse(
+        message=f"{len(updated_names)} of {len(user_ids)} users have been {action}",
+        status_code=200,
+        data=results
+    )
+
+
+async def bulk_delete_users_admin(admin_user: models.User,
+                                  user_ids: List[int],
+                                  deletion_reason: str,
+                                  db: AsyncSession) -> response_schemas.BulkUserOperationResponse:
+    """
+    Admin deletes many user accounts in one transaction.
+
+    :param admin_user: Admin user
+    :param user_ids: IDs of users to delete
+    :param deletion_reason: Reason for deletion
+    :param db: Database session
+    :return: Per-user results with number of removed posts
+    :raises HTTPException: 400 if reason is shorter than 5 characters without surrounding whitespace
+    """
+    # Same rule as single deletion (delete_user_admin) - schema's min_length counts whitespace too
+    if not deletion_reason or len(deletion_reason.strip()) < 5:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Deletion reason is required (min 5 characters)"
+        )
+
+    user_ids = _unique_ids(user_ids)
+
+    deleted_posts = await UserDAO.delete_accounts(user_ids=user_ids,
+                                                  db=db,
+                                                  deletion_reason=deletion_reason,
+                                                  exclude_user_id=admin_user.id)
+    for user_id in deleted_posts:
+        username_index.remove(user_id)
+
+    skipped_ids = [user_id for user_id in user_ids if user_id not in deleted_posts]
+    skipped_users = {}
+    if skipped_ids:
+        skipped_users = {user.id: user for user in await AdminDAO.get_users_status(db=db, user_ids=skipped_ids)}
+
+    results = []
+    for user_id in user_ids:
+        if user_id in deleted_posts:
+            results.append(response_schemas.BulkUserResult(user_id=user_id,
+                                                           success=True,
+                                                           detail="User has been deleted by admin",
+                                                           deleted_posts=deleted_posts[user_id]))
+            continue
+
+        user = skipped_users.get(user_id)
+        if not user:
+            detail = "User not found"
+        elif user.id == admin_user.id:
+            detail = "Admins cannot delete their own account via admin endpoint. Use self-delete instead."
+        else:
+            detail = "User account is already deleted"
+
+        results.append(response_schemas.BulkUserResult(user_id=user_id, success=False, detail=detail))
+
+    return response_schemas.BulkUserOperationResponse(
+        message=f"{len(deleted_posts)} of {len(user_ids)} users have been deleted by admin. "
+                f"{sum(deleted_posts.values())} posts removed.",
+        status_code=200,
+        data=results
+    )
+
+
 async def get_deleted_users_list(admin_user: models.User,
                                  db: AsyncSession) -> response_schemas.UserListResponse:
     """
@@ -161,4 +306,297 @@ async def get_deleted_users_list(admin_user: models.User,
     users_list = await UserService.get_formated_users(users=deleted_users)
 
 
-    return users_list
\ No newline at end of file
+    return users_list
+
+
+async def get_database_pool_stats() -> response_schemas.PoolStatsListResponse:
+    """
+    Connection pool telemetry of this worker: primary database and replicas.
+    Use it to size PG_POOL_SIZE / PG_MAX_OVERFLOW and number of workers.
+
+    :return: Pool stats for every engine
+    """
+    engines = [("primary", engine)] + [(replica.engine.url.render_as_string(hide_password=True), replica.engine)
+                                       for replica in replica_router.replicas]
+
+    stats = [response_schemas.PoolStatsResponse(database=name, **pool_stats(db_engine.pool))
+             for name, db_engine in engines]
+
+    return response_schemas.PoolStatsListResponse(message="Database pool stats retrieved successfully",
+                                                  status_code=200,
+                                                  data=stats)
+
+
+async def get_cache_stats() -> response_schemas.CacheStatsListResponse:
+    """
+    Hit/miss counters of in-process caches of this worker.
+    Use it to tune AUTH_USER_CACHE_* and RESPONSE_CACHE_* settings.
+
+    :return: Stats for every cache
+    """
+    stats = [
+        response_schemas.CacheStatsResponse(cache="auth_user", **auth_user_cache.stats()),
+        response_schemas.CacheStatsResponse(cache=f"response:{response_cache.backend_name}", **response_cache.stats()),
+    ]
+
+    return response_schemas.CacheStatsListResponse(message="Cache stats retrieved successfully",
+                                                   status_code=200,
+                                                   data=stats)
+
+
+async def get_password_hash_stats() -> response_schemas.PasswordHashStatsDataResponse:
+    """
+    Queue depth and timing of the password hashing pool of this worker.
+    Use it to tune PASSWORD_HASH_WORKERS / PASSWORD_HASH_MAX_QUEUE.
+
+    :return: Pool stats
+    """
+    stats = response_schemas.PasswordHashStatsResponse(**password_hash_pool.stats())
+
+    return response_schemas.PasswordHashStatsDataResponse(message="Password hashing stats retrieved successfully",
+                                                          status_code=200,
+                                                          data=stats)
+
+
+async def export_posts_ndjson(since: Optional[datetime],
+                              compress: bool) -> AsyncIterator[bytes]:
+    """
+    Stream all posts as NDJSON chunks (optionally gzip compressed).
+    Opens its own read session, because request dependencies are closed
+    before StreamingResponse starts sending the body.
+
+    :param since: Export only posts created at or after this time
+    :param compress: Compress output with gzip
+    :return: Async iterator over chunks of response body
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None   # wbits=31 - gzip container
+
+    async with read_session() as db:
+        async for batch in PostDao.stream_posts(db=db, since=since):
+            chunk = PostService.posts_to_ndjson(batch)
+
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
+
+
+# BULK IMPORT #
+MAX_IMPORT_ERRORS = 1000    # Rejected lines listed in the report, the rest are only counted
+# COPY/executemany send every column, so server defaults of optional fields are filled here
+DEFAULT_BIO = models.User.__table__.c.bio.server_default.arg
+DEFAULT_LOCATION = models.User.__table__.c.location.server_default.arg
+
+
+def _add_import_error(report: response_schemas.ImportReport, line: int, detail: str) -> None:
+    """Count rejected line and list it while the report has room"""
+    report.failed += 1
+    if len(report.errors) < MAX_IMPORT_ERRORS:
+        report.errors.append(response_schemas.ImportLineError(line=line, detail=detail))
+    else:
+        report.errors_truncated = True
+
+
+def _validation_error_text(error: ValidationError) -> str:
+    """Short one-line text of pydantic error for the report"""
+    return "; ".join(f"{'.'.join(str(part) for part in item['loc']) or 'line'}: {item['msg']}"
+                     for item in error.errors())
+
+
+def _to_utc(value: Optional[datetime], default: datetime) -> datetime:
+    """Imported timestamp in UTC (naive values are treated as UTC, missing - default)"""
+    if value is None:
+        return default
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+async def _insert_import_batch(db: AsyncSession,
+                               model,
+                               accepted: List[Tuple[int, dict]],
+                               report: response_schemas.ImportReport,
+                               after_insert: Optional[Callable[[List[dict], List[int]], Awaitable[None]]] = None) -> None:
+    """
+    Insert accepted lines of one batch and commit them.
+    after_insert(rows, ids) runs in the same transaction (e.g. to update counters or fan out posts).
+    If database rejects the batch (row inserted concurrently), all its lines are reported as failed.
+    """
+    if not accepted:
+        return
+
+    rows = [row for _, row in accepted]
+    try:
+        if after_insert:
+            ids = await GeneralDAO.bulk_insert_with_ids(db=db, model=model, rows=rows)
+            await after_insert(rows, ids)
+        else:
+            await GeneralDAO.bulk_insert(db=db, model=model, rows=rows)
+        await db.commit()
+        report.imported += len(accepted)
+
+    except IntegrityError as e:
+        await db.rollback()
+        for line_number, _ in accepted:
+            _add_import_error(report, line_number, f"Batch rejected by database ({e.orig}), retry these lines")
+
+
+async def import_users(chunks: AsyncIterator[bytes],
+                       compressed: bool,
+                       db: AsyncSession) -> response_schemas.ImportResponse:
+    """
+    Import users from NDJSON stream, one schema.UserImport per line.
+    Lines are processed in batches of IMPORT_BATCH_SIZE: one uniqueness query per
+    unique field (ValidationService.VALIDATION_RULES), one COPY / executemany and one commit.
+    Plain passwords are hashed in the password hashing pool, "password_hash" is stored as is.
+
+    :param chunks: Request body chunks
+    :param compressed: Body is gzip compressed
+    :param db: Database session
+    :return: Import report with per-line errors
+    """
+    report = response_schemas.ImportReport()
+    lines = ndjson_helper.iter_ndjson_lines(chunks=chunks, compressed=compressed)
+
+    async for batch in ndjson_helper.iter_batches(lines=lines, batch_size=schema.IMPORT_BATCH_SIZE):
+        report.total_lines += len(batch)
+
+        candidates = []
+        for line_number, line in batch:
+            try:
+                candidates.append((line_number, schema.UserImport.model_validate_json(line)))
+            except ValidationError as e:
+                _add_import_error(report, line_number, _validation_error_text(e))
+
+        # Values already in database (previous batches are committed, so they are here too)
+        unique_fields = ValidationService.get_validation_rules(models.User).get("unique_fields", [])
+        existing = await ValidationService.find_existing_values(
+            model_class=models.User,
+            values={field: [getattr(user, field) for _, user in candidates] for field in unique_fields},
+            db=db
+        )
+
+        accepted_users = []
+        for line_number, user in candidates:
+            duplicate_field = next((field for field in unique_fields if getattr(user, field) in existing[field]), None)
+            if duplicate_field:
+                _add_import_error(report, line_number,
+                                  f"Value '{getattr(user, duplicate_field)}' for field '{duplicate_field}' already exists")
+                continue
+
+            for field in unique_fields:
+                existing[field].add(getattr(user, field))   # Duplicates inside the file
+            accepted_users.append((line_number, user))
+
+        # bcrypt is slow and releases GIL - hash plain passwords in parallel in the password hashing pool.
+        # Not more than its threads at once, so the import never fills the queue sign up and login rely on,
+        # and waiting for free slots when logins fill it (503 would abort the import between committed batches)
+        hashing_slots = asyncio.Semaphore(password_hash_pool.workers)
+
+        async def hash_user_password(user: schema.UserImport) -> str:
+            if user.password is None:
+                return user.password_hash
+            async with hashing_slots:
+                return await password_helper.hash_password_async(user.password, wait=True)
+
+        password_hashes = await asyncio.gather(*(hash_user_password(user) for _, user in accepted_users))
+
+        imported_at = datetime.now(timezone.utc)
+        accepted = [
+            (line_number, {
+                "name": user.name,
+                "email": user.email,
+                "password": password_hash,
+                "bio": user.bio if user.bio is not None else DEFAULT_BIO,
+                "location": user.location if user.location is not None else DEFAULT_LOCATION,
+                "is_admin": user.is_admin,
+                "is_active": True,
+                "deleted_by_admin": False,
+                "created_at": _to_utc(user.created_at, default=imported_at),
+            })
+            for (line_number, user), password_hash in zip(accepted_users, password_hashes)
+        ]
+        await _insert_import_batch(db=db, model=models.User, accepted=accepted, report=report)
+
+    if report.imported:
+        # IDs of imported rows are not returned by bulk insert, so reload the whole index
+        await username_index.rebuild(SessionLocal)
+
+    report.errors.sort(key=lambda error: error.line)
+    return response_schemas.ImportResponse(
+        message=f"{report.imported} of {report.total_lines} users have been imported",
+        status_code=200,
+        data=report
+    )
+
+
+async def import_posts(chunks: AsyncIterator[bytes],
+                       compressed: bool,
+                       db: AsyncSession) -> response_schemas.ImportResponse:
+    """
+    Import posts from NDJSON stream, one schema.PostImport per line.
+    Authors of a batch are resolved with one query (by ID or email, active users only),
+    then batch is inserted with one COPY / executemany, fanned out to followers' timelines and committed.
+
+    :param chunks: Request body chunks
+    :param compressed: Body is gzip compressed
+    :param db: Database session
+    :return: Import report with per-line errors
+    """
+    report = response_schemas.ImportReport()
+    lines = ndjson_helper.iter_ndjson_lines(chunks=chunks, compressed=compressed)
+
+    async for batch in ndjson_helper.iter_batches(lines=lines, batch_size=schema.IMPORT_BATCH_SIZE):
+        report.total_lines += len(batch)
+
+        candidates = []
+        for line_number, line in batch:
+            try:
+                candidates.append((line_number, schema.PostImport.model_validate_json(line)))
+            except ValidationError as e:
+                _add_import_error(report, line_number, _validation_error_text(e))
+
+        authors = await UserDAO.get_active_user_ids(
+            db=db,
+            user_ids=list({post.user_id for _, post in candidates if post.user_id is not None}),
+            emails=list({post.user_email for _, post in candidates if post.user_email is not None})
+        )
+
+        imported_at = datetime.now(timezone.utc)
+        accepted = []
+        for line_number, post in candidates:
+            if post.user_id is not None:
+                user_id = authors["ids"].get(post.user_id)
+            else:
+                user_id = authors["emails"].get(post.user_email)
+
+            if user_id is None:
+                _add_import_error(report, line_number, "Author not found or not active")
+                continue
+
+            accepted.append((line_number, {
+                "content": post.content,
+                "user_id": user_id,
+                "created_at": _to_utc(post.created_at, default=imported_at),
+            }))
+
+        async def count_and_fan_out_posts(rows: List[dict], ids: List[int]) -> None:
+            # Same as PostDao.create_posts_bulk: counters and followers' timelines in the batch transaction
+            await UserDAO.change_post_counts(db=db, changes=Counter(row["user_id"] for row in rows))
+            await TimelineDAO.fan_out_posts(db=db, post_ids=ids)
+
+        await _insert_import_batch(db=db, model=models.Post, accepted=accepted, report=report,
+                                   after_insert=count_and_fan_out_posts)
+
+        # Imported posts keep their timestamps, so they may land on any feed page
+        await response_cache.invalidate(FEED_TAG, *{user_tag(row["user_id"]) for _, row in accepted})
+
+    report.errors.sort(key=lambda error: error.line)
+    return response_schemas.ImportResponse(
+        message=f"{report.imported} of {report.total_lines} posts have been imported",
+        status_code=200,
+        data=report
+    )
@@ -0,0 +1,131 @@
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from starlette import status
+
+from DAO.follow_dao import FollowDAO
+from DAO.timeline_dao import TimelineDAO
+from DAO.user_dao import UserDAO
+from database import models, response_schemas, loader_profiles
+from helpers.exception_helper import CheckHTTP404NotFound
+
+
+"""
+Follow graph and home timeline business logic.
+"""
+
+
+async def _get_active_user(user_id: int, db: AsyncSession) -> models.User:
+    """Get active user or raise 404"""
+    user = await UserDAO.get_user_by_id(db=db, user_id=user_id, options=loader_profiles.USER_AUTH)
+    await CheckHTTP404NotFound(founding_item=user and user.is_active, text="User not found")
+
+    return user
+
+
+async def follow_user(user_id: int,
+                      current_user: models.User,
+                      db: AsyncSession) -> response_schemas.BaseResponse:
+    """
+    Current user starts following another user.
+
+    :param user_id: ID of user to follow
+    :param current_user: Authenticated user
+    :param db: Database session
+    :return: Message response
+    :raises HTTPException: 400 on self-follow, 404 if user not found, 409 if already following
+    """
+    follower_id = current_user.id
+    if user_id == follower_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You can't follow yourself")
+
+    followee = await _get_active_user(user_id=user_id, db=db)
+    followee_name = followee.name
+
+    created = await FollowDAO.follow(db=db, follower_id=follower_id, followee_id=user_id)
+    if not created:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"You already follow {followee_name}")
+
+    return response_schemas.BaseResponse(
+        message=f"You are following {followee_name} now",
+        status_code=200
+    )
+
+
+async def unfollow_user(user_id: int,
+                        current_user: models.User,
+                        db: AsyncSession) -> response_schemas.BaseResponse:
+    """
+    Current user stops following another user.
+
+    :param user_id: ID of user to unfollow
+    :param current_user: Authenticated user
+    :param db: Database session
+    :return: Message response
+    :raises HTTPException: 404 if current user doesn't follow this user
+    """
+    removed = await FollowDAO.unfollow(db=db, follower_id=current_user.id, followee_id=user_id)
+    await CheckHTTP404NotFound(founding_item=removed, text="You don't follow this user")
+
+    return response_schemas.BaseResponse(
+        message="User has been unfollowed",
+        status_code=200
+    )
+
+
+async def get_follows(user_id: int,
+                      direction: str,
+                      limit: int,
+                      cursor: Optional[str],
+                      db: AsyncSession) -> response_schemas.FollowListResponse:
+    """
+    Get page of user's followers or followed users.
+
+    :param user_id: User whose follows to list
+    :param direction: "followers" or "following"
+    :param limit: Max number of users on the page
+    :param cursor: Cursor from previous page
+    :param db: Database session
+    :return: Page of users and next page cursor
+    """
+    await _get_active_user(user_id=user_id, db=db)
+
+    users, next_cursor = await FollowDAO.get_follow_page(db=db,
+                                                         user_id=user_id,
+                                                         direction=direction,
+                                                         limit=limit,
+                                                         cursor=cursor)
+
+    return response_schemas.FollowListResponse(
+        message="Users found" if users else "No users found",
+        status_code=200,
+        data=users,
+        next_cursor=next_cursor
+    )
+
+
+async def get_home_timeline(current_user: models.User,
+                            limit: int,
+                            cursor: Optional[str],
+                            db: AsyncSession) -> response_schemas.PostListResponse:
+    """
+    Get page of current user's home timeline (own posts and posts of followed users).
+
+    :param current_user: Authenticated user
+    :param limit: Max number of posts on the page
+    :param cursor: Cursor from previous page
+    :param db: Database session
+    :return: Page of posts and next page cursor
+    """
+    posts, next_cursor = await TimelineDAO.get_home_timeline(db=db,
+                                                             user_id=current_user.id,
+                                                             limit=limit,
+                                                             cursor=cursor)
+
+    return response_schemas.PostListResponse(
+        message="Timeline retrieved successfully" if posts else "Timeline is empty",
+        status_code=200,
+        data=posts,
+        next_cursor=next_cursor
+    )
@@ -1,17 +1,19 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 from starlette.responses import Response
 
 from DAO.user_dao import UserDAO
-from database import schema, models, response_schemas
+from database import schema, models, response_schemas, loader_profiles
 
-from helpers import exception_helper
+from helpers import etag_helper, exception_helper
+from repository import user_repository
+from services.response_cache import response_cache, author_tag, post_tag, FEED_HEAD_TAG, FEED_TAG
 from DAO.general_dao import GeneralDAO
 from DAO.post_dao import PostDao
-from database.database import get_db
+from database.database import get_db, session_after_write, session_reads_replica
 
 
 async def create_post(request: schema.PostCreate,
@@ -36,25 +38,50 @@ async def create_post(request: schema.PostCreate,
     )
 
 
+async def create_posts_bulk(request: schema.PostBulkCreate,
+                            current_user: schema.User,
+                            db: AsyncSession) -> response_schemas.PostBulkCreateResponse:
+    """
+    Create many posts for the current user in one INSERT.
+    """
+    created_posts = await PostDao.create_posts_bulk(db=db,
+                                                    requests=request.posts,
+                                                    user_id=current_user.id)
+
+    return response_schemas.PostBulkCreateResponse(
+        message=f"{len(created_posts)} posts have been created successfully",
+        status_code=200,
+        data=[
+            response_schemas.PostResponse(
+                id=post.id,
+                content=post.content,
+                created_at=post.created_at,
+                user_id=post.user_id
+            )
+            for post in created_posts
+        ]
+    )
+
+
 async def update_post(post_id: int,
                       user_id: int,
                       post_data: schema.PostUpdate,
-                      db: AsyncSession) -> response_schemas.PostUpdateResponse:
+                      db: AsyncSession,
+                      if_match: Optional[str] = None) -> response_schemas.PostUpdateResponse:
+    """
+    Update own post. Response is built from the row returned by UPDATE ... RETURNING.
+    With If-Match (ETag of GET /posts/post/{id}) the update is applied only to that version of the post.
+    """
 
     if not post_data.dict(exclude_unset=True):
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    post = await PostDao.get_post_by_user_id(db=db, 
-                                            post_id=post_id, 
-                                            user_id=user_id)
-    
-    await exception_helper.CheckHTTP404NotFound(founding_item=post, 
-                                              text="Post not found or you don't have permission to update it")
-    
-    updated_post = await GeneralDAO.update_record(model=models.Post,
-                                                  record=post,
-                                                  update_data=post_data,
-                                                  db=db)
+    # One UPDATE checks ownership (and version), author's version is bumped in the same transaction
+    updated_post = await PostDao.update_post(post_id=post_id,
+                                             user_id=user_id,
+                                             post_data=post_data,
+                                             db=db,
+                                             expected_version=etag_helper.version_from_if_match(if_match, "post", post_id))
     
     return response_schemas.PostUpdateResponse(
         message="Post has been updated",
@@ -87,13 +114,39 @@ async def delete_post(post_id: int,
 
 
 async def show_post(post_id: int,
+                    if_none_match: Optional[str] = None,
                     db: AsyncSession = Depends(get_db)) -> response_schemas.PostDetailResponse:
+    """
+    Get post with author data. Serialized response is cached until the post or its author changes.
+    ETag depends on versions of post and author (author's name and email are in the response).
+
+    :param post_id: Post ID
+    :param if_none_match: If-None-Match request header
+    :param db: Database session
+    :return: JSON response with ETag or empty 304 response if client has current version
+    """
+    cache_key = f"post:{post_id}"
+    cached = await response_cache.get(cache_key, after_write=session_after_write(db))
+    if cached:
+        return cached.to_response(if_none_match)
+
+    generation = response_cache.generation
+    if if_none_match:
+        # Version-only query, the post is not loaded if client's copy is current
+        versions = await PostDao.get_post_versions(db=db, post_id=post_id)
+        await exception_helper.CheckHTTP404NotFound(founding_item=versions, text="Post not found")
+
+        etag = etag_helper.make_etag("post", post_id, versions.post_version, versions.user_version)
+        if etag_helper.etag_matches(if_none_match, etag):
+            return etag_helper.not_modified(etag)
+
     post = await GeneralDAO.get_record_by_id(record_id=post_id,
                                              model=models.Post,
-                                             db=db)
+                                             db=db,
+                                             options=loader_profiles.POST_WITH_AUTHOR)
     await exception_helper.CheckHTTP404NotFound(founding_item=post, text="Post not found")
-    
-    return response_schemas.PostDetailResponse(
+
+    post_response = response_schemas.PostDetailResponse(
         message="Post retrieved successfully",
         status_code=200,
         data=response_schemas.PostWithUserResponse(
@@ -106,25 +159,72 @@ async def show_post(post_id: int,
         )
     )
 
+    return await response_cache.store(cache_key,
+                                      post_response,
+                                      tags=[post_tag(post.id), author_tag(post.user_id)],
+                                      generation=generation,
+                                      etag=etag_helper.make_etag("post", post.id, post.version, post.user.version),
+                                      after_write=session_after_write(db),
+                                      from_replica=session_reads_replica(db))
 
-async def get_all_posts(db: AsyncSession) -> response_schemas.PostListResponse:
 
-    posts_list = await PostDao.get_all_posts(db=db)
+async def get_all_posts(limit: int,
+                        cursor: Optional[str],
+                        db: AsyncSession) -> response_schemas.PostListResponse:
+    """
+    Get page of the feed. Pages are cached: the first one is dropped by every new post,
+    cursor pages only when one of their posts or authors changes.
+    """
+    cache_key = f"feed:{limit}:{cursor or ''}"
+    cached = await response_cache.get(cache_key, after_write=session_after_write(db))
+    if cached:
+        return cached.to_response()
+
+    generation = response_cache.generation
+    posts_list, next_cursor = await PostDao.get_all_posts(db=db,
+                                                          limit=limit,
+                                                          cursor=cursor)
     
-    return response_schemas.PostListResponse(
+    posts_response = response_schemas.PostListResponse(
         message="Posts retrieved successfully",
         status_code=200,
-        data=posts_list
+        data=posts_list,
+        next_cursor=next_cursor
+    )
+
+    tags = {FEED_TAG} if cursor else {FEED_TAG, FEED_HEAD_TAG}
+    for post in posts_list:
+        tags.update((post_tag(post.id), author_tag(post.user_id)))
+
+    return await response_cache.store(cache_key,
+                                      posts_response,
+                                      tags=tags,
+                                      generation=generation,
+                                      after_write=session_after_write(db),
+                                      from_replica=session_reads_replica(db))
+
+async def search_posts(search_query: str,
+                       limit: int,
+                       cursor: Optional[str],
+                       db: AsyncSession) -> response_schemas.PostListResponse:
+
+    posts_list, next_cursor = await PostDao.search_posts(db=db,
+                                                         search_query=search_query,
+                                                         limit=limit,
+                                                         cursor=cursor)
+
+    return response_schemas.PostListResponse(
+        message=f"Found {len(posts_list)} posts" + (" (more on next page)" if next_cursor else ""),
+        status_code=200,
+        data=posts_list,
+        next_cursor=next_cursor
     )
 
 async def get_user_with_posts(user_id: int,
+                              if_none_match: Optional[str],
                               db: AsyncSession) -> response_schemas.UserWithPostsDataResponse:
 
-    users_data = await UserDAO.get_user_with_posts(user_id=user_id,
-                                                    db=db)
-    
-    return response_schemas.UserWithPostsDataResponse(
-        message="User's poists retrieved successfully",
-        status_code=200,
-        data=users_data
-    )
\ No newline at end of file
+    return await user_repository.get_user_with_posts(user_id=user_id,
+                                                     if_none_match=if_none_match,
+                                                     db=db,
+                                                     message="User's poists retrieved successfully")
\ No newline at end of file
@@ -1,6 +1,8 @@
 from fastapi import Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from datetime import datetime
 
 from starlette import status
 from starlette.responses import Response
@@ -8,16 +10,20 @@ from starlette.responses import Response
 from DAO.post_dao import PostDao
 from services.post_services import PostService
 from services.user_services import UserService
-from database.database import get_db
-from database import models, schema, response_schemas
+from database.database import get_db, session_after_write, session_reads_replica
+from database import models, schema, response_schemas, loader_profiles
 
-from helpers import password_helper, user_helper
+from helpers import etag_helper, password_helper, user_helper
 from helpers import exception_helper
 from helpers.exception_helper import CheckHTTP404NotFound, CheckHTTP409Conflict, CheckHTTP403FORBIDDEN_BOOL
 from helpers.token_helper import get_token, verify_token
 
 from DAO.general_dao import GeneralDAO
 from DAO.user_dao import UserDAO
+from services.auth_cache import auth_user_cache
+from services.response_cache import response_cache, author_tag, user_tag
+from services.username_index import username_index
+from services.validation_services import ValidationService
 
 from helpers import password_helper
 
@@ -33,7 +39,8 @@ async def sign_up(request: schema.User,
     
     """
     Register a new user in the system.
-    Validates email and username uniqueness.
+    Email and username uniqueness is enforced by UNIQUE constraints: INSERT is sent
+    without checking first, and only when it fails one query finds the colliding fields.
     
     :param request: User registration data
     :param db: Database session
@@ -41,38 +48,43 @@ async def sign_up(request: schema.User,
     :return: Success response with user data or error
     :raises HTTPException: 409 if email or username already exists
     """
-    # Check for existing email
-    email = await UserDAO.get_user_email(db=db, user_email=str(request.email))
-    # Check for existing username
-    name = await UserDAO.get_user_name(db=db, user_name=str(request.name))
-
-    # Return conflict error if email exists
-    await CheckHTTP409Conflict(email, "Email already exists")
-
-    # Return conflict error if username exists
-    await CheckHTTP409Conflict(name, "This username already exists")
-
     print(f"   Original password from request: '{request.password}'")
     print(f"   Password length: {len(request.password)}")
     print(f"   Password type: {type(request.password)}")
 
     # Hash password and create new user
-    hash_password = password_helper.hash_password(request.password)
+    hash_password = await password_helper.hash_password_async(request.password)
     print(f"   Hashed password: {hash_password}")
     print(f"   Hashed password length: {len(hash_password)}")
 
-    new_user = models.User(name=request.name, 
-                           email=request.email, 
-                           password=hash_password,
-                           bio=request.bio,
-                           location=request.location,
-                           is_admin=False,
-                           deleted_by_admin=False)
-    db.add(new_user)
-
-    await db.commit()
-    await db.refresh(new_user)
+    user_values = {
+        "name": request.name,
+        "email": request.email,
+        "password": hash_password,
+        "bio": request.bio,
+        "location": request.location,
+        "is_admin": False,
+        "is_active": True,
+        "deleted_by_admin": False
+    }
+
+    try:
+        # One INSERT ... RETURNING gives every field of the response
+        new_user = await UserDAO.create_user(db=db, user_data=user_values)
+
+    except IntegrityError:
+        conflicts = await ValidationService.find_conflicts(model_class=models.User, values=user_values, db=db)
+
+        # Return conflict error if email exists
+        await CheckHTTP409Conflict("email" in conflicts, "Email already exists")
+
+        # Return conflict error if username exists
+        await CheckHTTP409Conflict("name" in conflicts, "This username already exists")
+
+        raise ValidationService.conflict_exception(model_class=models.User, conflicts=conflicts, values=user_values)
+
     print(f"   User created with ID: {new_user.id}")
+    username_index.upsert(new_user.id, new_user.name)
 
     user_data = await UserService.create_user_response(user=new_user)
 
@@ -113,11 +125,14 @@ async def login(request: schema.UserSignIn,
     )
 
 async def get_current_user(db: AsyncSession = Depends(get_db),
-                           token: str = Depends(get_token)) -> response_schemas.UserResponse:
+                           token: str = Depends(get_token)) -> response_schemas.AuthUserResponse:
     """
     Get current authenticated user from JWT token.
     Used as dependency in protected routes.
     
+    Only identity and permission fields are returned. They are served from
+    auth_user_cache when possible, so most requests don't query the database here.
+    
     :param db: Database session
     :param token: JWT token from request
 
@@ -125,31 +140,56 @@ async def get_current_user(db: AsyncSession = Depends(get_db),
     :raises HTTPException: 401 if token invalid or user not found
     """
     user_id = verify_token(token=token)
-    print("user_id in get current user: ", user_id)
     if not user_id:
         return {
             'message': "Token not found",
             'status_code': 401,
         }
-    user = await GeneralDAO.get_record_by_id(record_id=user_id,
-                                             model=models.User, 
-                                             db=db)
+
+    user_id = int(user_id)    # "sub" claim is a string
+    user = auth_user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    generation = auth_user_cache.generation
+    user_row = await UserDAO.get_auth_user(db=db, user_id=user_id)
     
-    if not user or not user.is_active:        
+    if not user_row or not user_row.is_active:        
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Account is deleted",
             headers={"WWW-Authenticate": "Bearer"})
     
-    user_data = await UserService.create_user_response(user=user)
+    user = response_schemas.AuthUserResponse(**user_row._mapping)
+    auth_user_cache.set(user, generation)
+
+    return user
+
+
+async def get_me(current_user: response_schemas.AuthUserResponse,
+                 db: AsyncSession) -> response_schemas.UserResponse:
+    """
+    Get full profile of current authenticated user.
 
-    return user_data
+    :param current_user: Authenticated user (get_current_user)
+    :param db: Database session
+    :return: User profile
+    :raises HTTPException: 404 if user not found
+    """
+    user = await GeneralDAO.get_record_by_id(record_id=current_user.id,
+                                             model=models.User,
+                                             db=db,
+                                             options=loader_profiles.USER_PROFILE)
+    await CheckHTTP404NotFound(founding_item=user, text="User not found")
+
+    return await UserService.create_user_response(user=user)
 
 
 async def update_me(user_id: int,
                     user_data: schema.UserUpdate,
                     current_user: schema.User,
-                    db: AsyncSession) -> response_schemas.UserUpdateResponse:
+                    db: AsyncSession,
+                    if_match: Optional[str] = None) -> response_schemas.UserUpdateResponse:
     """
     Update current authenticated user's profile.        
 
@@ -157,9 +197,11 @@ async def update_me(user_id: int,
     :param user_data: Data to update
     :param current_user: Authenticated user
     :param db: Database session
+    :param if_match: If-Match request header (ETag of GET /users/user/{id}), optional
 
     :return: Updated user data
-    :raises HTTPException: 404 if user not found or 403 if updating another user's profile
+    :raises HTTPException: 404 if user not found, 403 if updating another user's profile,
+                           409 if profile was changed concurrently, 412 if If-Match is not current
     """
 
     await CheckHTTP403FORBIDDEN_BOOL(condition=(user_id != current_user.id),
@@ -170,7 +212,8 @@ async def update_me(user_id: int,
     
     updating_user = await GeneralDAO.get_record_by_id(record_id=user_id,
                                                       model=models.User,
-                                                      db=db)
+                                                      db=db,
+                                                      options=loader_profiles.USER_PROFILE)
     
     await CheckHTTP404NotFound(founding_item=updating_user, text="User not found")
 
@@ -185,7 +228,11 @@ async def update_me(user_id: int,
     updated_user = await GeneralDAO.update_record(model=models.User,
                                                   record=updating_user,
                                                   update_data=user_data,
-                                                  db=db)
+                                                  db=db,
+                                                  expected_version=etag_helper.version_from_if_match(if_match, "user", user_id))
+    username_index.upsert(updated_user.id, updated_user.name)
+    auth_user_cache.invalidate(updated_user.id)
+    await response_cache.invalidate(user_tag(updated_user.id), author_tag(updated_user.id))
     
     user_data = await UserService.create_user_response(user=updated_user)
 
@@ -235,7 +282,8 @@ async def get_current_user_post(post_id: int,
     
     post = await PostDao.get_post_by_user_id(db=db, 
                                              user_id=current_user.id, 
-                                             post_id=post_id)
+                                             post_id=post_id,
+                                             options=loader_profiles.POST_WITH_AUTHOR)
     
     await CheckHTTP404NotFound(founding_item=post, text="Post not found")
     
@@ -248,20 +296,106 @@ async def get_current_user_post(post_id: int,
     )
 
 
-async def get_all_users(db: AsyncSession) -> response_schemas.UserListResponse:
+async def get_all_users(limit: int,
+                        cursor: Optional[str],
+                        name_prefix: Optional[str],
+                        created_from: Optional[datetime],
+                        created_to: Optional[datetime],
+                        is_admin: Optional[bool],
+                        db: AsyncSession) -> response_schemas.UserListResponse:
     """
-    Retrieve all users from the system with their items.
+    Retrieve one page of active users, filtered on the database side.
     
+    :param limit: Max number of users on the page
+    :param cursor: Cursor from previous page (None for the first page)
+    :param name_prefix: Filter by beginning of username
+    :param created_from: Filter by creation time (inclusive)
+    :param created_to: Filter by creation time (exclusive)
+    :param is_admin: Filter by admin flag
     :param db: Database session
-    :return: List of all users with their items
+    :return: Page of users and cursor for the next page
     :raises HTTPException: 404 if no users found
     """
-    users = await UserDAO.get_all_users(db=db)
+    users, next_cursor = await UserDAO.get_all_users(db=db,
+                                                     limit=limit,
+                                                     cursor=cursor,
+                                                     name_prefix=name_prefix,
+                                                     created_from=created_from,
+                                                     created_to=created_to,
+                                                     is_admin=is_admin)
     
     return response_schemas.UserListResponse(
         message="Users retrieved successfully",
         status_code=200,
-        data=users
+        data=users,
+        next_cursor=next_cursor
+    )
+
+async def get_user_with_posts(user_id: int,
+                              if_none_match: Optional[str],
+                              db: AsyncSession,
+                              message: str = "User retrieved successfully") -> response_schemas.UserWithPostsDataResponse:
+    """
+    Get user profile with posts, public. Serialized response is cached until user or user's posts change.
+    User's version is bumped by every change of user and of user's posts, so ETag is built from it alone.
+
+    :param user_id: User ID
+    :param if_none_match: If-None-Match request header
+    :param db: Database session
+    :param message: Message of the response
+    :return: JSON response with ETag or empty 304 response if client has current version
+    """
+    cache_key = f"user:{user_id}:{message}"
+    cached = await response_cache.get(cache_key, after_write=session_after_write(db))
+    if cached:
+        return cached.to_response(if_none_match)
+
+    generation = response_cache.generation
+    # Version is read before the data: if user changes in between, client gets newer data
+    # with older ETag and just downloads it once more - never older data with newer ETag
+    version = await UserDAO.get_user_version(db=db, user_id=user_id)
+    await CheckHTTP404NotFound(founding_item=version, text="User not found")
+
+    etag = etag_helper.make_etag("user", user_id, version)
+    if etag_helper.etag_matches(if_none_match, etag):
+        return etag_helper.not_modified(etag)
+
+    user_data = await UserDAO.get_user_with_posts(user_id=user_id, db=db)
+
+    user_response = response_schemas.UserWithPostsDataResponse(
+        message=message,
+        status_code=200,
+        data=user_data
+    )
+
+    return await response_cache.store(cache_key,
+                                      user_response,
+                                      tags=[user_tag(user_id)],
+                                      generation=generation,
+                                      etag=etag,
+                                      after_write=session_after_write(db),
+                                      from_replica=session_reads_replica(db))
+
+async def autocomplete_users(prefix: str,
+                             limit: int,
+                             db: AsyncSession) -> response_schemas.UserAutocompleteResponse:
+    """
+    Suggest active usernames starting with prefix.
+    Served from in-process username index, database is queried only while the index is cold.
+
+    :param prefix: Beginning of username (case-sensitive)
+    :param limit: Max number of suggestions
+    :param db: Database session (used only for fallback)
+    :return: Matching users ordered by name
+    """
+    users = username_index.search(prefix, limit)
+    if users is None:
+        users = await UserDAO.autocomplete_user_names(db=db, prefix=prefix, limit=limit)
+
+    return response_schemas.UserAutocompleteResponse(
+        message="Users found" if users else "No users found",
+        status_code=200,
+        data=[response_schemas.UserSuggestionResponse(id=user_id, name=name) for user_id, name in users]
     )
 
 async def delete_current_user(current_user: models.User,
@@ -280,15 +414,12 @@ async def delete_current_user(current_user: models.User,
             detail="Account is already deleted"
         )
     
-    # Soft delete user
-    deleted_user = await UserDAO.soft_delete_acc(db=db,
-                                                 user_id=current_user.id,
-                                                 deleted_by_admin=False,
-                                                 deletion_reason=None)
-    
-    # Delete user's posts (hard delete)
-    deleted_posts_count = await UserDAO.soft_delete_user_posts(db=db,
-                                                               user_id=current_user.id)
+    # Soft delete user and delete user's posts (hard delete) in one transaction
+    deleted_posts_count = await UserDAO.delete_account(db=db,
+                                                       user_id=current_user.id,
+                                                       deleted_by_admin=False,
+                                                       deletion_reason=None)
+    username_index.remove(current_user.id)
     
     return response_schemas.UserDeleteResponse(
         message=f"Your account has been deleted successfully. {deleted_posts_count} posts removed.",
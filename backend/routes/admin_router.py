@@ -1,5 +1,9 @@
 # routes/admin_router.py
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from database import models, response_schemas, schema
 from database.database import get_db
@@ -58,6 +62,57 @@ async def delete_user_admin(user_id: int,
                                                     deletion_reason=deletion_data.reason,
                                                     db=db)
 
+@admin_router.patch("/users/bulk/promote_to_admin")
+async def bulk_promote_users_to_admin(request: schema.AdminBulkUserIds,
+                                      db: AsyncSession = Depends(get_db),
+                                      admin: models.User = Depends(require_admin)) -> response_schemas.BulkUserOperationResponse:
+    """
+    Promote many users to admin status with one database update.
+    Only accessible by admins.
+
+    - **request**: List of user IDs
+
+    Returns result for every user ID (updated or why it was skipped).
+    """
+    return await admin_repository.bulk_update_admin_status(user_ids=request.user_ids,
+                                                           admin_user=admin,
+                                                           is_admin=True,
+                                                           db=db)
+
+@admin_router.patch("/users/bulk/demote_from_admin")
+async def bulk_demote_users_from_admin(request: schema.AdminBulkUserIds,
+                                       db: AsyncSession = Depends(get_db),
+                                       admin: models.User = Depends(require_admin)) -> response_schemas.BulkUserOperationResponse:
+    """
+    Demote many users from admin status with one database update.
+    Only accessible by admins.
+
+    - **request**: List of user IDs
+
+    Returns result for every user ID (updated or why it was skipped).
+    """
+    return await admin_repository.bulk_update_admin_status(user_ids=request.user_ids,
+                                                           admin_user=admin,
+                                                           is_admin=False,
+                                                           db=db)
+
+@admin_router.delete("/users/bulk/delete", status_code=200)
+async def bulk_delete_users_admin(deletion_data: schema.AdminBulkUserDelete,
+                                  db: AsyncSession = Depends(get_db),
+                                  admin: models.User = Depends(require_admin)) -> response_schemas.BulkUserOperationResponse:
+    """
+    Admin deletes many user accounts in one transaction.
+    Only accessible by admins.
+
+    - **deletion_data**: List of user IDs and deletion reason (required)
+
+    Returns result for every user ID with number of removed posts.
+    """
+    return await admin_repository.bulk_delete_users_admin(admin_user=admin,
+                                                          user_ids=deletion_data.user_ids,
+                                                          deletion_reason=deletion_data.reason,
+                                                          db=db)
+
 @admin_router.get("/users/deleted", status_code=200)
 async def get_deleted_users(db: AsyncSession = Depends(get_db),
                             admin: models.User = Depends(require_admin)) -> response_schemas.UserListResponse:
@@ -74,4 +129,91 @@ async def get_deleted_users(db: AsyncSession = Depends(get_db),
     
     return response_schemas.UserListResponse(message="Deleted users retrieved successfully",
                                              status_code=200,
-                                             data=deleted_users)
\ No newline at end of file
+                                             data=deleted_users)
+
+@admin_router.get("/db/pool", status_code=200)
+async def get_database_pool_stats() -> response_schemas.PoolStatsListResponse:
+    """
+    Get connection pool telemetry of the worker that handles this request.
+    Only accessible by admins.
+
+    Returns pool size, connections in use, utilisation and checkout wait times
+    for the primary database and every replica.
+    """
+    return await admin_repository.get_database_pool_stats()
+
+@admin_router.get("/cache", status_code=200)
+async def get_cache_stats() -> response_schemas.CacheStatsListResponse:
+    """
+    Get in-process cache telemetry of the worker that handles this request.
+    Only accessible by admins.
+
+    Returns size, TTL, hits, misses, hit ratio, evictions and invalidations
+    of the authenticated user cache.
+    """
+    return await admin_repository.get_cache_stats()
+
+@admin_router.get("/password-hash", status_code=200)
+async def get_password_hash_stats() -> response_schemas.PasswordHashStatsDataResponse:
+    """
+    Get password hashing pool telemetry of the worker that handles this request.
+    Only accessible by admins.
+
+    Returns threads, running and queued hashes, rejected (503) calls,
+    queue wait and average bcrypt time.
+    """
+    return await admin_repository.get_password_hash_stats()
+
+@admin_router.get("/posts/export", status_code=200)
+async def export_posts(since: Optional[datetime] = None,
+                       gzip: bool = False) -> StreamingResponse:
+    """
+    Export all posts as NDJSON stream (one JSON object per line), oldest first.
+    Only accessible by admins.
+
+    - **since**: Export only posts created at or after this time (for incremental pulls
+      use max "created_at" of previous export; boundary posts may repeat, dedupe by "id")
+    - **gzip**: Compress stream with gzip (posts.ndjson.gz)
+
+    Rows are read from server-side cursor, memory doesn't depend on table size.
+    """
+    body = admin_repository.export_posts_ndjson(since=since, compress=gzip)
+
+    if gzip:
+        return StreamingResponse(body,
+                                 media_type="application/gzip",
+                                 headers={"Content-Disposition": 'attachment; filename="posts.ndjson.gz"'})
+
+    return StreamingResponse(body,
+                             media_type="application/x-ndjson",
+                             headers={"Content-Disposition": 'attachment; filename="posts.ndjson"'})
+
+@admin_router.post("/users/import", status_code=200)
+async def import_users(request: Request,
+                       db: AsyncSession = Depends(get_db)) -> response_schemas.ImportResponse:
+    """
+    Bulk import of users from NDJSON request body (one JSON object per line).
+    Only accessible by admins. Send "Content-Encoding: gzip" for compressed body.
+
+    Line: {"name", "email", "password" or bcrypt "password_hash", "bio", "location", "is_admin", "created_at"}
+
+    Returns number of imported users and errors of rejected lines.
+    """
+    return await admin_repository.import_users(chunks=request.stream(),
+                                               compressed=request.headers.get("content-encoding") == "gzip",
+                                               db=db)
+
+@admin_router.post("/posts/import", status_code=200)
+async def import_posts(request: Request,
+                       db: AsyncSession = Depends(get_db)) -> response_schemas.ImportResponse:
+    """
+    Bulk import of posts from NDJSON request body (one JSON object per line).
+    Only accessible by admins. Send "Content-Encoding: gzip" for compressed body.
+
+    Line: {"content", "user_id" or "user_email" of author, "created_at"}
+
+    Returns number of imported posts and errors of rejected lines.
+    """
+    return await admin_repository.import_posts(chunks=request.stream(),
+                                               compressed=request.headers.get("content-encoding") == "gzip",
+                                               db=db)
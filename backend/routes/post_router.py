@@ -1,12 +1,13 @@
-from fastapi import Depends, APIRouter, Response
+from fastapi import Depends, APIRouter, Header, Response, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 from DAO.user_dao import UserDAO
 from context.request_context import RequestContext, get_request_context
 from database import response_schemas, schema
-from database.database import get_db
+from database.database import get_db, get_read_db
+from helpers.pagination_helper import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 
 from repository import post_repository
 from repository.user_repository import get_current_user
@@ -19,22 +20,72 @@ post_router = APIRouter(
 
 
 @post_router.get("/")
-async def get_posts_list(db: AsyncSession = Depends(get_db)) -> response_schemas.PostListResponse:
-    posts_list = await post_repository.get_all_posts(db=db)
+async def get_posts_list(cursor: Optional[str] = None,
+                         limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+                         db: AsyncSession = Depends(get_read_db)) -> response_schemas.PostListResponse:
+    """
+    Get feed of posts, newest first.
+    Public endpoint - no authentication required.
+
+    - **cursor**: Opaque cursor from "next_cursor" of previous page (skip for first page)
+    - **limit**: Number of posts on the page
+
+    Returns page of posts and "next_cursor" (null on the last page).
+    """
+    posts_list = await post_repository.get_all_posts(limit=limit,
+                                                     cursor=cursor,
+                                                     db=db)
     return posts_list
 
 
+@post_router.get("/search")
+async def search_posts(q: str = Query(..., min_length=1, max_length=200),
+                       cursor: Optional[str] = None,
+                       limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+                       db: AsyncSession = Depends(get_read_db)) -> response_schemas.PostListResponse:
+    """
+    Full-text search over posts, most relevant first.
+    Public endpoint - no authentication required.
+
+    - **q**: Words to search for (post must contain all of them)
+    - **cursor**: Opaque cursor from "next_cursor" of previous page (skip for first page)
+    - **limit**: Number of posts on the page
+
+    Returns page of posts and "next_cursor" (null on the last page).
+    """
+    return await post_repository.search_posts(search_query=q,
+                                              limit=limit,
+                                              cursor=cursor,
+                                              db=db)
+
+
 @post_router.get("/post/{post_id}")
 async def get_post(post_id: int,
-                   db: AsyncSession = Depends(get_db)) -> response_schemas.PostDetailResponse:
+                   if_none_match: Optional[str] = Header(default=None),
+                   db: AsyncSession = Depends(get_read_db)) -> response_schemas.PostDetailResponse:
+    """
+    Get post with author data.
+    Public endpoint - no authentication required.
+
+    Response has ETag header. Send it back in If-None-Match to get
+    empty 304 Not Modified while the post and its author are unchanged.
+    """
     return await post_repository.show_post(post_id=int(post_id),
+                                           if_none_match=if_none_match,
                                            db=db)
 
 @post_router.get("/{user_id}/posts")
 async def get_user_posts(user_id: int,
-                         db: AsyncSession = Depends(get_db)) -> response_schemas.UserWithPostsDataResponse:
+                         if_none_match: Optional[str] = Header(default=None),
+                         db: AsyncSession = Depends(get_read_db)) -> response_schemas.UserWithPostsDataResponse:
+    """
+    Get user with all their posts.
+    Public endpoint - no authentication required. Supports ETag / If-None-Match (304).
+    """
 
-    return await post_repository.get_user_with_posts(user_id=user_id, db=db)
+    return await post_repository.get_user_with_posts(user_id=user_id,
+                                                     if_none_match=if_none_match,
+                                                     db=db)
 
 @post_router.post("/create_post")
 async def add_post(request: schema.PostCreate,
@@ -44,14 +95,39 @@ async def add_post(request: schema.PostCreate,
                                              db=request_context.db)
 
 
+@post_router.post("/bulk")
+async def add_posts_bulk(request: schema.PostBulkCreate,
+                         request_context: RequestContext = Depends(get_request_context)) -> response_schemas.PostBulkCreateResponse:
+    """
+    Create many posts at once (for import and migration clients).
+    Requires valid JWT token.
+
+    - **request**: List of posts, up to MAX_BULK_POSTS items
+
+    Returns created posts with their ids and timestamps.
+    """
+    return await post_repository.create_posts_bulk(request=request,
+                                                   current_user=request_context.current_user,
+                                                   db=request_context.db)
+
+
 @post_router.patch("/update_post/{post_id}", status_code=200)
 async def update_post(post_id: int,
                       post_data: schema.PostUpdate,
+                      if_match: Optional[str] = Header(default=None),
                       request_context: RequestContext = Depends(get_request_context)) -> response_schemas.PostUpdateResponse:
+    """
+    Update own post.
+    Requires valid JWT token.
+
+    - **If-Match**: ETag from GET /posts/post/{post_id} (optional). Update fails with 412
+      if the post has been changed since, so concurrent edits don't overwrite each other.
+    """
     return await post_repository.update_post(post_id=post_id,
                                              user_id=request_context.current_user.id,
                                              post_data=post_data,
-                                             db=request_context.db)
+                                             db=request_context.db,
+                                             if_match=if_match)
 
 
 @post_router.delete("/delete_post/{post_id}")
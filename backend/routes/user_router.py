@@ -1,15 +1,17 @@
-from fastapi import Depends, APIRouter, Response
+from fastapi import Depends, APIRouter, Header, Response, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from datetime import datetime
 
 from DAO.user_dao import UserDAO
 from context.request_context import RequestContext, get_request_context
-from database.database import get_db
+from database.database import get_db, get_read_db
 from database import schema, models, response_schemas
 from helpers import exception_helper
+from helpers.pagination_helper import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 
 from repository.user_repository import get_current_user
-from repository import user_repository
+from repository import follow_repository, user_repository
 
 from DAO.general_dao import GeneralDAO
 
@@ -64,15 +66,49 @@ async def logout(response: Response) -> Dict[str, str]:
     return {'message': 'User logout'}
 
 @user_router.get("/")
-async def get_users_for_user(db: AsyncSession = Depends(get_db)) -> response_schemas.UserListResponse:
+async def get_users_for_user(cursor: Optional[str] = None,
+                             limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+                             name_prefix: Optional[str] = Query(default=None, min_length=1),
+                             created_from: Optional[datetime] = None,
+                             created_to: Optional[datetime] = None,
+                             is_admin: Optional[bool] = None,
+                             db: AsyncSession = Depends(get_read_db)) -> response_schemas.UserListResponse:
     """
-    Get list of all users in the system.
+    Get page of active users in the system, newest first.
     Public endpoint - no authentication required.
+
+    - **cursor**: Opaque cursor from "next_cursor" of previous page (skip for first page)
+    - **limit**: Number of users on the page
+    - **name_prefix**: Only users whose name starts with this text
+    - **created_from** / **created_to**: Registration time range
+    - **is_admin**: Only admins (true) or only regular users (false)
     
-    Returns list of all users with their items.
+    Returns page of users and "next_cursor" (null on the last page).
+    """
+
+    return await user_repository.get_all_users(limit=limit,
+                                               cursor=cursor,
+                                               name_prefix=name_prefix,
+                                               created_from=created_from,
+                                               created_to=created_to,
+                                               is_admin=is_admin,
+                                               db=db)
+
+@user_router.get("/autocomplete")
+async def autocomplete_users(prefix: str = Query(..., min_length=1, max_length=100),
+                             limit: int = Query(default=10, ge=1, le=50),
+                             db: AsyncSession = Depends(get_read_db)) -> response_schemas.UserAutocompleteResponse:
     """
+    Suggest active usernames starting with prefix (for mentions and search boxes).
+    Public endpoint - no authentication required.
 
-    return await user_repository.get_all_users(db=db)
+    - **prefix**: Beginning of username, case-sensitive
+    - **limit**: Max number of suggestions
+
+    Returns users ordered by name. Answered from memory, without database query.
+    """
+
+    return await user_repository.autocomplete_users(prefix=prefix, limit=limit, db=db)
 
 @user_router.delete("/me/delete", status_code=200)
 async def delete_me(request_context: RequestContext = Depends(get_request_context)) -> response_schemas.UserDeleteResponse:
@@ -90,27 +126,24 @@ async def delete_me(request_context: RequestContext = Depends(get_request_contex
 
 @user_router.get("/user/{user_id}", status_code=200)
 async def get_user(user_id: int,
-                   db: AsyncSession = Depends(get_db)) -> response_schemas.UserWithPostsDataResponse:
+                   if_none_match: Optional[str] = Header(default=None),
+                   db: AsyncSession = Depends(get_read_db)) -> response_schemas.UserWithPostsDataResponse:
     """
     Get user profile by ID.
     Public endpoint - no authentication required.
     
     - **user_id**: ID of user to retrieve (path parameter)
+    - **If-None-Match**: ETag of cached response - 304 Not Modified is returned if user hasn't changed
     
     Returns user data with their posts.
     """
 
-    # Use Response Schema to avoid recursion
-    user_data = await UserDAO.get_user_with_posts(user_id=user_id, db=db)
-    
-    return response_schemas.UserWithPostsDataResponse(
-        message="User retrieved successfully",
-        status_code=200,
-        data=user_data
-    )
+    return await user_repository.get_user_with_posts(user_id=user_id,
+                                                     if_none_match=if_none_match,
+                                                     db=db)
 
 @user_router.get("/me/", status_code=200)
-async def get_me(user_data: schema.User = Depends(get_current_user)) -> response_schemas.UserResponse:
+async def get_me(request_context: RequestContext = Depends(get_request_context)) -> response_schemas.UserResponse:
     """
     Get current authenticated user's profile.
     Requires valid JWT token.
@@ -118,16 +151,18 @@ async def get_me(user_data: schema.User = Depends(get_current_user)) -> response
     Returns current user's data (Current user with items).
     """
 
-    return user_data
+    return await user_repository.get_me(current_user=request_context.current_user, db=request_context.db)
 
 @user_router.patch("/me/update", status_code=200)
 async def update_me(user_data: schema.UserUpdate, 
+                    if_match: Optional[str] = Header(default=None),
                     request_context: RequestContext = Depends(get_request_context)) -> response_schemas.UserUpdateResponse:
     """
     Update current user using PATCH method.
     Requires valid JWT token.
 
     - **user_data**: Data to update (request body)
+    - **If-Match**: ETag from GET /users/user/{id} (optional), 412 if profile has been changed since
     - **request_context**: Request Context which use basic stuff:
         - **current_user**: Automatically injected authenticated user
         - **db**: Database session dependency
@@ -138,7 +173,8 @@ async def update_me(user_data: schema.UserUpdate,
     return await user_repository.update_me(user_id=request_context.current_user.id,
                                            user_data=user_data,
                                            current_user=request_context.current_user,
-                                           db=request_context.db)
+                                           db=request_context.db,
+                                           if_match=if_match)
 
 @user_router.get("/me/posts", status_code=200)
 async def get_current_user_posts(request_context: RequestContext = Depends(get_request_context)) -> response_schemas.UserWithPostsDataResponse:
@@ -173,4 +209,88 @@ async def get_current_user_post(post_id: int,
 
     return await user_repository.get_current_user_post(post_id=post_id,
                                                        current_user=request_context.current_user,
-                                                       db=request_context.db)
\ No newline at end of file
+                                                       db=request_context.db)
+
+
+@user_router.get("/me/timeline", status_code=200)
+async def get_home_timeline(cursor: Optional[str] = None,
+                            limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+                            request_context: RequestContext = Depends(get_request_context)) -> response_schemas.PostListResponse:
+    """
+    Get home timeline of the current user: own posts and posts of followed users, newest first.
+    Requires valid JWT token.
+
+    - **cursor**: Opaque cursor from "next_cursor" of previous page (skip for first page)
+    - **limit**: Number of posts on the page
+
+    Returns page of posts and "next_cursor" (null on the last page).
+    """
+
+    return await follow_repository.get_home_timeline(current_user=request_context.current_user,
+                                                     limit=limit,
+                                                     cursor=cursor,
+                                                     db=request_context.db)
+
+
+@user_router.post("/user/{user_id}/follow", status_code=200)
+async def follow_user(user_id: int,
+                      request_context: RequestContext = Depends(get_request_context)) -> response_schemas.BaseResponse:
+    """
+    Follow user. Their recent posts are added to your home timeline.
+    Requires valid JWT token.
+
+    - **user_id**: ID of user to follow (path parameter)
+    """
+
+    return await follow_repository.follow_user(user_id=user_id,
+                                               current_user=request_context.current_user,
+                                               db=request_context.db)
+
+
+@user_router.delete("/user/{user_id}/follow", status_code=200)
+async def unfollow_user(user_id: int,
+                        request_context: RequestContext = Depends(get_request_context)) -> response_schemas.BaseResponse:
+    """
+    Unfollow user. Their posts are removed from your home timeline.
+    Requires valid JWT token.
+
+    - **user_id**: ID of user to unfollow (path parameter)
+    """
+
+    return await follow_repository.unfollow_user(user_id=user_id,
+                                                 current_user=request_context.current_user,
+                                                 db=request_context.db)
+
+
+@user_router.get("/user/{user_id}/followers", status_code=200)
+async def get_followers(user_id: int,
+                        cursor: Optional[str] = None,
+                        limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+                        db: AsyncSession = Depends(get_read_db)) -> response_schemas.FollowListResponse:
+    """
+    Get page of user's followers, most recent first.
+    Public endpoint - no authentication required.
+    """
+
+    return await follow_repository.get_follows(user_id=user_id,
+                                               direction="followers",
+                                               limit=limit,
+                                               cursor=cursor,
+                                               db=db)
+
+
+@user_router.get("/user/{user_id}/following", status_code=200)
+async def get_following(user_id: int,
+                        cursor: Optional[str] = None,
+                        limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+                        db: AsyncSession = Depends(get_read_db)) -> response_schemas.FollowListResponse:
+    """
+    Get page of users followed by user, most recent first.
+    Public endpoint - no authentication required.
+    """
+
+    return await follow_repository.get_follows(user_id=user_id,
+                                               direction="following",
+                                               limit=limit,
+                                               cursor=cursor,
+                                               db=db)
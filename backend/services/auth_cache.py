@@ -0,0 +1,112 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from config import settings
+from database import response_schemas
+
+"""
+In-process cache of authenticated users for get_current_user().
+
+Every protected request needs only id, name, is_active and is_admin of the
+token owner (response_schemas.AuthUserResponse). The projection is kept
+in memory of every worker: a hit costs a dict lookup and no database round trip.
+
+Entries live AUTH_USER_CACHE_TTL seconds, least recently used ones are evicted
+above AUTH_USER_CACHE_MAX_SIZE. Write paths that change the projection
+(profile update, admin status, account deletion) invalidate the user after commit.
+Other worker processes see the change when their entry expires, so TTL is
+the longest time a demoted or deleted user keeps access there.
+
+Usage Example:
+---------------
+- generation = auth_user_cache.generation
+- user = auth_user_cache.get(user_id)                       # None - miss
+- auth_user_cache.set(user, generation)                     # After loading from DB
+- auth_user_cache.invalidate(user_id)                       # After commit
+- auth_user_cache.stats()
+"""
+
+
+class AuthUserCache:
+    """TTL + LRU cache of AuthUserResponse by user ID, safe for one event loop"""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl    # 0 - cache disabled
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[float, response_schemas.AuthUserResponse]]" = OrderedDict()
+        self._generation = 0    # Incremented by every invalidation
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Take it before loading user from DB and pass to set()"""
+        return self._generation
+
+    def get(self, user_id: int) -> Optional[response_schemas.AuthUserResponse]:
+        """
+        Get cached user.
+
+        :param user_id: ID from access token
+        :return: Cached projection or None if missing or expired
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user: response_schemas.AuthUserResponse, generation: int) -> None:
+        """
+        Cache user loaded from database.
+        Skipped if something was invalidated since the load started - the row may be older than that write.
+
+        :param user: Projection of active user
+        :param generation: Value of "generation" taken before the load
+        """
+        if self.ttl <= 0 or generation != self._generation:
+            return
+
+        self._entries[user.id] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(user.id)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *user_ids: int) -> None:
+        """Drop users whose name, admin status or active flag has been changed"""
+        self._generation += 1
+        for user_id in user_ids:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of cache size and hit/miss counters of this worker"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+auth_user_cache = AuthUserCache(ttl=settings.AUTH_USER_CACHE_TTL, max_size=settings.AUTH_USER_CACHE_MAX_SIZE)
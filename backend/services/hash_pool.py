@@ -0,0 +1,184 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette import status
+
+from config import settings
+
+"""
+Bounded worker pool for password hashing.
+
+bcrypt takes tens to hundreds of milliseconds of CPU per call. Run inline it
+blocks the event loop of the worker; run in the default thread pool it
+competes with every other run_in_threadpool() call. PasswordHashPool gives
+bcrypt its own threads (bcrypt releases the GIL, so they hash in parallel)
+and limits how much work may wait for them.
+
+A call is admitted only while in-flight + queued hashes are below
+PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE. Otherwise it is rejected at
+once with 503 and Retry-After: under a login burst the client is told to come
+back instead of waiting seconds in a queue it would time out in anyway.
+Background work (user import) calls run(..., wait=True): it waits for a free
+slot instead of failing, and takes slots only as they are released.
+
+Usage Example:
+---------------
+- hashed = await password_hash_pool.run(password_helper.hash_password, "secret")
+- hashed = await password_hash_pool.run(password_helper.hash_password, "secret", wait=True)   # Never 503
+- password_hash_pool.stats()
+- password_hash_pool.shutdown()                              # App shutdown
+"""
+
+
+class PasswordHashPool:
+    """Dedicated thread pool with admission limit and queue metrics, shared by all event loops of the process"""
+
+    RETRY_AFTER = "1"   # Seconds, sent with 503
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()   # Counters are changed by event loop and by worker threads
+        self.pending = 0    # Admitted and not finished: running + queued
+        self.running = 0
+        self.peak_pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()   # run(wait=True) callers
+        self.wait_total = 0.0   # Seconds spent in queue
+        self.wait_max = 0.0
+        self.run_total = 0.0    # Seconds spent hashing
+
+    @property
+    def capacity(self) -> int:
+        """Max number of admitted calls"""
+        return self.workers + self.max_queue
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _timed(self, func: Callable[..., Any], submitted: float, args: tuple) -> Any:
+        """Runs in worker thread: records queue wait and hashing time"""
+        started = time.perf_counter()
+        waited = started - submitted
+        with self._lock:
+            self.running += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.run_total += time.perf_counter() - started
+
+    def _wake_next_waiter(self) -> None:
+        """Let the oldest run(wait=True) caller retry admission. Call with the lock held"""
+        while self._waiters:
+            loop, waiter = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+                return
+            except RuntimeError:
+                continue    # Its event loop is closed
+
+    def _release(self, _future) -> None:
+        # Called when the thread finishes or a queued call is cancelled (client went away)
+        with self._lock:
+            self.pending -= 1
+            self._wake_next_waiter()
+
+    async def _admit(self, wait: bool) -> None:
+        """Take a slot, or raise 503 (wait=False) / wait until one is released (wait=True)"""
+        while True:
+            with self._lock:
+                if self.pending < self.capacity:
+                    self.pending += 1
+                    self.submitted += 1
+                    self.peak_pending = max(self.peak_pending, self.pending)
+                    return
+
+                if not wait:
+                    self.rejected += 1
+                    raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                        detail="Server is busy, try again later",
+                                        headers={"Retry-After": self.RETRY_AFTER})
+
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    try:
+                        self._waiters.remove((loop, waiter))
+                    except ValueError:
+                        self._wake_next_waiter()    # Was woken already - pass the released slot on
+                raise
+
+    async def run(self, func: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+        """
+        Run CPU-bound hashing function in the pool.
+
+        :param func: password_helper.hash_password / verify_password
+        :param args: Arguments of the function
+        :param wait: Wait for a free slot instead of 503 (background work, e.g. import)
+        :return: Result of the function
+        :raises HTTPException: 503 if the pool and its queue are full (only if wait is False)
+        """
+        await self._admit(wait=wait)
+
+        try:
+            future = self._get_executor().submit(self._timed, func, time.perf_counter(), args)
+        except BaseException:
+            self._release(None)
+            raise
+
+        # Slot is released when the thread is done, not when the awaiting request is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Drop queued calls and stop threads (running hashes are finished in background)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of queue depth and timing of this worker process"""
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.running,
+                "queued": max(self.pending - self.running, 0),
+                "waiting": len(self._waiters),
+                "peak_pending": self.peak_pending,
+                "utilisation": round(self.pending / self.capacity, 3),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_avg_ms": round(self.wait_total / started * 1000, 3) if started else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "hash_avg_ms": round(self.run_total / self.completed * 1000, 3) if self.completed else 0.0,
+            }
+
+
+password_hash_pool = PasswordHashPool(workers=settings.PASSWORD_HASH_WORKERS or min(os.cpu_count() or 1, 4),
+                                      max_queue=settings.PASSWORD_HASH_MAX_QUEUE)
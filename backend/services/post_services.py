@@ -1,4 +1,6 @@
-from typing import List
+import json
+from typing import List, Sequence
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from database import models
 from database import response_schemas
@@ -9,24 +11,11 @@ class PostService:
     """
 
     @staticmethod
-    async def get_formated_posts(items: List) -> response_schemas.PostResponse:
+    async def get_formated_posts(rows: Sequence[Row]) -> List[response_schemas.PostWithUserResponse]:
         """
-        Transform list of SQLAlchemy Post models into API response format.
+        Map feed rows (loader_profiles.POST_WITH_AUTHOR_COLUMNS) straight into API response format.
         """
-
-        posts_list = []
-        for item in items:
-            item_data = response_schemas.PostWithUserResponse(
-                id=item.id,
-                content=item.content,
-                created_at=item.created_at,
-                user_id=item.user.id,
-                user_name=item.user.name,
-                user_email=item.user.email
-            )
-            posts_list.append(item_data)
-
-        return posts_list
+        return [response_schemas.PostWithUserResponse(**row._mapping) for row in rows]
     
     @staticmethod
     async def create_post_detail_response(post: models.Post) -> response_schemas.PostDetailResponse:
@@ -38,3 +27,19 @@ class PostService:
             user_name=post.user.name,
             user_email=post.user.email
         )
+
+    @staticmethod
+    def posts_to_ndjson(rows: Sequence[Row]) -> bytes:
+        """
+        Serialize post rows (id, user_id, content, created_at) to NDJSON - one JSON object per line.
+        """
+        lines = [
+            json.dumps({
+                "id": row.id,
+                "user_id": row.user_id,
+                "content": row.content,
+                "created_at": row.created_at.isoformat()
+            }, ensure_ascii=False)
+            for row in rows
+        ]
+        return ("\n".join(lines) + "\n").encode("utf-8")
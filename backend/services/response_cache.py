@@ -0,0 +1,536 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from config import settings
+from helpers import etag_helper
+
+"""
+Response cache for public GET endpoints.
+
+Serialized JSON body (and ETag) of a response is stored under a key built from
+the endpoint and its parameters. A hit is returned as raw bytes - no database
+query, no Pydantic validation and serialization.
+
+Every entry has tags - IDs of rows the response was built from. Write paths
+invalidate tags after commit, so entries don't wait for TTL to go stale:
+- "post:{id}"     - post content / existence (post detail, feed pages with the post)
+- "user:{id}"     - user profile with posts and counters (/users/user/{id}, /posts/{id}/posts)
+- "author:{id}"   - user's name and email shown next to posts (post detail, feed pages)
+- "feed:head"     - first feed page (new posts appear only there, cursor pages are stable)
+- "feed"          - all feed pages (posts inserted with old timestamps, e.g. import)
+
+Backends (RESPONSE_CACHE_BACKEND):
+- "memory" - LRU dict in every worker. Invalidation reaches only the worker that wrote,
+             others serve old entries until RESPONSE_CACHE_TTL. For one worker / development.
+- "redis"  - Shared cache in Redis (or any server speaking Redis protocol: KeyDB, Dragonfly, Valkey).
+             Tag is a set of keys, invalidation deletes keys of the set.
+- "none"   - Cache disabled.
+Backend errors are logged and treated as a miss - the cache never fails a request.
+
+Stale stores: request may read rows, another request (in any worker) commits and
+invalidates, and only then the first one stores its body. Invalidation leaves a
+mark with its time on every tag (shared in Redis), and store() drops the entry it
+has just written if one of its tags was invalidated after "generation" (the time
+the database read started). Marks are written before tag sets are read, so a store
+either is found in the tag set or sees the mark.
+
+Read replicas (read-your-writes):
+- Caller who has just written reads from the primary (get_read_db). The cache is
+  skipped for that caller entirely, both get and store - a shared entry may be older than the write.
+- Response read from a replica is not stored if any of its tags was invalidated
+  less than READ_YOUR_WRITES_WINDOW seconds before the read: the replica may not have
+  the write yet, and the stale body would outlive the lag by the whole RESPONSE_CACHE_TTL.
+
+Usage Example:
+---------------
+- cached = await response_cache.get(key, after_write=session_after_write(db))
+- if cached: return cached.to_response(if_none_match)
+- generation = response_cache.generation                     # Before reading the database
+- return await response_cache.store(key, model, tags, generation, etag,
+                                    after_write=session_after_write(db), from_replica=session_reads_replica(db))
+- await response_cache.invalidate(post_tag(post_id), user_tag(user_id))   # After commit
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def author_tag(user_id: int) -> str:
+    return f"author:{user_id}"
+
+
+FEED_TAG = "feed"
+FEED_HEAD_TAG = "feed:head"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Serialized response: JSON body and ETag (if endpoint has one)"""
+    body: bytes
+    etag: Optional[str] = None
+
+    def encode(self) -> bytes:
+        """One value for backend: ETag line, then body"""
+        return (self.etag or "").encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, value: bytes) -> "CachedResponse":
+        etag, _, body = value.partition(b"\n")
+        return cls(body=body, etag=etag.decode() or None)
+
+    def to_response(self, if_none_match: Optional[str] = None) -> Response:
+        """JSON response from stored bytes, or 304 if client has this ETag"""
+        if self.etag is None:
+            return Response(content=self.body, media_type="application/json")
+
+        if etag_helper.etag_matches(if_none_match, self.etag):
+            return etag_helper.not_modified(self.etag)
+
+        return Response(content=self.body,
+                        media_type="application/json",
+                        headers={"ETag": self.etag, "Cache-Control": etag_helper.CACHE_CONTROL})
+
+
+class MemoryCacheBackend:
+    """TTL + LRU dict with tag index, safe for one event loop"""
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._invalidated_at: Dict[str, float] = {}   # Tag -> time.time() of last invalidation (mark)
+        self.evictions = 0
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry[0] < time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str]) -> None:
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    async def invalidate(self, tags: Iterable[str], invalidated_at: float, mark_ttl: float) -> int:
+        removed = 0
+        for tag in tags:
+            self._invalidated_at[tag] = invalidated_at
+            for key in self._keys_by_tag.pop(tag, ()):
+                removed += self._remove(key)
+
+        # Drop expired marks, so dict doesn't grow forever
+        if len(self._invalidated_at) > self.max_entries:
+            expired = invalidated_at - mark_ttl
+            for tag in [tag for tag, marked_at in self._invalidated_at.items() if marked_at < expired]:
+                del self._invalidated_at[tag]
+
+        return removed
+
+    async def last_invalidation(self, tags: Iterable[str]) -> float:
+        return max((self._invalidated_at.get(tag, 0.0) for tag in tags), default=0.0)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._invalidated_at.clear()
+
+    async def close(self) -> None:
+        await self.clear()
+
+    def _remove(self, key: str) -> int:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return 0
+
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+        return 1
+
+
+class RedisProtocolError(Exception):
+    """Error reply (-ERR ...) or broken response from Redis server"""
+
+
+class RedisConnection:
+    """One connection speaking RESP2. Commands are pipelined: written together, replies read in order"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int, password: Optional[str], db: int) -> "RedisConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        connection = cls(reader, writer)
+
+        setup = []
+        if password:
+            setup.append(("AUTH", password))
+        if db:
+            setup.append(("SELECT", str(db)))
+        try:
+            if setup:
+                await connection.execute(*setup)
+        except BaseException:
+            # Wrong password / db, timeout - the connection is never handed out, don't leak the socket
+            await connection.close()
+            raise
+
+        return connection
+
+    @staticmethod
+    def _encode(command: Tuple[Any, ...]) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for argument in command:
+            if not isinstance(argument, bytes):
+                argument = str(argument).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(argument), argument))
+
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Redis connection closed")
+
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise RedisProtocolError(payload.decode(errors="replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+
+        raise RedisProtocolError(f"Unexpected reply: {line!r}")
+
+    async def execute(self, *commands: Tuple[Any, ...]) -> List[Any]:
+        """
+        Send commands in one write and read all replies.
+        Every reply is read even if one of them is an error, so the connection stays usable.
+        """
+        self._writer.write(b"".join(self._encode(command) for command in commands))
+        await self._writer.drain()
+
+        replies, error = [], None
+        for _ in commands:
+            try:
+                replies.append(await self._read_reply())
+            except RedisProtocolError as reply_error:
+                error = error or reply_error
+                replies.append(None)
+
+        if error:
+            raise error
+        return replies
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+
+class RedisCacheBackend:
+    """
+    Cache in Redis. Entry is a string key with PX expiry, tag is a set of entry keys.
+    Connections are opened lazily and reused (at most "pool_size" at the same time).
+    """
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str, pool_size: int, timeout: float):
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = parsed.password
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._prefix = prefix
+        self._timeout = timeout
+        self._idle: List[RedisConnection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    def size(self) -> Optional[int]:
+        return None   # Unknown without a round trip
+
+    async def _execute(self, *commands: Tuple[Any, ...]) -> List[Any]:
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(
+                        RedisConnection.open(self._host, self._port, self._password, self._db),
+                        timeout=self._timeout
+                    )
+                replies = await asyncio.wait_for(connection.execute(*commands), timeout=self._timeout)
+
+            except RedisProtocolError:
+                if connection is not None:
+                    self._idle.append(connection)   # Error reply, connection is in sync
+                raise
+
+            except BaseException:
+                # Timeout or broken connection - replies may be still on the way, don't reuse it
+                if connection is not None:
+                    await connection.close()
+                raise
+
+            self._idle.append(connection)
+            return replies
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}tag:{tag}"
+
+    def _mark_key(self, tag: str) -> str:
+        return f"{self._prefix}invalidated:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self._execute(("GET", self._key(key))))[0]
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str]) -> None:
+        ttl_ms = max(int(ttl * 1000), 1)
+        commands = [("SET", self._key(key), value, "PX", ttl_ms)]
+        for tag in tags:
+            # Tag set lives as long as the newest entry in it
+            commands.append(("SADD", self._tag_key(tag), self._key(key)))
+            commands.append(("PEXPIRE", self._tag_key(tag), ttl_ms))
+
+        await self._execute(*commands)
+
+    async def delete(self, key: str) -> None:
+        await self._execute(("DEL", self._key(key)))
+
+    async def invalidate(self, tags: Iterable[str], invalidated_at: float, mark_ttl: float) -> int:
+        tags = list(tags)
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+
+        mark_ms = max(int(mark_ttl * 1000), 1)
+        commands = [("SET", self._mark_key(tag), repr(invalidated_at), "PX", mark_ms) for tag in tags]   # Marks first
+        # Tag sets are read and deleted atomically: SADD of a concurrent store lands either
+        # before (entry is deleted below) or after (in a new set, found by the next invalidation)
+        commands += [("MULTI",), *(("SMEMBERS", tag_key) for tag_key in tag_keys), ("DEL", *tag_keys), ("EXEC",)]
+        members = (await self._execute(*commands))[-1][:len(tag_keys)]
+
+        keys = {key for tag_members in members for key in tag_members or ()}
+        if keys:
+            await self._execute(("DEL", *keys))
+        return len(keys)
+
+    async def last_invalidation(self, tags: Iterable[str]) -> float:
+        mark_keys = [self._mark_key(tag) for tag in tags]
+        if not mark_keys:
+            return 0.0
+
+        marks = (await self._execute(("MGET", *mark_keys)))[0]
+        return max((float(mark) for mark in marks if mark is not None), default=0.0)
+
+    async def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            cursor, keys = (await self._execute(("SCAN", cursor, "MATCH", f"{self._prefix}*", "COUNT", 1000)))[0]
+            if keys:
+                await self._execute(("DEL", *keys))
+            if cursor == b"0":
+                break
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._idle.pop().close()
+
+
+class ResponseCache:
+    """Backend with hit/miss counters and error handling. Disabled if backend is None"""
+
+    def __init__(self, backend: Optional[Any], ttl: float, replica_lag: float = 0):
+        self.backend = backend
+        self.ttl = ttl
+        self.replica_lag = replica_lag    # Seconds replica reads of invalidated tags are not stored (0 - no replicas)
+        self.mark_ttl = ttl + replica_lag    # Invalidation marks must outlive any request that read before the write
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    @property
+    def backend_name(self) -> str:
+        return self.backend.name if self.backend is not None else "none"
+
+    @property
+    def generation(self) -> float:
+        """Time the database read starts: take it before reading and pass to store()"""
+        return time.time()
+
+    async def get(self, key: str, after_write: bool = False) -> Optional[CachedResponse]:
+        """
+        Get stored response.
+
+        :param key: Endpoint and parameters, e.g. "post:5"
+        :param after_write: Caller has just written (read-your-writes) - cache is skipped
+        :return: Stored response or None (miss, disabled, skipped or backend error)
+        """
+        if not self.enabled or after_write:
+            return None
+
+        try:
+            value = await self.backend.get(key)
+        except Exception as error:
+            self.errors += 1
+            logger.warning("Response cache get failed: %r", error)
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return CachedResponse.decode(value)
+
+    async def store(self,
+                    key: str,
+                    model: BaseModel,
+                    tags: Iterable[str],
+                    generation: int,
+                    etag: Optional[str] = None,
+                    if_none_match: Optional[str] = None,
+                    after_write: bool = False,
+                    from_replica: bool = False) -> Response:
+        """
+        Serialize response model once, store the bytes and return them as the response.
+        Entry is dropped right after SET if one of its tags was invalidated (by any worker)
+        since "generation" was taken - the model may be built from rows older than that write.
+        For a replica read the window starts "replica_lag" seconds earlier. Not stored at all
+        for caller who has just written.
+
+        :param key: Cache key
+        :param model: Response model
+        :param tags: Tags of rows the response was built from
+        :param generation: Value of "generation" taken before the database was read (read start time)
+        :param etag: ETag of the response (optional)
+        :param if_none_match: If-None-Match request header (answered with 304 if it matches etag)
+        :param after_write: Caller has just written (read-your-writes)
+        :param from_replica: Model was read from a replica
+        :return: JSON response
+        """
+        cached = CachedResponse(body=model.model_dump_json().encode(), etag=etag)
+
+        if self.enabled and not after_write:
+            valid_since = generation - (self.replica_lag if from_replica else 0)
+            try:
+                tags = tuple(tags)
+                # SET before the mark check: an invalidation that the check misses reads the tag set later
+                await self.backend.set(key, cached.encode(), self.ttl, tags)
+                if await self.backend.last_invalidation(tags) >= valid_since:
+                    await self.backend.delete(key)
+            except Exception as error:
+                self.errors += 1
+                logger.warning("Response cache set failed: %r", error)
+
+        return cached.to_response(if_none_match)
+
+    async def invalidate(self, *tags: str) -> None:
+        """Drop entries built from changed rows. Call after commit"""
+        if not self.enabled or not tags:
+            return
+
+        try:
+            self.invalidations += await self.backend.invalidate(tags, invalidated_at=time.time(), mark_ttl=self.mark_ttl)
+        except Exception as error:
+            self.errors += 1
+            logger.warning("Response cache invalidation failed: %r", error)
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss counters of this worker"""
+        lookups = self.hits + self.misses
+        return {
+            "size": self.backend.size() if self.backend is not None else 0,
+            "max_size": getattr(self.backend, "max_entries", None),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+def create_backend(name: str) -> Optional[Any]:
+    """Backend by RESPONSE_CACHE_BACKEND name, None - cache disabled"""
+    if name == "memory":
+        return MemoryCacheBackend(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if name == "redis":
+        return RedisCacheBackend(url=settings.RESPONSE_CACHE_REDIS_URL,
+                                 prefix=settings.RESPONSE_CACHE_PREFIX,
+                                 pool_size=settings.RESPONSE_CACHE_REDIS_POOL_SIZE,
+                                 timeout=settings.RESPONSE_CACHE_REDIS_TIMEOUT)
+    if name == "none":
+        return None
+
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {name}")
+
+
+response_cache = ResponseCache(backend=create_backend(settings.RESPONSE_CACHE_BACKEND),
+                               ttl=settings.RESPONSE_CACHE_TTL,
+                               replica_lag=settings.READ_YOUR_WRITES_WINDOW if settings.DATABASE_REPLICA_URLS else 0)
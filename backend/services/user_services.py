@@ -36,7 +36,10 @@ class UserService:
                 is_active=user.is_active,
                 deleted_by_admin=user.deleted_by_admin,
                 deletion_reason=user.deletion_reason,  
-                deleted_at=user.deleted_at,                       
+                deleted_at=user.deleted_at,
+                post_count=user.post_count,
+                follower_count=user.follower_count,
+                following_count=user.following_count,
             )
             users_list.append(user_data)
 
@@ -57,7 +60,10 @@ class UserService:
             is_active=user.is_active,
             deleted_by_admin=user.deleted_by_admin,
             deletion_reason=user.deletion_reason,
-            deleted_at=user.deleted_at
+            deleted_at=user.deleted_at,
+            post_count=user.post_count,
+            follower_count=user.follower_count,
+            following_count=user.following_count
     )
     
     @staticmethod
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from DAO.user_dao import UserDAO
+
+"""
+In-process username index for autocomplete.
+
+Sorted list of active usernames in memory of every worker. Prefix lookup is
+a binary search plus a slice, so it costs microseconds and doesn't touch
+the database.
+
+The index is loaded at startup and kept up to date by the repository layer
+(sign up, profile update, account deletion). Changes made by other worker
+processes are picked up by periodic reload (USERNAME_INDEX_REFRESH_INTERVAL).
+Until the first load finishes the index is "cold" and search() returns None,
+so the caller falls back to the database query.
+
+Usage Example:
+---------------
+- await username_index.rebuild(SessionLocal)
+- username_index.upsert(user_id, name)
+- username_index.remove(user_id)
+- username_index.search("jo", limit=10)  ->  [(3, "john"), (8, "joseph")] or None if cold
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class UsernameIndex:
+    """Sorted usernames with ID lookup, safe for one event loop"""
+
+    def __init__(self):
+        self._names: List[str] = []              # Sorted by code points, like SQLite BINARY collation
+        self._ids_by_name: Dict[str, int] = {}
+        self._names_by_id: Dict[int, str] = {}
+        self._ready = False
+        self._pending: Optional[List[Tuple[int, Optional[str]]]] = None   # Changes made while rebuild() is loading
+        self._rebuild_lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, prefix: str, limit: int) -> Optional[List[Tuple[int, str]]]:
+        """
+        Find usernames starting with prefix (case-sensitive).
+
+        :param prefix: Beginning of username
+        :param limit: Max number of results
+        :return: (user ID, name) pairs in name order, None if index is not loaded yet
+        """
+        if not self._ready:
+            return None
+
+        start = bisect_left(self._names, prefix)
+        results = []
+        for name in self._names[start:start + limit]:
+            if not name.startswith(prefix):
+                break
+            results.append((self._ids_by_name[name], name))
+
+        return results
+
+    def upsert(self, user_id: int, name: str) -> None:
+        """Add new user or rename existing one"""
+        if self._pending is not None:
+            self._pending.append((user_id, name))
+        self._apply(user_id, name)
+
+    def remove(self, user_id: int) -> None:
+        """Remove deleted user, unknown IDs are ignored"""
+        if self._pending is not None:
+            self._pending.append((user_id, None))
+        self._apply(user_id, None)
+
+    def _apply(self, user_id: int, name: Optional[str]) -> None:
+        old_name = self._names_by_id.pop(user_id, None)
+        if old_name is not None:
+            self._ids_by_name.pop(old_name, None)
+            position = bisect_left(self._names, old_name)
+            if position < len(self._names) and self._names[position] == old_name:
+                del self._names[position]
+
+        if name is None:
+            return
+
+        # Name may still belong to another ID if index missed its change - last write wins
+        stale_id = self._ids_by_name.get(name)
+        if stale_id is not None:
+            self._names_by_id.pop(stale_id, None)
+        else:
+            insort(self._names, name)
+
+        self._ids_by_name[name] = user_id
+        self._names_by_id[user_id] = name
+
+    async def rebuild(self, session_factory: async_sessionmaker) -> None:
+        """
+        Replace index content with active users from database.
+        Changes made by this worker during loading are replayed on top of the loaded data.
+
+        :param session_factory: Sessions of the primary database (replicas may lag)
+        """
+        async with self._rebuild_lock:
+            self._pending = []
+            try:
+                async with session_factory() as db:
+                    rows = await UserDAO.get_active_user_names(db=db)
+
+                names_by_id = {user_id: name for user_id, name in rows}
+                self._ids_by_name = {name: user_id for user_id, name in names_by_id.items()}
+                self._names_by_id = names_by_id
+                self._names = sorted(self._ids_by_name)
+
+                for user_id, name in self._pending:
+                    self._apply(user_id, name)
+                self._ready = True
+            finally:
+                self._pending = None
+
+    async def refresh_periodically(self, session_factory: async_sessionmaker, interval: float) -> None:
+        """
+        Reload index every "interval" seconds until cancelled.
+        Errors are logged and the old index is kept.
+
+        :param session_factory: Same as in rebuild()
+        :param interval: Seconds between reloads
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild(session_factory)
+            except Exception:
+                logger.exception("Username index reload failed")
+
+
+username_index = UsernameIndex()
@@ -1,5 +1,5 @@
-from typing import Type, Any, Dict, Optional
-from sqlalchemy import exists, select
+from typing import Type, Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import and_, exists, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
@@ -28,6 +28,11 @@ class ValidationService:
         )
     
     If a duplicate record is found during validation, HTTPException(409) is raised.
+    
+    All fields of a record are checked with ONE query (find_conflicts()).
+    Fields from unique_fields must also have a UNIQUE constraint in the database:
+    the constraint is the final arbiter, write paths may skip the pre-check and
+    call find_conflicts() only after IntegrityError to tell the client which field collides.
     """
 
     VALIDATION_RULES = {
@@ -57,6 +62,7 @@ class ValidationService:
     - unique_fields: Field must be unique across the entire table.
                     Example: email, username.
                     Check: no two records with the same value.
+                    !Must be backed by UNIQUE constraint in the database!
     
     - required_fields: Field cannot be None/empty.
                       Used when creating a new record.
@@ -150,12 +156,57 @@ class ValidationService:
         result = await db.execute(query)
         return result.scalar()
 
+    @classmethod
+    async def find_existing_values(cls,
+                                   model_class: Type,
+                                   values: Dict[str, Iterable[Any]],
+                                   db: AsyncSession) -> Dict[str, Set[Any]]:
+        """
+        Batch version of check_field_duplicates() for imports.
+        
+        For every globally unique field of the model (unique_fields in VALIDATION_RULES)
+        runs ONE query "SELECT field FROM table WHERE field IN (...)" instead of
+        one query per record.
+        
+        Args:
+            model_class (Type): SQLAlchemy model class (User, Post, etc.).
+            values (Dict[str, Iterable[Any]]): Field name -> values of the batch.
+                                               Fields that are not unique_fields are ignored.
+            db (AsyncSession): Async SQLAlchemy session for database access.
+        
+        Returns:
+            Dict[str, Set[Any]]: Field name -> values that already exist in the database.
+        
+        Example:
+            existing = await ValidationService.find_existing_values(
+                model_class=User,
+                values={"email": ["a@example.com", "b@example.com"], "name": ["alice", "bob"]},
+                db=db_session
+            )
+            # Returns: {"email": {"a@example.com"}, "name": set()}
+        """
+        rules = cls.get_validation_rules(model_class)
+        existing = {}
+
+        for field in rules.get("unique_fields", []):
+            field_values = {value for value in values.get(field, []) if value is not None}
+            if not field_values:
+                existing[field] = set()
+                continue
+
+            column = getattr(model_class, field)
+            result = await db.execute(select(column).where(column.in_(field_values)))
+            existing[field] = set(result.scalars().all())
+
+        return existing
+
     @classmethod
     async def validate_update(cls,
                               model_class: Type,
                               record: Any,
                               update_data: dict,
-                              db: AsyncSession) -> None:
+                              db: AsyncSession,
+                              check_unique_fields: bool = True) -> None:
         """
         Main validation method for update data of a record.
         
@@ -176,10 +227,13 @@ class ValidationService:
                                Only fields present in this dictionary are checked!
                                !If a field is not in update_data, it is not validated!
             db (AsyncSession): Async SQLAlchemy session for database access.
+            check_unique_fields (bool): False - skip unique_fields, the caller relies on
+                                        UNIQUE constraints and reports IntegrityError with find_conflicts().
+                                        Only per-user fields (no constraint in DB) are checked then.
         
         Raises:
             HTTPException(status_code=409): If a duplicate value is found.
-                Contains detailed error message:
+                Contains detailed error message for every colliding field (joined with "; "):
                 - For global unique: "Value '...' for field '...' already exists"
                 - For per-user unique: "Value '...' for field '...' already exists for this user"
         
@@ -218,16 +272,10 @@ class ValidationService:
         
         Workflow:
         1. Gets validation rules for the model via get_validation_rules()
-        2. Checks globally unique fields (unique_fields):
-           - For each field in update_data that exists in unique_fields
-           - Calls check_field_duplicates()
-           - If duplicate found -> HTTPException(409)
-        
-        3. Checks per-user unique fields (unique_per_user_fields):
-           - For each field in update_data that exists in unique_per_user_fields
-           - Skips if value == None
-           - Calls check_field_duplicates_per_user()
-           - If duplicate found -> HTTPException(409)
+        2. Takes unique_fields and unique_per_user_fields present in update_data
+           (None values are skipped)
+        3. Checks all of them with ONE query via find_conflicts()
+        4. If any duplicate found -> HTTPException(409) naming all colliding fields
         
         Adding new validations:
             For a new model with per-user fields, simply update VALIDATION_RULES:
@@ -240,48 +288,112 @@ class ValidationService:
             No other changes needed! validate_update() will handle everything automatically.
         """
         rules = cls.get_validation_rules(model_class)
-        unique_fields = rules.get("unique_fields", [])
+        fields = list(rules.get("unique_per_user_fields", []))
+        if check_unique_fields:
+            fields = list(rules.get("unique_fields", [])) + fields
+
+        # Check ONLY fields present in update_data (fields being changed), all of them in one query
+        values = {field: update_data[field] for field in fields if field in update_data}
+        conflicts = await cls.find_conflicts(model_class=model_class,
+                                             values=values,
+                                             db=db,
+                                             record_id=getattr(record, "id", None),
+                                             user_id=getattr(record, "user_id", None))
+        if conflicts:
+            raise cls.conflict_exception(model_class=model_class, conflicts=conflicts, values=values)
+
+    @classmethod
+    async def find_conflicts(cls,
+                             model_class: Type,
+                             values: Dict[str, Any],
+                             db: AsyncSession,
+                             record_id: Optional[int] = None,
+                             user_id: Optional[int] = None) -> List[str]:
+        """
+        Find which fields of a record collide with other records - in ONE query.
+        
+        Builds "SELECT email, name FROM users WHERE (email = :email OR name = :name) AND id != :id"
+        from unique_fields and unique_per_user_fields (per-user condition also has user_id = :user_id),
+        then compares returned rows with the values to report every colliding field.
+        
+        Args:
+            model_class (Type): SQLAlchemy model class (User, Post, etc.).
+            values (Dict[str, Any]): Field name -> new value. Fields without rules and None values are ignored.
+            db (AsyncSession): Async SQLAlchemy session for database access.
+            record_id (Optional[int]): ID of the record being updated, excluded from the check.
+                                      None for a new record.
+            user_id (Optional[int]): Owner for unique_per_user_fields. Default - values["user_id"].
+        
+        Returns:
+            List[str]: Colliding fields in VALIDATION_RULES order, empty list if there are none.
+        
+        Example:
+            conflicts = await ValidationService.find_conflicts(
+                model_class=User,
+                values={"email": "a@example.com", "name": "alice"},
+                db=db_session
+            )
+            # Returns: ["name"] if only the username is taken
+        """
+        rules = cls.get_validation_rules(model_class)
+        if user_id is None:
+            user_id = values.get("user_id")
+
+        unique_fields = [field for field in rules.get("unique_fields", [])
+                         if values.get(field) is not None]
+        per_user_fields = [field for field in rules.get("unique_per_user_fields", [])
+                           if values.get(field) is not None and user_id is not None]
 
-        # Global check for unique fields - ONLY fields that are being updated
-        for field in unique_fields:
-            # Check ONLY fields present in update_data (fields being changed)
-            if field in update_data:
-                value = update_data[field]
-                if value is not None:
-                    is_duplicate = await cls.check_field_duplicates(
-                        field=field,
-                        value=value,
-                        model=model_class,
-                        current_record_id=record.id if hasattr(record, 'id') else None,
-                        db=db,
-                    )
-                    if is_duplicate:
-                        raise HTTPException(
-                            status_code=409,
-                            detail=f"Value '{value}' for field '{field}' already exists",
-                        )
+        conditions = [getattr(model_class, field) == values[field] for field in unique_fields]
+        conditions += [
+            and_(getattr(model_class, field) == values[field], model_class.user_id == user_id)
+            for field in per_user_fields
+        ]
+        if not conditions:
+            return []
 
-        # Per-user check for unique fields - ONLY fields that are being updated
-        if "unique_per_user_fields" in rules:
-            for field in rules["unique_per_user_fields"]:
-                # Check ONLY fields present in update_data (fields being changed)
-                if field in update_data:
-                    value = update_data[field]
-                    if value is None:
-                        continue
-                    
-                    is_duplicate = await cls.check_field_duplicates_per_user(
-                        field=field,
-                        value=value,
-                        model=model_class,
-                        record=record,
-                        db=db,
-                    )
-                    if is_duplicate:
-                        raise HTTPException(
-                            status_code=409,
-                            detail=f"Value '{value}' for field '{field}' already exists for this user",
-                        )
+        fields = list(dict.fromkeys(unique_fields + per_user_fields))
+        columns = [getattr(model_class, field) for field in fields]
+        if per_user_fields:
+            columns.append(model_class.user_id)
+
+        query = select(*columns).where(or_(*conditions))
+        # Exclude the current record if updating
+        if record_id is not None:
+            query = query.where(model_class.id != record_id)
+
+        rows = (await db.execute(query)).all()
+
+        conflicts = set()
+        for row in rows:
+            conflicts.update(field for field in unique_fields if getattr(row, field) == values[field])
+            if per_user_fields and row.user_id == user_id:
+                conflicts.update(field for field in per_user_fields if getattr(row, field) == values[field])
+
+        return [field for field in fields if field in conflicts]
+
+    @classmethod
+    def conflict_exception(cls,
+                           model_class: Type,
+                           conflicts: List[str],
+                           values: Dict[str, Any]) -> HTTPException:
+        """
+        Build HTTPException(409) that names every colliding field (see find_conflicts()).
+        Falls back to a generic message when nothing was found (e.g. other constraint failed).
+        """
+        per_user_fields = cls.get_validation_rules(model_class).get("unique_per_user_fields", [])
+
+        messages = []
+        for field in conflicts:
+            message = f"Value '{values[field]}' for field '{field}' already exists"
+            if field in per_user_fields:
+                message += " for this user"
+            messages.append(message)
+
+        return HTTPException(
+            status_code=409,
+            detail="; ".join(messages) or "This value already exists or violates a database constraint",
+        )
 
     @classmethod
     async def check_field_duplicates_per_user(cls,